@@ -0,0 +1,30 @@
+"""Add extra destinations per PDS table and the destination of each sync run
+
+Revision ID: add_fanout_destinations
+Revises: add_sync_staging_path
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'add_fanout_destinations'
+down_revision = 'add_sync_staging_path'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    op.create_table(
+        'pds_table_destinations',
+        sa.Column('id', sa.UUID(), primary_key=True),
+        sa.Column('pds_table_id', sa.UUID(), sa.ForeignKey('pds_tables.id'), nullable=False),
+        sa.Column('connection_id', sa.UUID(), sa.ForeignKey('connections.id'), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.UniqueConstraint('pds_table_id', 'connection_id', name='uq_pds_table_destinations_table_connection'),
+    )
+    op.add_column('sync_history', sa.Column('destination_connection_id', sa.UUID(),
+                                            sa.ForeignKey('connections.id'), nullable=True))
+
+def downgrade():
+    op.drop_column('sync_history', 'destination_connection_id')
+    op.drop_table('pds_table_destinations')
@@ -0,0 +1,20 @@
+"""Add profile report path to sync history
+
+Revision ID: add_sync_profile_path
+Revises: add_sync_stage_stats
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'add_sync_profile_path'
+down_revision = 'add_sync_stage_stats'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    op.add_column('sync_history', sa.Column('profile_path', sa.String(), nullable=True))
+
+def downgrade():
+    op.drop_column('sync_history', 'profile_path')
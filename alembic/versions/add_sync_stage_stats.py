@@ -0,0 +1,37 @@
+"""Add per-stage timing and counters to sync history
+
+Revision ID: add_sync_stage_stats
+Revises: add_ui_list_indexes
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'add_sync_stage_stats'
+down_revision = 'add_ui_list_indexes'
+branch_labels = None
+depends_on = None
+
+STAGE_COLUMNS = [
+    ('pds_seconds', sa.Float()),
+    ('embedding_seconds', sa.Float()),
+    ('qdrant_seconds', sa.Float()),
+    ('sql_seconds', sa.Float()),
+    ('pages_fetched', sa.Integer()),
+    ('bytes_fetched', sa.BigInteger()),
+    ('rows_fetched', sa.Integer()),
+    ('rows_embedded', sa.Integer()),
+    ('rows_written', sa.Integer()),
+    ('embedding_tokens', sa.Integer()),
+    ('cache_hits', sa.Integer()),
+    ('retries', sa.Integer()),
+]
+
+def upgrade():
+    for name, column_type in STAGE_COLUMNS:
+        op.add_column('sync_history', sa.Column(name, column_type, nullable=True))
+
+def downgrade():
+    for name, _ in reversed(STAGE_COLUMNS):
+        op.drop_column('sync_history', name)
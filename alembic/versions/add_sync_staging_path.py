@@ -0,0 +1,20 @@
+"""Add staged pages path to sync history
+
+Revision ID: add_sync_staging_path
+Revises: unique_table_column_names
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'add_sync_staging_path'
+down_revision = 'unique_table_column_names'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    op.add_column('sync_history', sa.Column('staging_path', sa.String(), nullable=True))
+
+def downgrade():
+    op.drop_column('sync_history', 'staging_path')
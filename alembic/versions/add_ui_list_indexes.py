@@ -0,0 +1,21 @@
+"""Add indexes for sync history and table column lookups
+
+Revision ID: add_ui_list_indexes
+Revises: fix_page_size_column
+Create Date: 2026-10-19
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = 'add_ui_list_indexes'
+down_revision = 'fix_page_size_column'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    op.execute('CREATE INDEX IF NOT EXISTS ix_sync_history_pds_table_id_start_time ON sync_history (pds_table_id, start_time DESC)')
+    op.execute('CREATE INDEX IF NOT EXISTS ix_table_columns_pds_table_id ON table_columns (pds_table_id)')
+
+def downgrade():
+    op.execute('DROP INDEX IF EXISTS ix_table_columns_pds_table_id')
+    op.execute('DROP INDEX IF EXISTS ix_sync_history_pds_table_id_start_time')
@@ -0,0 +1,27 @@
+"""Make column names unique per PDS table
+
+Revision ID: unique_table_column_names
+Revises: add_sync_profile_path
+Create Date: 2026-10-19
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = 'unique_table_column_names'
+down_revision = 'add_sync_profile_path'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    # Earlier imports could insert the same column twice; keep the most recently written row
+    op.execute('''
+        DELETE FROM table_columns a
+        USING table_columns b
+        WHERE a.pds_table_id = b.pds_table_id
+          AND a.column_name = b.column_name
+          AND (COALESCE(a.updated_at, a.created_at, 'epoch'), a.ctid) < (COALESCE(b.updated_at, b.created_at, 'epoch'), b.ctid)
+    ''')
+    op.execute('CREATE UNIQUE INDEX IF NOT EXISTS uq_table_columns_pds_table_id_column_name ON table_columns (pds_table_id, column_name)')
+
+def downgrade():
+    op.execute('DROP INDEX IF EXISTS uq_table_columns_pds_table_id_column_name')
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""Import-time and cold-start benchmark for the PDS Data API.
+
+Measures, in fresh interpreters, how long ``import pds_data_api.main`` takes and
+which modules dominate it (via ``-X importtime``). With ``--serve`` it also
+starts uvicorn and times how long the app takes to answer its first request.
+
+    python benchmarks/cold_start.py --runs 5
+    python benchmarks/cold_start.py --serve --port 8765
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+import urllib.request
+from pathlib import Path
+
+SRC_DIR = Path(__file__).resolve().parent.parent / "src"
+
+def _env():
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(SRC_DIR), env.get("PYTHONPATH")]))
+    return env
+
+def measure_import(module: str, runs: int):
+    """Return wall-clock import times (seconds) and the slowest modules from -X importtime."""
+    timings = []
+    slowest = {}
+    code = f"import time; t = time.perf_counter(); import {module}; print(time.perf_counter() - t)"
+    for _ in range(runs):
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", code],
+            capture_output=True, text=True, env=_env()
+        )
+        if result.returncode != 0:
+            raise RuntimeError(f"Importing {module} failed:\n{result.stderr}")
+        timings.append(float(result.stdout.strip().splitlines()[-1]))
+        for line in result.stderr.splitlines():
+            # "import time: self [us] | cumulative | imported package"
+            parts = [p.strip() for p in line.replace("import time:", "").split("|")]
+            if len(parts) == 3 and parts[1].isdigit():
+                name = parts[2].strip()
+                if "." not in name or name.startswith("pds_data_api"):
+                    slowest[name] = max(slowest.get(name, 0), int(parts[1]))
+    top = sorted(slowest.items(), key=lambda item: item[1], reverse=True)[:15]
+    return timings, [{"module": name, "cumulative_ms": round(us / 1000, 1)} for name, us in top]
+
+def measure_serve(port: int, timeout: float, path: str):
+    """Start uvicorn and return seconds until the first successful response."""
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "pds_data_api.main:app", "--port", str(port), "--log-level", "warning"],
+        env=_env()
+    )
+    try:
+        while time.perf_counter() - started < timeout:
+            try:
+                with urllib.request.urlopen(f"http://127.0.0.1:{port}{path}", timeout=1):
+                    return time.perf_counter() - started
+            except Exception:
+                if process.poll() is not None:
+                    raise RuntimeError("uvicorn exited before serving a request")
+                time.sleep(0.05)
+        raise TimeoutError(f"No response within {timeout}s")
+    finally:
+        process.terminate()
+        process.wait(timeout=10)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--module", default="pds_data_api.main")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--serve", action="store_true", help="Also time uvicorn until the first response")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--path", default="/")
+    parser.add_argument("--timeout", type=float, default=60.0)
+    args = parser.parse_args(argv)
+
+    timings, top = measure_import(args.module, args.runs)
+    report = {
+        "module": args.module,
+        "import_seconds": {
+            "median": round(statistics.median(timings), 4),
+            "min": round(min(timings), 4),
+            "max": round(max(timings), 4),
+        },
+        "slowest_imports": top,
+    }
+    if args.serve:
+        report["first_response_seconds"] = round(measure_serve(args.port, args.timeout, args.path), 3)
+    print(json.dumps(report, indent=2))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
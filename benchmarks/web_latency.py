@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+"""Concurrency benchmark for the PDS Data API web handlers.
+
+Fires a fixed number of requests at the UI/API routes with a bounded number
+in flight and reports p50/p95/p99 latency and error rate per route. Run it
+against a build before and after a change and compare the JSON output, e.g.:
+
+    python benchmarks/web_latency.py --base-url http://localhost:8000 \
+        --concurrency 50 --requests 2000 --output after.json --baseline before.json
+
+To measure how much sync work degrades the interactive app, keep syncs running
+in the background and (optionally) measure an idle phase first:
+
+    python benchmarks/web_latency.py --qdrant-collection my_table \
+        --sync-table <pds table id> --sync-table <other id> --idle-baseline
+
+``--qdrant-collection`` adds the ``/qdrant/...`` collection, scroll, count and
+search routes for that collection to the mix.
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import random
+import statistics
+import sys
+import time
+from collections import defaultdict
+from typing import Any, Dict, List, NamedTuple, Optional
+
+import httpx
+
+DEFAULT_PATHS = ["/", "/connections", "/pds-tables", "/sync-history"]
+
+class Route(NamedTuple):
+    method: str
+    path: str
+    body: Optional[Dict[str, Any]] = None
+
+    @property
+    def label(self) -> str:
+        return self.path if self.method == "GET" else f"{self.method} {self.path}"
+
+def qdrant_routes(collection: str, vector_size: int = 1536) -> List[Route]:
+    """Read-only /qdrant routes for one collection."""
+    rng = random.Random(0)
+    vector = [rng.uniform(-1.0, 1.0) for _ in range(vector_size)]
+    base = f"/qdrant/collections/{collection}"
+    return [
+        Route("GET", "/qdrant/collections"),
+        Route("GET", base),
+        Route("POST", f"{base}/points/scroll", {"limit": 20}),
+        Route("POST", f"{base}/points/count"),
+        Route("POST", f"{base}/points/search", {"vector": vector, "limit": 10}),
+    ]
+
+def percentile(values: List[float], pct: float) -> float:
+    """Return the pct-th percentile of values using nearest-rank."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = math.ceil(pct / 100.0 * len(ordered))
+    return ordered[max(0, min(len(ordered), rank) - 1)]
+
+def summarize(latencies: List[float], errors: int, elapsed: float = None) -> Dict[str, float]:
+    """Summarize a list of latencies in milliseconds."""
+    total = len(latencies) + errors
+    summary = {
+        "requests": total,
+        "errors": errors,
+        "error_rate": round(errors / total, 4) if total else 0.0,
+        "p50_ms": round(percentile(latencies, 50), 2),
+        "p95_ms": round(percentile(latencies, 95), 2),
+        "p99_ms": round(percentile(latencies, 99), 2),
+        "mean_ms": round(statistics.fmean(latencies), 2) if latencies else 0.0,
+        "max_ms": round(max(latencies), 2) if latencies else 0.0,
+    }
+    if elapsed:
+        summary["requests_per_sec"] = round(total / elapsed, 2)
+    return summary
+
+async def run_load(base_url: str, routes: List[Route], concurrency: int, total_requests: int,
+                   timeout: float) -> Dict[str, Dict[str, float]]:
+    """Issue total_requests requests round-robin over routes with at most concurrency in flight."""
+    latencies = defaultdict(list)
+    errors = defaultdict(int)
+    counter = iter(range(total_requests))
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(base_url=base_url, timeout=timeout, limits=limits) as client:
+        async def worker():
+            for i in counter:
+                route = routes[i % len(routes)]
+                started = time.perf_counter()
+                try:
+                    response = await client.request(route.method, route.path, json=route.body)
+                    ok = response.status_code < 500
+                except httpx.HTTPError:
+                    ok = False
+                elapsed_ms = (time.perf_counter() - started) * 1000
+                if ok:
+                    latencies[route.label].append(elapsed_ms)
+                else:
+                    errors[route.label] += 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    labels = [route.label for route in routes]
+    results = {label: summarize(latencies[label], errors[label]) for label in labels}
+    results["_all"] = summarize(
+        [value for label in labels for value in latencies[label]],
+        sum(errors.values()),
+        elapsed
+    )
+    return results
+
+async def keep_syncing(base_url: str, table_id: str, interval: float, timeout: float, stats: Dict[str, Any]):
+    """Trigger syncs of one table back to back (``interval`` apart) until cancelled."""
+    async with httpx.AsyncClient(base_url=base_url, timeout=timeout) as client:
+        while True:
+            started = time.perf_counter()
+            stats["started"] += 1
+            try:
+                response = await client.post(f"/pds-tables/{table_id}/sync")
+                if response.status_code < 400:
+                    stats["completed"] += 1
+                    stats["durations_s"].append(round(time.perf_counter() - started, 2))
+                else:
+                    stats["errors"] += 1
+            except httpx.HTTPError:
+                stats["errors"] += 1
+            await asyncio.sleep(interval)
+
+async def run_with_syncs(base_url: str, routes: List[Route], concurrency: int, total_requests: int,
+                         timeout: float, sync_tables: List[str], sync_interval: float,
+                         sync_warmup: float) -> Dict[str, Any]:
+    """Run the load while every table in ``sync_tables`` is being synced in the background."""
+    sync_stats = {table_id: {"started": 0, "completed": 0, "errors": 0, "durations_s": []}
+                  for table_id in sync_tables}
+    tasks = [
+        asyncio.create_task(keep_syncing(base_url, table_id, sync_interval, 3600, sync_stats[table_id]))
+        for table_id in sync_tables
+    ]
+    try:
+        # Let the syncs get past setup and into the page/batch loop first
+        await asyncio.sleep(sync_warmup)
+        results = await run_load(base_url, routes, concurrency, total_requests, timeout)
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+    return {"results": results, "syncs": sync_stats}
+
+def compare(results: Dict[str, Dict[str, float]], baseline: Dict[str, Dict[str, float]]) -> Dict[str, Dict[str, float]]:
+    """Return the p99 ratio (current / baseline) for every route present in both runs."""
+    ratios = {}
+    for path, stats in results.items():
+        before = baseline.get(path, {}).get("p99_ms")
+        if before:
+            ratios[path] = {"p99_before_ms": before, "p99_after_ms": stats["p99_ms"],
+                            "p99_ratio": round(stats["p99_ms"] / before, 3)}
+    return ratios
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--path", action="append", dest="paths", help="Route to GET (repeatable)")
+    parser.add_argument("--qdrant-collection", help="Also hit the /qdrant routes for this collection")
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--sync-table", action="append", dest="sync_tables", default=[],
+                        help="PDS table id to keep syncing during the run (repeatable)")
+    parser.add_argument("--sync-interval", type=float, default=0.0, help="Pause between syncs of a table (s)")
+    parser.add_argument("--sync-warmup", type=float, default=2.0, help="Seconds to let syncs start before the load")
+    parser.add_argument("--idle-baseline", action="store_true",
+                        help="With --sync-table, measure an idle phase first and report the degradation")
+    parser.add_argument("--output", help="Write results as JSON to this file")
+    parser.add_argument("--baseline", help="Compare p99 against a previous JSON result")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    routes = [Route("GET", path) for path in (args.paths or DEFAULT_PATHS)]
+    if args.qdrant_collection:
+        routes += qdrant_routes(args.qdrant_collection)
+
+    report = {"config": {"base_url": args.base_url, "concurrency": args.concurrency,
+                         "requests": args.requests, "sync_tables": args.sync_tables}}
+    if args.sync_tables:
+        if args.idle_baseline:
+            report["idle_results"] = asyncio.run(run_load(
+                args.base_url, routes, args.concurrency, args.requests, args.timeout
+            ))
+        loaded = asyncio.run(run_with_syncs(
+            args.base_url, routes, args.concurrency, args.requests, args.timeout,
+            args.sync_tables, args.sync_interval, args.sync_warmup
+        ))
+        report["results"] = loaded["results"]
+        report["syncs"] = loaded["syncs"]
+        if args.idle_baseline:
+            report["degradation"] = compare(report["results"], report["idle_results"])
+    else:
+        report["results"] = asyncio.run(run_load(
+            args.base_url, routes, args.concurrency, args.requests, args.timeout
+        ))
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            report["comparison"] = compare(report["results"], json.load(f)["results"])
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output)
+    print(output)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -34,6 +34,14 @@ CREATE TABLE IF NOT EXISTS pds_tables (
     deleted_at TIMESTAMP WITHOUT TIME ZONE
 );
 
+CREATE TABLE IF NOT EXISTS pds_table_destinations (
+    id UUID NOT NULL PRIMARY KEY,
+    pds_table_id UUID NOT NULL REFERENCES pds_tables(id),
+    connection_id UUID NOT NULL REFERENCES connections(id),
+    created_at TIMESTAMP WITHOUT TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+    CONSTRAINT uq_pds_table_destinations_table_connection UNIQUE (pds_table_id, connection_id)
+);
+
 CREATE TABLE IF NOT EXISTS table_columns (
     id UUID NOT NULL PRIMARY KEY,
     pds_table_id UUID NOT NULL REFERENCES pds_tables(id),
@@ -57,6 +65,21 @@ CREATE TABLE IF NOT EXISTS sync_history (
     total_creates INTEGER,
     status VARCHAR(50) NOT NULL,
     error_message VARCHAR(1000),
+    destination_connection_id UUID REFERENCES connections(id),
+    pds_seconds DOUBLE PRECISION,
+    embedding_seconds DOUBLE PRECISION,
+    qdrant_seconds DOUBLE PRECISION,
+    sql_seconds DOUBLE PRECISION,
+    pages_fetched INTEGER,
+    bytes_fetched BIGINT,
+    rows_fetched INTEGER,
+    rows_embedded INTEGER,
+    rows_written INTEGER,
+    embedding_tokens INTEGER,
+    cache_hits INTEGER,
+    retries INTEGER,
+    profile_path VARCHAR,
+    staging_path VARCHAR,
     created_at TIMESTAMP WITHOUT TIME ZONE DEFAULT CURRENT_TIMESTAMP,
     updated_at TIMESTAMP WITHOUT TIME ZONE DEFAULT CURRENT_TIMESTAMP
 );
@@ -82,4 +105,9 @@ CREATE TABLE IF NOT EXISTS qdrant_points (
     updated_at TIMESTAMP WITHOUT TIME ZONE DEFAULT CURRENT_TIMESTAMP,
     deleted_at TIMESTAMP WITHOUT TIME ZONE,
     UNIQUE (collection_id, point_id)
-); 
\ No newline at end of file
+); 
+
+-- Indexes backing the UI list pages
+CREATE INDEX IF NOT EXISTS ix_sync_history_pds_table_id_start_time ON sync_history (pds_table_id, start_time DESC);
+CREATE INDEX IF NOT EXISTS ix_table_columns_pds_table_id ON table_columns (pds_table_id);
+CREATE UNIQUE INDEX IF NOT EXISTS uq_table_columns_pds_table_id_column_name ON table_columns (pds_table_id, column_name);
@@ -17,7 +17,7 @@ def check_table_exists(table_name):
 def add_connection_types(db):
     """Add any missing connection types"""
     # Define connection types that should exist
-    connection_types = ['PDS', 'PostgreSQL', 'Oracle', 'Qdrant']
+    connection_types = ['PDS', 'PostgreSQL', 'Oracle', 'Qdrant', 'PostgreSQL+pgvector']
     
     # Get existing connection types
     existing_types = {type.name for type in db.query(ConnectionOptions).all()}
@@ -2,16 +2,15 @@ from fastapi import FastAPI, Request, Form, Depends, HTTPException, UploadFile,
 from fastapi.templating import Jinja2Templates
 from fastapi.staticfiles import StaticFiles
 from fastapi.responses import RedirectResponse, StreamingResponse, HTMLResponse
+from starlette.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 from typing import List
 import uuid
 import json
 import secrets
 import time
-import io
+import itertools
 import logging
-from openpyxl import Workbook, load_workbook
-from openpyxl.worksheet.datavalidation import DataValidation
 import base64
 import requests
 from qdrant_client import QdrantClient
@@ -22,6 +21,7 @@ from models import Base, Connection, Config, TableColumn, ConnectionOptions, Syn
 from database import engine, get_db
 from pds_sync_service import PDSSyncService
 from qdrant_routes import router as qdrant_router
+from pds_data_api.column_io import Sheet, XLSX_MEDIA_TYPE, import_columns_from_workbook, iter_column_rows, iter_file, temporary_path, write_xlsx
 
 # Configure logging
 logging.basicConfig(
@@ -732,75 +732,53 @@ async def delete_table_column(request: Request, table_id: uuid.UUID, column_id:
 @app.get("/pds-tables/{table_id}/columns/export")
 async def export_columns(request: Request, table_id: uuid.UUID, db: Session = Depends(get_db)):
     try:
-        # Get table and its columns
+        # Get table
         table = db.query(Config).filter(Config.id == table_id).first()
         if not table:
             raise HTTPException(status_code=404, detail="PDS Table not found")
         
-        columns = db.query(TableColumn).filter(TableColumn.pds_table_id == table_id).all()
-        
-        # Create Excel workbook
-        wb = Workbook()
-        ws = wb.active
-        ws.title = "Columns"
-        
-        # Add headers
-        headers = ["Column Name", "Data Type", "Active"]
-        for col, header in enumerate(headers, 1):
-            ws.cell(row=1, column=col, value=header)
-        
-        # Add data
-        for row, column in enumerate(columns, 2):
-            ws.cell(row=row, column=1, value=column.column_name)
-            ws.cell(row=row, column=2, value=column.data_type)
-            ws.cell(row=row, column=3, value="Yes" if column.active else "No")
+        # Instructions sheet
+        instructions = [
+            ["Instructions for Importing Columns"],
+            ["1. Column Name: Enter the name of the column"],
+            ["2. Data Type: Enter the data type (e.g., VARCHAR, INTEGER, DATE)"],
+            ["3. Active: Select 'Yes' or 'No' from the dropdown"],
+            [],
+            ["Notes:"],
+            ["- The Active column has a dropdown with 'Yes' and 'No' options"],
+            ["- Existing columns will be updated if they have the same name"],
+            ["- New columns will be created if they don't exist"],
+        ]
         
-        # Add data validation for Active column only if there are columns
-        if columns:
-            dv = DataValidation(type="list", formula1='"Yes,No"', allow_blank=True)
-            dv.add(f'C2:C{len(columns) + 1}')
-            ws.add_data_validation(dv)
-        
-        # Add instructions sheet
-        ws_instructions = wb.create_sheet("Instructions")
-        ws_instructions['A1'] = "Instructions for Importing Columns"
-        ws_instructions['A2'] = "1. Column Name: Enter the name of the column"
-        ws_instructions['A3'] = "2. Data Type: Enter the data type (e.g., VARCHAR, INTEGER, DATE)"
-        ws_instructions['A4'] = "3. Active: Select 'Yes' or 'No' from the dropdown"
-        ws_instructions['A6'] = "Notes:"
-        ws_instructions['A7'] = "- The Active column has a dropdown with 'Yes' and 'No' options"
-        ws_instructions['A8'] = "- Existing columns will be updated if they have the same name"
-        ws_instructions['A9'] = "- New columns will be created if they don't exist"
-        
-        # Auto-size columns
-        for col in ws.columns:
-            max_length = 0
-            column = col[0].column_letter
-            for cell in col:
-                try:
-                    if len(str(cell.value)) > max_length:
-                        max_length = len(str(cell.value))
-                except:
-                    pass
-            adjusted_width = (max_length + 2)
-            ws.column_dimensions[column].width = adjusted_width
+        def build():
+            # Rows are streamed from the database into a write-only workbook on disk
+            rows = (
+                [name, data_type, "Yes" if active else "No"]
+                for name, data_type, active, _ in iter_column_rows(db, table_id)
+            )
+            path = temporary_path(".xlsx")
+            write_xlsx(path, [
+                Sheet("Columns", itertools.chain([["Column Name", "Data Type", "Active"]], rows),
+                      widths=(40, 20, 10), validations=[('"Yes,No"', "C2:C1048576")]),
+                Sheet("Instructions", instructions, widths=(70,)),
+            ])
+            return path
         
-        # Save to bytes
-        output = io.BytesIO()
-        wb.save(output)
-        output.seek(0)
+        path = await run_in_threadpool(build)
         
         # Use table_name for the filename since it's more descriptive
         filename = f"{table.table_name}_columns.xlsx"
         
         # Return Excel file
         return StreamingResponse(
-            output,
-            media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+            iter_file(path),
+            media_type=XLSX_MEDIA_TYPE,
             headers={
                 "Content-Disposition": f"attachment; filename={filename}"
             }
         )
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error exporting columns: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Error exporting columns: {str(e)}")
@@ -818,45 +796,17 @@ async def import_columns(
         if not table:
             raise HTTPException(status_code=404, detail="PDS Table not found")
         
-        # Read Excel file
+        # Streamed read-only parse and one bulk upsert by column name, off the event loop
         contents = await file.read()
-        wb = load_workbook(io.BytesIO(contents))
-        ws = wb.active
+        counts = await run_in_threadpool(import_columns_from_workbook, db, table_id, contents)
         
-        # Process rows (skip header)
-        for row in ws.iter_rows(min_row=2):
-            column_name = row[0].value
-            data_type = row[1].value
-            active_value = row[2].value
-            
-            # Convert active value to boolean
-            active = False
-            if active_value:
-                active = str(active_value).lower() in ['yes', 'true', '1']
-            
-            if column_name and data_type:
-                # Check if column exists
-                existing_column = db.query(TableColumn).filter(
-                    TableColumn.pds_table_id == table_id,
-                    TableColumn.column_name == column_name
-                ).first()
-                
-                if existing_column:
-                    # Update existing column
-                    existing_column.data_type = data_type
-                    existing_column.active = active
-                else:
-                    # Create new column
-                    column = TableColumn(
-                        pds_table_id=table_id,
-                        column_name=column_name,
-                        data_type=data_type,
-                        active=active
-                    )
-                    db.add(column)
-        
-        db.commit()
-        return RedirectResponse(url=f"/pds-tables/{table_id}/columns", status_code=303)
+        response = RedirectResponse(url=f"/pds-tables/{table_id}/columns", status_code=303)
+        response.set_cookie(
+            "flash_success",
+            f"Imported columns: {counts['created']} created, {counts['updated']} updated, {counts['unchanged']} unchanged",
+            max_age=5
+        )
+        return response
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
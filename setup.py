@@ -30,6 +30,8 @@ setup(
         "fastapi==0.104.1",
         "uvicorn[standard]==0.24.0",
         "sqlalchemy==2.0.23",
+        "asyncpg==0.29.0",
+        "greenlet==3.0.1",
         "alembic==1.12.1",
         "jinja2==3.1.2",
         "python-multipart==0.0.6",
@@ -43,12 +45,26 @@ setup(
         "pydantic==2.4.2",
         "starlette==0.27.0",
         "typing-extensions==4.8.0",
-        "openai==1.12.0"
+        "openai==1.12.0",
+        "httpx[http2]==0.26.0",
+        "prometheus-client==0.19.0",
+        "pyinstrument==4.6.1",
+        "opentelemetry-api==1.21.0",
+        "opentelemetry-sdk==1.21.0",
+        "opentelemetry-exporter-otlp-proto-http==1.21.0",
+        "opentelemetry-instrumentation-fastapi==0.42b0"
     ],
+    extras_require={
+        "parquet": ["pyarrow==14.0.1"],
+        "test": ["pytest==7.4.3"],
+    },
     include_package_data=True,
     entry_points={
         "console_scripts": [
             "pds-data-api=pds_data_api.main:run_app",
+            "pds-bench=pds_data_api.testing.bench:main",
+            "pds-export=pds_data_api.data_export:main",
+            "pds-reindex=pds_data_api.reindex:main",
         ],
     },
 ) 
\ No newline at end of file
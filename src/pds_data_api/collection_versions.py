@@ -0,0 +1,101 @@
+"""Versioned Qdrant collections behind an alias (blue/green rebuilds).
+
+A rebuild loads a table into a fresh ``<name>_v<N>`` collection with HNSW
+indexing deferred, re-enables indexing once the load is done, waits for the
+collection to turn green and then repoints the ``<name>`` alias in a single
+``update_collection_aliases`` call. Searches keep hitting the old version
+until the swap; the old version is deleted afterwards. Everything that reads
+a collection by its table name resolves it through ``resolve_collection``.
+"""
+import logging
+import re
+import time
+from typing import Optional
+
+from .config import QDRANT_INDEXING_THRESHOLD, QDRANT_INDEX_WAIT_TIMEOUT
+
+logger = logging.getLogger(__name__)
+
+def versioned_name(alias: str, version: int) -> str:
+    return f"{alias}_v{version}"
+
+def get_alias_target(client, alias: str) -> Optional[str]:
+    """Return the collection ``alias`` points to, or None if it is not an alias."""
+    for entry in client.get_aliases().aliases:
+        if entry.alias_name == alias:
+            return entry.collection_name
+    return None
+
+def resolve_collection(client, name: str) -> str:
+    """Resolve an alias to its current collection; other names are returned unchanged."""
+    return get_alias_target(client, name) or name
+
+def next_version(client, alias: str) -> int:
+    """One past the highest existing ``<alias>_v<N>``."""
+    pattern = re.compile(rf"^{re.escape(alias)}_v(\d+)$")
+    versions = [
+        int(match.group(1)) for match in
+        (pattern.match(collection.name) for collection in client.get_collections().collections)
+        if match
+    ]
+    return max(versions, default=0) + 1
+
+def create_for_bulk_load(client, collection_name: str, vector_size: int = 1536):
+    """Create a collection with HNSW indexing disabled until ``finish_bulk_load``."""
+    from qdrant_client.http import models
+
+    client.create_collection(
+        collection_name=collection_name,
+        vectors_config=models.VectorParams(size=vector_size, distance=models.Distance.COSINE),
+        optimizers_config=models.OptimizersConfigDiff(indexing_threshold=0)
+    )
+
+def finish_bulk_load(client, collection_name: str, timeout: float = None, poll_interval: float = 1.0):
+    """Turn indexing back on and wait until the collection is green (fully indexed)."""
+    from qdrant_client.http import models
+
+    timeout = QDRANT_INDEX_WAIT_TIMEOUT if timeout is None else timeout
+    client.update_collection(
+        collection_name=collection_name,
+        optimizer_config=models.OptimizersConfigDiff(indexing_threshold=QDRANT_INDEXING_THRESHOLD)
+    )
+    deadline = time.monotonic() + timeout
+    while True:
+        info = client.get_collection(collection_name)
+        if info.status == models.CollectionStatus.GREEN:
+            return info
+        if time.monotonic() > deadline:
+            raise TimeoutError(f"Collection '{collection_name}' still {info.status} after {timeout}s of indexing")
+        time.sleep(poll_interval)
+
+def swap_alias(client, alias: str, collection_name: str) -> Optional[str]:
+    """Point ``alias`` at ``collection_name`` atomically and return the collection it pointed to before.
+
+    A plain collection that still carries the alias's name (from before
+    rebuilds were used) has to be dropped first, since aliases and
+    collections share a namespace. That first swap is therefore not atomic:
+    between the delete and the alias creation, reads of ``alias`` fail with
+    "not found". Call it only once ``collection_name`` is fully loaded and
+    indexed, so the gap is a single round trip and no data is lost; the
+    legacy collection is only dropped when ``collection_name`` exists.
+    """
+    from qdrant_client.http import models
+
+    previous = get_alias_target(client, alias)
+    operations = []
+    if previous:
+        operations.append(models.DeleteAliasOperation(delete_alias=models.DeleteAlias(alias_name=alias)))
+    else:
+        existing = {collection.name for collection in client.get_collections().collections}
+        if collection_name not in existing:
+            raise ValueError(f"Cannot point alias '{alias}' at missing collection '{collection_name}'")
+        if alias in existing:
+            logger.warning("Dropping legacy collection '%s' to replace it with an alias; "
+                           "reads of it fail until the alias exists", alias)
+            client.delete_collection(alias)
+    operations.append(models.CreateAliasOperation(
+        create_alias=models.CreateAlias(collection_name=collection_name, alias_name=alias)
+    ))
+    client.update_collection_aliases(change_aliases_operations=operations)
+    logger.info("Alias '%s' now points to '%s' (was %s)", alias, collection_name, previous)
+    return previous
@@ -0,0 +1,311 @@
+"""Excel/CSV import and export of table column definitions.
+
+Workbooks are parsed with openpyxl in read-only (streaming) mode and written
+with bulk ``INSERT ... ON CONFLICT (pds_table_id, column_name) DO UPDATE``
+statements, so a table with thousands of columns costs a statement per
+``UPSERT_CHUNK_SIZE`` rows rather than one per row. Both functions are
+blocking; call them from a worker thread.
+
+Exports use openpyxl's write-only mode (rows go straight to a temporary file)
+or CSV, and are streamed to the client in ``EXPORT_CHUNK_SIZE`` pieces, so
+memory stays flat however many columns a table has.
+"""
+import csv
+import io
+import logging
+import os
+import tempfile
+import uuid
+from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from .models import TableColumn
+
+logger = logging.getLogger(__name__)
+
+# Rows per INSERT statement; keeps the bind parameter count well under PostgreSQL's limit
+UPSERT_CHUNK_SIZE = 1000
+# Bytes per chunk of a streamed download, and rows fetched per round trip while exporting
+EXPORT_CHUNK_SIZE = 64 * 1024
+EXPORT_FETCH_SIZE = 1000
+
+XLSX_MEDIA_TYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+EXPORT_HEADERS = ["Column Name", "Data Type", "Active", "Primary Key"]
+DATA_TYPES = ["string", "integer", "float", "boolean", "date", "datetime"]
+
+HEADER_FIELDS = {
+    "column name": "column_name",
+    "data type": "data_type",
+    "active": "active",
+    "primary key": "is_primary_key",
+}
+
+def parse_bool(value: Any) -> bool:
+    """Interpret TRUE/FALSE, Yes/No, 1/0 and real booleans from a spreadsheet cell."""
+    if isinstance(value, bool):
+        return value
+    if value is None:
+        return False
+    return str(value).strip().lower() in ("true", "yes", "y", "1")
+
+def parse_column_rows(contents: bytes) -> List[Dict[str, Any]]:
+    """Stream column definitions out of an uploaded workbook.
+
+    The header row is the first row whose first cell is "Column Name" (so the
+    import template's instructions block is skipped). "Column Name" and
+    "Data Type" are required; "Active" and "Primary Key" are optional. Rows
+    without a name or type are ignored, and a repeated name keeps its last row.
+    """
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(io.BytesIO(contents), read_only=True, data_only=True)
+    try:
+        rows = workbook.active.iter_rows(values_only=True)
+        fields: Optional[List[Optional[str]]] = None
+        for row in rows:
+            if row and isinstance(row[0], str) and row[0].strip().lower() == "column name":
+                fields = [HEADER_FIELDS.get(str(cell).strip().lower()) if cell is not None else None for cell in row]
+                break
+        if fields is None or "data_type" not in fields:
+            raise ValueError("Invalid template format: Could not find header row")
+
+        parsed: Dict[str, Dict[str, Any]] = {}
+        for row in rows:
+            values = {field: value for field, value in zip(fields, row) if field}
+            column_name = str(values.get("column_name") or "").strip()
+            data_type = str(values.get("data_type") or "").strip()
+            if not column_name or not data_type:
+                continue
+            entry = {"column_name": column_name, "data_type": data_type,
+                     "active": parse_bool(values.get("active"))}
+            if "is_primary_key" in fields:
+                entry["is_primary_key"] = parse_bool(values.get("is_primary_key"))
+            parsed[column_name] = entry
+        return list(parsed.values())
+    finally:
+        workbook.close()
+
+def _insert_for(session: Session):
+    dialect = session.get_bind().dialect.name
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    elif dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        raise ValueError(f"Column import does not support the {dialect} dialect")
+    return insert
+
+def upsert_columns(session: Session, table_id: uuid.UUID, rows: List[Dict[str, Any]]) -> Dict[str, int]:
+    """Create or update ``rows`` by column name and return created/updated/unchanged counts.
+
+    Rows identical to the stored column are not written at all. Fields a row
+    does not carry (e.g. "Primary Key" missing from the sheet) keep their
+    stored value on update.
+    """
+    existing = {
+        name: (data_type, active, is_primary_key)
+        for name, data_type, active, is_primary_key in session.query(
+            TableColumn.column_name, TableColumn.data_type, TableColumn.active, TableColumn.is_primary_key
+        ).filter(TableColumn.pds_table_id == table_id)
+    }
+
+    counts = {"created": 0, "updated": 0, "unchanged": 0}
+    changed = []
+    for row in rows:
+        current = existing.get(row["column_name"])
+        if current is None:
+            counts["created"] += 1
+        elif (row["data_type"], row["active"], row.get("is_primary_key", current[2])) == current:
+            counts["unchanged"] += 1
+            continue
+        else:
+            counts["updated"] += 1
+        changed.append(row)
+
+    if changed:
+        now = datetime.utcnow()
+        with_primary_key = all("is_primary_key" in row for row in changed)
+        values = [{
+            "id": uuid.uuid4(),
+            "pds_table_id": table_id,
+            "column_name": row["column_name"],
+            "data_type": row["data_type"],
+            "active": row["active"],
+            "is_primary_key": row.get("is_primary_key", False),
+            "created_at": now,
+            "updated_at": now,
+        } for row in changed]
+
+        insert = _insert_for(session)
+        for start in range(0, len(values), UPSERT_CHUNK_SIZE):
+            statement = insert(TableColumn).values(values[start:start + UPSERT_CHUNK_SIZE])
+            update = {
+                "data_type": statement.excluded.data_type,
+                "active": statement.excluded.active,
+                "updated_at": func.now(),
+            }
+            if with_primary_key:
+                update["is_primary_key"] = statement.excluded.is_primary_key
+            session.execute(statement.on_conflict_do_update(
+                index_elements=["pds_table_id", "column_name"], set_=update
+            ))
+    session.commit()
+    logger.info("Imported columns for table %s: %s", table_id, counts)
+    return counts
+
+def import_columns_from_workbook(session: Session, table_id: uuid.UUID, contents: bytes) -> Dict[str, int]:
+    """Parse an uploaded workbook and upsert its columns; see ``upsert_columns``."""
+    return upsert_columns(session, table_id, parse_column_rows(contents))
+
+class Sheet(NamedTuple):
+    title: str
+    rows: Iterable[Sequence[Any]]
+    widths: Sequence[float] = ()
+    # (row index, font size) pairs written bold on a grey fill
+    styled_rows: Sequence[Tuple[int, float]] = ()
+    # (list formula, cell range) pairs, e.g. ('"TRUE,FALSE"', "C2:C1048576")
+    validations: Sequence[Tuple[str, str]] = ()
+
+def write_xlsx(path: str, sheets: Iterable[Sheet]):
+    """Write ``sheets`` to ``path`` in write-only mode; rows are consumed lazily."""
+    from openpyxl import Workbook
+    from openpyxl.cell import WriteOnlyCell
+    from openpyxl.styles import Font, PatternFill
+    from openpyxl.utils import get_column_letter
+    from openpyxl.worksheet.datavalidation import DataValidation
+
+    workbook = Workbook(write_only=True)
+    fill = PatternFill(start_color="CCCCCC", end_color="CCCCCC", fill_type="solid")
+    for sheet in sheets:
+        styled = dict(sheet.styled_rows)
+        worksheet = workbook.create_sheet(sheet.title)
+        # Fixed widths: write-only sheets cannot be measured after the fact, and scanning rows would defeat streaming
+        for index, width in enumerate(sheet.widths, 1):
+            worksheet.column_dimensions[get_column_letter(index)].width = width
+        for formula, cell_range in sheet.validations:
+            validation = DataValidation(type="list", formula1=formula, allow_blank=True)
+            validation.add(cell_range)
+            worksheet.data_validations.append(validation)
+        for index, row in enumerate(sheet.rows):
+            if index in styled:
+                font = Font(bold=True, size=styled[index])
+                cells = []
+                for value in row:
+                    cell = WriteOnlyCell(worksheet, value=value)
+                    cell.font = font
+                    cell.fill = fill
+                    cells.append(cell)
+                row = cells
+            worksheet.append(row)
+    workbook.save(path)
+
+def temporary_path(suffix: str) -> str:
+    """Reserve a temporary file for an export; ``iter_file`` removes it when done."""
+    fd, path = tempfile.mkstemp(prefix="pds-export-", suffix=suffix)
+    os.close(fd)
+    return path
+
+def iter_file(path: str, chunk_size: int = EXPORT_CHUNK_SIZE) -> Iterator[bytes]:
+    """Yield a file in chunks and delete it afterwards (also if the client disconnects)."""
+    try:
+        with open(path, "rb") as f:
+            while True:
+                chunk = f.read(chunk_size)
+                if not chunk:
+                    break
+                yield chunk
+    finally:
+        os.unlink(path)
+
+def iter_column_rows(session: Session, table_id: uuid.UUID) -> Iterator[Tuple[str, str, bool, bool]]:
+    """Yield (name, data type, active, primary key) for a table, fetched in batches."""
+    query = session.query(
+        TableColumn.column_name, TableColumn.data_type, TableColumn.active, TableColumn.is_primary_key
+    ).filter(TableColumn.pds_table_id == table_id).order_by(TableColumn.column_name)
+    for row in query.yield_per(EXPORT_FETCH_SIZE):
+        yield tuple(row)
+
+def build_columns_xlsx(session: Session, table_id: uuid.UUID) -> str:
+    """Write a table's columns to a temporary .xlsx (the import layout) and return its path."""
+    path = temporary_path(".xlsx")
+    rows = iter_column_rows(session, table_id)
+    write_xlsx(path, [Sheet(
+        "Columns",
+        _prepend(EXPORT_HEADERS, rows),
+        widths=(40, 15, 10, 12),
+        validations=[(f'"{",".join(DATA_TYPES)}"', "B2:B1048576"),
+                     ('"TRUE,FALSE"', "C2:C1048576"), ('"TRUE,FALSE"', "D2:D1048576")]
+    )])
+    return path
+
+def iter_columns_csv(session: Session, table_id: uuid.UUID) -> Iterator[bytes]:
+    """Stream a table's columns as CSV (same layout as the Excel export)."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_HEADERS)
+    for row in iter_column_rows(session, table_id):
+        writer.writerow(row)
+        if buffer.tell() >= EXPORT_CHUNK_SIZE:
+            yield buffer.getvalue().encode("utf-8")
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue().encode("utf-8")
+
+TEMPLATE_INSTRUCTIONS = [
+    "Instructions for Importing Columns",
+    "",
+    "Column Name:",
+    "- Required field",
+    "- Must be unique within the table",
+    "- Should match the actual column name in your database",
+    "- No spaces or special characters allowed",
+    "",
+    "Data Type:",
+    "- Required field",
+    "- Select from the dropdown list",
+    "- Available types: string, integer, float, boolean, date, datetime",
+    "",
+    "Active:",
+    "- TRUE: Column will be included in data syncs",
+    "- FALSE: Column will be ignored during syncs",
+    "",
+    "Primary Key:",
+    "- TRUE: Column is part of the table's primary key",
+    "- FALSE: Column is not part of the primary key",
+    "- At least one column must be marked as primary key",
+    "",
+    "Example Data:",
+    "",
+]
+
+TEMPLATE_EXAMPLES = [
+    ["id", "integer", True, True],
+    ["name", "string", True, False],
+    ["created_at", "datetime", True, False],
+    ["is_active", "boolean", True, False],
+]
+
+def build_import_template_xlsx() -> str:
+    """Write the column import template to a temporary .xlsx and return its path."""
+    path = temporary_path(".xlsx")
+    header_index = len(TEMPLATE_INSTRUCTIONS) + 1
+    # 1-based sheet row of the first example, where the dropdowns start
+    first_data_row = header_index + 2
+    rows = [[line] for line in TEMPLATE_INSTRUCTIONS] + [[]] + [EXPORT_HEADERS] + TEMPLATE_EXAMPLES
+    write_xlsx(path, [Sheet(
+        "Columns Template",
+        rows,
+        widths=(20, 20, 20, 20),
+        styled_rows=[(0, 14), (header_index, 11)],
+        validations=[(f'"{",".join(DATA_TYPES)}"', f"B{first_data_row}:B1000"),
+                     ('"TRUE,FALSE"', f"C{first_data_row}:C1000"),
+                     ('"TRUE,FALSE"', f"D{first_data_row}:D1000")]
+    )])
+    return path
+
+def _prepend(first: Sequence[Any], rows: Iterable[Sequence[Any]]) -> Iterator[Sequence[Any]]:
+    yield first
+    yield from rows
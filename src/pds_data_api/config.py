@@ -7,6 +7,8 @@ BASE_DIR = Path(__file__).parent.parent.parent.absolute()
 
 # Database configuration
 DATABASE_URL = os.getenv('DATABASE_URL', f'sqlite:///{BASE_DIR}/pds_data.db')
+METADATA_POOL_SIZE = int(os.getenv('METADATA_POOL_SIZE', '5'))  # metadata DB pool per engine, per worker
+METADATA_MAX_OVERFLOW = int(os.getenv('METADATA_MAX_OVERFLOW', '10'))
 
 # Server configuration
 HOST = os.getenv('PDS_HOST', '127.0.0.1')  # Default to localhost for security
@@ -21,14 +23,66 @@ if not SECRET_KEY:
 # Logging configuration
 LOG_FILE = os.getenv('LOG_FILE', 'pds_data_api.log')
 LOG_LEVEL = os.getenv('LOG_LEVEL', 'WARNING')
+LOG_FORMAT = os.getenv('LOG_FORMAT', 'text')  # 'text' or 'json'
+LOG_LEVELS = os.getenv('LOG_LEVELS', '')  # per-module overrides, e.g. 'pds_data_api.pds_sync_service=INFO,sqlalchemy.engine=WARNING'
+LOG_SAMPLE_EVERY = int(os.getenv('LOG_SAMPLE_EVERY', '50'))  # log 1 in N per-batch messages
+
+# Tracing configuration
+OTEL_EXPORTER = os.getenv('OTEL_EXPORTER', 'none')  # 'none', 'otlp', 'file' or 'console'
+OTEL_TRACE_FILE = os.getenv('OTEL_TRACE_FILE', 'traces.jsonl')  # used by the 'file' exporter
+OTEL_SERVICE_NAME = os.getenv('OTEL_SERVICE_NAME', 'pds-data-api')
 
 # API configuration
 API_TIMEOUT = int(os.getenv('API_TIMEOUT', '30'))  # 30 seconds default timeout
 MAX_PAGE_SIZE = int(os.getenv('MAX_PAGE_SIZE', '1000'))
+EXPORT_PAGE_SIZE = int(os.getenv('EXPORT_PAGE_SIZE', '2000'))  # Qdrant scroll / SQL cursor batch for bulk exports
+REINDEX_BATCH_SIZE = int(os.getenv('REINDEX_BATCH_SIZE', '500'))  # texts per embedding request when re-indexing
+REINDEX_CONCURRENCY = int(os.getenv('REINDEX_CONCURRENCY', '4'))  # embedding requests in flight when re-indexing
+QDRANT_INDEXING_THRESHOLD = int(os.getenv('QDRANT_INDEXING_THRESHOLD', '20000'))  # KB of vectors before HNSW indexing; restored after a rebuild load
+QDRANT_INDEX_WAIT_TIMEOUT = float(os.getenv('QDRANT_INDEX_WAIT_TIMEOUT', '1800'))  # seconds a rebuild waits for indexing before giving up
+
+# Embedding configuration
+OPENAI_EMBEDDING_MODEL = os.getenv('OPENAI_EMBEDDING_MODEL', 'text-embedding-3-small')
+OPENAI_TIMEOUT = float(os.getenv('OPENAI_TIMEOUT', '60'))
+OPENAI_CONNECT_TIMEOUT = float(os.getenv('OPENAI_CONNECT_TIMEOUT', '10'))
+OPENAI_MAX_RETRIES = int(os.getenv('OPENAI_MAX_RETRIES', '3'))
+OPENAI_MAX_CONNECTIONS = int(os.getenv('OPENAI_MAX_CONNECTIONS', '20'))
+OPENAI_MAX_KEEPALIVE = int(os.getenv('OPENAI_MAX_KEEPALIVE', '10'))
+OPENAI_KEEPALIVE_EXPIRY = float(os.getenv('OPENAI_KEEPALIVE_EXPIRY', '60'))
+OPENAI_HTTP2 = os.getenv('OPENAI_HTTP2', 'true').lower() == 'true'
+OPENAI_BASE_URL = os.getenv('OPENAI_BASE_URL') or None  # e.g. a proxy or the offline fake embeddings server
+
+# SQL destination pool configuration (per destination connection, per worker)
+DEST_POOL_SIZE = int(os.getenv('DEST_POOL_SIZE', '2'))
+DEST_MAX_OVERFLOW = int(os.getenv('DEST_MAX_OVERFLOW', '2'))
+DEST_POOL_RECYCLE = int(os.getenv('DEST_POOL_RECYCLE', '1800'))
+DEST_STATEMENT_TIMEOUT_MS = int(os.getenv('DEST_STATEMENT_TIMEOUT_MS', '300000'))
+SQL_REFRESH_MAINTENANCE_WORK_MEM = os.getenv('SQL_REFRESH_MAINTENANCE_WORK_MEM', '256MB')  # for index builds after a full-refresh load
+SQL_SWAP_LOCK_TIMEOUT_MS = int(os.getenv('SQL_SWAP_LOCK_TIMEOUT_MS', '10000'))  # max wait for the lock when swapping in a refreshed table
+PGVECTOR_HNSW_M = int(os.getenv('PGVECTOR_HNSW_M', '16'))  # HNSW graph degree for pgvector destinations
+PGVECTOR_HNSW_EF_CONSTRUCTION = int(os.getenv('PGVECTOR_HNSW_EF_CONSTRUCTION', '64'))  # HNSW build-time candidate list
+PGVECTOR_EF_SEARCH = int(os.getenv('PGVECTOR_EF_SEARCH', '100'))  # HNSW query-time candidate list (raised to the limit)
+PGVECTOR_IVFFLAT_PROBES = int(os.getenv('PGVECTOR_IVFFLAT_PROBES', '10'))  # IVFFlat lists scanned per query
+
+# Sync bookkeeping
+SYNC_PROGRESS_INTERVAL = float(os.getenv('SYNC_PROGRESS_INTERVAL', '10'))  # seconds between progress writes
+PDS_MAX_RETRIES = int(os.getenv('PDS_MAX_RETRIES', '2'))  # retries per PDS page on connection errors, 429 and 5xx
+PDS_RETRY_BACKOFF = float(os.getenv('PDS_RETRY_BACKOFF', '2'))  # seconds, doubled per attempt
+PDS_PAGE_DELAY = float(os.getenv('PDS_PAGE_DELAY', '1'))  # pause between PDS pages (rate limiting)
+STAGE_TREND_RUNS = int(os.getenv('STAGE_TREND_RUNS', '30'))  # runs shown in the sync history trend charts
+FANOUT_QUEUE_PAGES = int(os.getenv('FANOUT_QUEUE_PAGES', '4'))  # pages buffered per destination in a fan-out sync
+STAGING_ENABLED = os.getenv('STAGING_ENABLED', 'false').lower() == 'true'  # stage PDS pages of every sync by default
+STAGING_KEEP_RUNS = int(os.getenv('STAGING_KEEP_RUNS', '3'))  # complete staged runs kept per table
+STAGING_MAX_AGE_DAYS = float(os.getenv('STAGING_MAX_AGE_DAYS', '7'))  # staged runs older than this are removed
+
+# Metadata DB query instrumentation
+QUERY_COUNT_WARN_THRESHOLD = int(os.getenv('QUERY_COUNT_WARN_THRESHOLD', '20'))  # 0 disables the warning
 
 # File paths
 TEMPLATE_DIR = os.path.join(BASE_DIR, 'src', 'pds_data_api', 'templates')
 STATIC_DIR = os.path.join(BASE_DIR, 'src', 'pds_data_api', 'static')
+PROFILE_DIR = os.getenv('PROFILE_DIR', os.path.join(BASE_DIR, 'profiles'))  # profiled sync runs
+STAGING_DIR = os.getenv('STAGING_DIR', os.path.join(BASE_DIR, 'staging'))  # staged PDS pages
 
 # Production settings
 DEBUG = False
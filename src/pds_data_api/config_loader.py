@@ -1,5 +1,21 @@
 import json
+import os
+import threading
+
+_secrets_cache = {}
+_secrets_lock = threading.Lock()
 
 def load_secrets(path="secrets.json"):
     with open(path, "r") as f:
-        return json.load(f) 
\ No newline at end of file
+        return json.load(f)
+
+def get_secrets(path=None):
+    """Return the parsed secrets file, re-reading it only when it changes on disk."""
+    path = os.path.abspath(path or os.getenv("SECRETS_PATH", "secrets.json"))
+    mtime = os.stat(path).st_mtime_ns
+    with _secrets_lock:
+        cached = _secrets_cache.get(path)
+        if cached is None or cached[0] != mtime:
+            cached = (mtime, load_secrets(path))
+            _secrets_cache[path] = cached
+        return cached[1]
@@ -1,13 +1,15 @@
 from sqlalchemy import create_engine, text
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 import os
 from dotenv import load_dotenv
 import time
 import logging
+from .config import METADATA_MAX_OVERFLOW, METADATA_POOL_SIZE
+from .query_stats import install_query_counter
+from .metrics import instrument_pool
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 # Load environment variables
@@ -16,33 +18,44 @@ load_dotenv()
 # Get the database URL from environment variable
 SQLALCHEMY_DATABASE_URL = os.getenv('DATABASE_URL', 'postgresql://pdsapi:pdsapi@db:5432/pds_data_api')
 
-def create_db_engine(max_retries=3, retry_interval=2):
-    """Create database engine with retry mechanism"""
-    for attempt in range(max_retries):
-        try:
-            engine = create_engine(
-                SQLALCHEMY_DATABASE_URL,
-                pool_pre_ping=True,  # Enable connection health checks
-                pool_size=5,  # Set a reasonable pool size
-                max_overflow=10  # Allow some overflow connections
-            )
-            # Test the connection
-            with engine.connect() as conn:
-                conn.execute(text("SELECT 1"))
-            return engine
-        except Exception as e:
-            if attempt < max_retries - 1:
-                time.sleep(retry_interval)
-            else:
-                logger.error(f"Failed to connect to database after {max_retries} attempts: {str(e)}")
-                raise
+def create_db_engine():
+    """Create the database engine; connections are opened lazily on first use."""
+    return create_engine(
+        SQLALCHEMY_DATABASE_URL,
+        pool_pre_ping=True,  # Enable connection health checks
+        pool_size=METADATA_POOL_SIZE,
+        max_overflow=METADATA_MAX_OVERFLOW
+    )
 
-# Create SQLAlchemy engine with retry mechanism
+# Create SQLAlchemy engine; startup connectivity checks live in init_db_connection()
 engine = create_db_engine()
 
+# Count statements per request/test (see query_stats)
+install_query_counter(engine)
+instrument_pool(engine, "metadata")
+
 # Create SessionLocal class
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+def get_async_database_url(url: str) -> str:
+    """Translate a sync PostgreSQL URL to its asyncpg equivalent."""
+    for prefix in ('postgresql+psycopg2://', 'postgresql://', 'postgres://'):
+        if url.startswith(prefix):
+            return 'postgresql+asyncpg://' + url[len(prefix):]
+    return url
+
+# Async engine for non-blocking reads in the web handlers
+ASYNC_DATABASE_URL = os.getenv('ASYNC_DATABASE_URL') or get_async_database_url(SQLALCHEMY_DATABASE_URL)
+async_engine = create_async_engine(
+    ASYNC_DATABASE_URL,
+    pool_pre_ping=True,
+    pool_size=METADATA_POOL_SIZE,
+    max_overflow=METADATA_MAX_OVERFLOW
+)
+install_query_counter(async_engine.sync_engine)
+instrument_pool(async_engine.sync_engine, "metadata_async")
+AsyncSessionLocal = async_sessionmaker(async_engine, expire_on_commit=False, autoflush=False)
+
 # Create Base class
 Base = declarative_base()
 
@@ -55,6 +68,11 @@ def get_db():
     finally:
         db.close()
 
+async def get_async_db():
+    """Get async database session."""
+    async with AsyncSessionLocal() as db:
+        yield db
+
 def test_db_connection():
     """Test database connection."""
     try:
@@ -0,0 +1,157 @@
+import json
+import logging
+import threading
+from typing import Any, Dict, Tuple
+from uuid import UUID
+
+import psycopg2
+from psycopg2 import errors, sql
+from sqlalchemy import create_engine
+from sqlalchemy.engine import URL, Engine
+
+from . import config
+from .metrics import instrument_pool
+
+logger = logging.getLogger(__name__)
+
+class DestinationEngineRegistry:
+    def __init__(self, pool_size: int = None, max_overflow: int = None,
+                 pool_recycle: int = None, statement_timeout_ms: int = None):
+        """Initialize the registry; engines are created on first use per connection."""
+        self.pool_size = pool_size or config.DEST_POOL_SIZE
+        self.max_overflow = max_overflow if max_overflow is not None else config.DEST_MAX_OVERFLOW
+        self.pool_recycle = pool_recycle or config.DEST_POOL_RECYCLE
+        self.statement_timeout_ms = statement_timeout_ms if statement_timeout_ms is not None else config.DEST_STATEMENT_TIMEOUT_MS
+        self._lock = threading.Lock()
+        # Serialize engine creation per connection without blocking lookups of other connections
+        self._connection_locks: Dict[UUID, threading.Lock] = {}
+        self._engines: Dict[UUID, Tuple[str, Engine]] = {}
+        self._ensured_databases = set()
+
+    @staticmethod
+    def _fingerprint(dest_config: Dict[str, Any]) -> str:
+        """Identify a destination config so edited connections get a fresh engine."""
+        return json.dumps(dest_config, sort_keys=True, default=str)
+
+    def _ensure_database_exists(self, dest_config: Dict[str, Any]):
+        """Create the destination database once per process if it doesn't exist."""
+        key = (dest_config['host'], str(dest_config['port']), dest_config['database'])
+        if key in self._ensured_databases:
+            return
+
+        conn = psycopg2.connect(
+            host=dest_config['host'],
+            port=dest_config['port'],
+            user=dest_config['username'],
+            password=dest_config['password'],
+            database='postgres'
+        )
+        try:
+            conn.autocommit = True
+            with conn.cursor() as cursor:
+                cursor.execute("SELECT 1 FROM pg_database WHERE datname = %s", (dest_config['database'],))
+                if not cursor.fetchone():
+                    try:
+                        cursor.execute(sql.SQL("CREATE DATABASE {}").format(sql.Identifier(dest_config['database'])))
+                        logger.info(f"Created database: {dest_config['database']}")
+                    except errors.DuplicateDatabase:
+                        # Another connection to the same database created it first
+                        pass
+        finally:
+            conn.close()
+        self._ensured_databases.add(key)
+
+    def _create_engine(self, dest_config: Dict[str, Any]) -> Engine:
+        """Create a pooled engine for a destination database."""
+        url = URL.create(
+            "postgresql",
+            username=dest_config['username'],
+            password=dest_config['password'],
+            host=dest_config['host'],
+            port=int(dest_config['port']),
+            database=dest_config['database']
+        )
+        connect_args = {}
+        if self.statement_timeout_ms:
+            connect_args["options"] = f"-c statement_timeout={self.statement_timeout_ms}"
+        return create_engine(
+            url,
+            pool_size=self.pool_size,
+            max_overflow=self.max_overflow,
+            pool_recycle=self.pool_recycle,
+            pool_pre_ping=True,
+            connect_args=connect_args
+        )
+
+    def get_engine(self, connection_id: UUID, dest_config: Dict[str, Any]) -> Engine:
+        """Return the cached engine for a destination connection, creating it if needed."""
+        fingerprint = self._fingerprint(dest_config)
+        with self._lock:
+            cached = self._engines.get(connection_id)
+            if cached and cached[0] == fingerprint:
+                return cached[1]
+            connection_lock = self._connection_locks.setdefault(connection_id, threading.Lock())
+
+        # Creating an engine may connect to the server; only callers of this connection wait on it
+        with connection_lock:
+            with self._lock:
+                cached = self._engines.get(connection_id)
+            if cached and cached[0] == fingerprint:
+                return cached[1]
+
+            self._ensure_database_exists(dest_config)
+            engine = self._create_engine(dest_config)
+            # Database names repeat across hosts; the connection id is unique (and keys pool_stats)
+            instrument_pool(engine, f"destination:{connection_id}")
+            with self._lock:
+                replaced = self._engines.get(connection_id)
+                self._engines[connection_id] = (fingerprint, engine)
+        if replaced:
+            logger.info(f"Destination connection {connection_id} changed; disposing old engine")
+            replaced[1].dispose()
+        return engine
+
+    def dispose(self, connection_id: UUID):
+        """Dispose the engine for a single destination connection."""
+        with self._lock:
+            cached = self._engines.pop(connection_id, None)
+        if cached:
+            cached[1].dispose()
+
+    def dispose_all(self):
+        """Dispose every cached engine."""
+        with self._lock:
+            engines = list(self._engines.values())
+            self._engines.clear()
+        for _, engine in engines:
+            engine.dispose()
+
+    def pool_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Return pool usage for each cached destination engine."""
+        with self._lock:
+            engines = dict(self._engines)
+        return {str(connection_id): engine_pool_stats(engine) for connection_id, (_, engine) in engines.items()}
+
+def engine_pool_stats(engine: Engine) -> Dict[str, Any]:
+    """Summarize the connection pool of an engine."""
+    pool = engine.pool
+    stats = {"database": engine.url.database, "status": pool.status()}
+    for name in ("size", "checkedin", "checkedout", "overflow"):
+        method = getattr(pool, name, None)
+        if callable(method):
+            stats[name] = method()
+    max_overflow = getattr(pool, "_max_overflow", 0)
+    stats["max_connections"] = stats.get("size", 0) + max_overflow if max_overflow >= 0 else None
+    return stats
+
+_registry: DestinationEngineRegistry = None
+_registry_lock = threading.Lock()
+
+def get_destination_engine_registry() -> DestinationEngineRegistry:
+    """Return the process-wide destination engine registry."""
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                _registry = DestinationEngineRegistry()
+    return _registry
@@ -0,0 +1,113 @@
+import importlib.util
+import logging
+import threading
+from typing import TYPE_CHECKING, List, Optional, Tuple
+
+import httpx
+
+from . import config
+from .config_loader import get_secrets
+
+if TYPE_CHECKING:
+    from openai import OpenAI
+
+logger = logging.getLogger(__name__)
+
+class EmbeddingClientProvider:
+    def __init__(self, model: str = None, timeout: float = None, connect_timeout: float = None,
+                 max_retries: int = None, max_connections: int = None,
+                 max_keepalive: int = None, http2: bool = None, base_url: str = None):
+        """Initialize the provider; clients are created lazily on first use."""
+        self.model = model or config.OPENAI_EMBEDDING_MODEL
+        self.base_url = base_url or config.OPENAI_BASE_URL
+        self.timeout = timeout if timeout is not None else config.OPENAI_TIMEOUT
+        self.connect_timeout = connect_timeout if connect_timeout is not None else config.OPENAI_CONNECT_TIMEOUT
+        self.max_retries = max_retries if max_retries is not None else config.OPENAI_MAX_RETRIES
+        self.max_connections = max_connections or config.OPENAI_MAX_CONNECTIONS
+        self.max_keepalive = max_keepalive or config.OPENAI_MAX_KEEPALIVE
+        self.http2 = config.OPENAI_HTTP2 if http2 is None else http2
+        if self.http2 and importlib.util.find_spec("h2") is None:
+            logger.warning("HTTP/2 requested for OpenAI but the 'h2' package is not installed; using HTTP/1.1")
+            self.http2 = False
+
+        self._lock = threading.Lock()
+        self._http_client: Optional[httpx.Client] = None
+        self._client: Optional["OpenAI"] = None
+        self._api_key: Optional[str] = None
+
+    def _build_http_client(self) -> httpx.Client:
+        """Build the pooled httpx client shared by every OpenAI client."""
+        limits = httpx.Limits(
+            max_connections=self.max_connections,
+            max_keepalive_connections=self.max_keepalive,
+            keepalive_expiry=config.OPENAI_KEEPALIVE_EXPIRY
+        )
+        # No transport-level retries: the OpenAI client retries (with backoff) up to max_retries
+        return httpx.Client(
+            timeout=httpx.Timeout(self.timeout, connect=self.connect_timeout),
+            transport=httpx.HTTPTransport(http2=self.http2, limits=limits)
+        )
+
+    def get_client(self) -> "OpenAI":
+        """Return the shared OpenAI client, rebuilding it if the API key changed."""
+        from openai import OpenAI
+        
+        secrets = get_secrets()
+        api_key = secrets.get("openai_api_key")
+        if not api_key:
+            raise ValueError("OpenAI API key not found in secrets.json")
+
+        with self._lock:
+            if self._client is None or api_key != self._api_key:
+                if self._http_client is None:
+                    self._http_client = self._build_http_client()
+                self._client = OpenAI(
+                    api_key=api_key,
+                    base_url=self.base_url,
+                    http_client=self._http_client,
+                    max_retries=self.max_retries,
+                    timeout=self.timeout
+                )
+                self._api_key = api_key
+                logger.info(f"Initialized OpenAI embedding client (model={self.model}, http2={self.http2})")
+            return self._client
+
+    def embed(self, texts: List[str]) -> List[List[float]]:
+        """Embed a list of texts with the configured model."""
+        return self.embed_with_usage(texts)[0]
+
+    def embed_with_usage(self, texts: List[str]) -> Tuple[List[List[float]], int]:
+        """Embed a list of texts and also return the number of tokens billed."""
+        response = self.get_client().embeddings.create(model=self.model, input=texts)
+        usage = getattr(response, "usage", None)
+        return [item.embedding for item in response.data], getattr(usage, "total_tokens", 0) or 0
+
+    def close(self):
+        """Close the pooled HTTP client."""
+        with self._lock:
+            if self._http_client is not None:
+                self._http_client.close()
+            self._http_client = None
+            self._client = None
+            self._api_key = None
+
+_provider: Optional[EmbeddingClientProvider] = None
+_provider_lock = threading.Lock()
+
+def get_embedding_provider() -> EmbeddingClientProvider:
+    """Return the process-wide embedding client provider."""
+    global _provider
+    if _provider is None:
+        with _provider_lock:
+            if _provider is None:
+                _provider = EmbeddingClientProvider()
+    return _provider
+
+def configure_embedding_provider(**kwargs) -> EmbeddingClientProvider:
+    """Replace the process-wide provider with one built from ``kwargs``, closing the old one."""
+    global _provider
+    with _provider_lock:
+        if _provider is not None:
+            _provider.close()
+        _provider = EmbeddingClientProvider(**kwargs)
+    return _provider
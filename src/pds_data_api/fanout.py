@@ -0,0 +1,166 @@
+"""Fan-out sync: one PDS extraction feeding several destinations.
+
+A table's primary destination plus its ``extra_destinations`` each get their
+own ``PDSSyncService`` (own clients, stats and ``SyncHistory`` row). The
+primary service extracts the pages from PDS (or a staged run) once and puts
+every page on a bounded queue per destination; each destination's writer
+runs ``run_sync(pages=...)`` in its own thread, so Qdrant and SQL writes
+proceed in parallel while PDS is read only once.
+
+A destination that fails stops receiving pages and is marked FAILED without
+affecting the others; if the extraction itself fails, every destination
+still running is marked FAILED with the extraction error.
+"""
+import logging
+import queue
+import threading
+from typing import Any, Dict, Iterator, List, Optional
+from uuid import UUID
+
+from sqlalchemy.orm import sessionmaker
+
+from .config import FANOUT_QUEUE_PAGES
+from .database import SessionLocal
+from .models import TableDestination
+from .pds_sync_service import PDSSyncService
+from .sync_stats import SyncStats
+
+logger = logging.getLogger(__name__)
+
+_DONE = object()
+
+class _ExtractionFailed:
+    def __init__(self, error: BaseException):
+        self.error = error
+
+class _Destination:
+    def __init__(self, service: PDSSyncService, counts_pages: bool):
+        """A destination writer fed through a bounded page queue."""
+        self.service = service
+        self.counts_pages = counts_pages
+        self.pages: "queue.Queue" = queue.Queue(maxsize=FANOUT_QUEUE_PAGES)
+        self.result: Optional[Dict[str, Any]] = None
+        self.thread = threading.Thread(
+            target=self._run, name=f"fanout-{service.dest_connection.connection_name}", daemon=True
+        )
+
+    @property
+    def name(self) -> str:
+        return self.service.dest_connection.connection_name
+
+    def _iter_pages(self) -> Iterator[List[Dict[str, Any]]]:
+        while True:
+            items = self.pages.get()
+            if items is _DONE:
+                return
+            if isinstance(items, _ExtractionFailed):
+                raise RuntimeError(f"PDS extraction failed: {items.error}")
+            if self.counts_pages:
+                self.service.stats.pages += 1
+                self.service.stats.rows_fetched += len(items)
+            yield items
+
+    def _run(self):
+        try:
+            self.result = self.service.run_sync(pages=self._iter_pages())
+        except Exception as e:
+            logger.exception("Fan-out destination %s failed: %s", self.name, e)
+            self.result = {"status": "error", "message": str(e)}
+        if str(self.result.get("status", "")).lower() != "success":
+            # A run that failed before adopting its prepared history never closed it out
+            try:
+                self.service.fail_prepared_history(self.result.get("message") or "Sync failed")
+            except Exception as e:
+                logger.warning("Could not record the failure of %s: %s", self.name, e)
+
+    def offer(self, items) -> bool:
+        """Queue a page, waiting while the writer is busy; False once the writer has stopped."""
+        while self.thread.is_alive():
+            try:
+                self.pages.put(items, timeout=1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+class FanOutSync:
+    def __init__(self, table_id: UUID, session_factory: sessionmaker = SessionLocal):
+        """Prepare one sync service per destination of a table (primary first)."""
+        with session_factory() as session:
+            extra_ids = [
+                destination.connection_id for destination in
+                session.query(TableDestination).filter(TableDestination.pds_table_id == table_id)
+            ]
+        self.services = [PDSSyncService(table_id, session_factory)] + [
+            PDSSyncService(table_id, session_factory, destination_connection_id=connection_id)
+            for connection_id in extra_ids
+        ]
+        self.extractor = self.services[0]
+
+    def run_sync(self, stage: bool = None, from_stage: str = None, rebuild: bool = None) -> Dict[str, Any]:
+        """Extract once and write every page to all destinations concurrently."""
+        if rebuild is not None:
+            for service in self.services:
+                service.rebuild = rebuild
+        if stage is not None:
+            self.extractor.stage_pages = stage
+        if from_stage is not None:
+            self.extractor.staged_run = from_stage
+
+        # Histories exist before the writers start so the extractor can record its staging path
+        for service in self.services:
+            service.prepare_sync_history()
+        # The extractor's own writer thread updates its stats concurrently; count the extraction apart
+        extraction_stats = SyncStats()
+        self.extractor.extraction_stats = extraction_stats
+        destinations = [_Destination(service, service is not self.extractor) for service in self.services]
+        for destination in destinations:
+            destination.thread.start()
+
+        table_name = self.extractor.table.table_name
+        logger.info("Fan-out sync of %s to %s", table_name, ", ".join(d.name for d in destinations))
+        end = _DONE
+        try:
+            for items in self.extractor._iter_pages(table_name, self.extractor.sync_history):
+                delivered = [destination.offer(items) for destination in destinations]
+                if not any(delivered):
+                    logger.error("All fan-out destinations of %s stopped; ending extraction", table_name)
+                    break
+        except Exception as e:
+            logger.exception("Fan-out extraction of %s failed: %s", table_name, e)
+            end = _ExtractionFailed(e)
+        finally:
+            for destination in destinations:
+                destination.offer(end)
+            for destination in destinations:
+                destination.thread.join()
+            self.extractor.extraction_stats = None
+
+        # Every writer has stopped; fold the extraction into the primary destination's run
+        self.extractor.stats.merge(extraction_stats)
+        try:
+            self.extractor._write_sync_history(self.extractor.sync_history, **self.extractor.stats.as_columns())
+        except Exception as e:
+            logger.warning("Could not record extraction stats for %s: %s", table_name, e)
+
+        # Every destination can replay the shared staged pages
+        staging_path = self.extractor.sync_history.staging_path
+        if staging_path:
+            for service in self.services[1:]:
+                service._write_sync_history(service.sync_history, staging_path=staging_path)
+
+        results = [
+            {"destination": destination.name, "sync_guid": str(destination.service.sync_history.sync_guid),
+             **(destination.result or {})}
+            for destination in destinations
+        ]
+        failed = [result for result in results if str(result.get("status", "")).lower() != "success"]
+        return {
+            "status": "error" if failed else "success",
+            "message": f"Synced {table_name} to {len(results) - len(failed)} of {len(results)} destinations",
+            "destinations": results,
+        }
+
+def has_extra_destinations(session, table_id: UUID) -> bool:
+    """Whether a table is configured to fan out to more than its primary destination."""
+    return session.query(TableDestination.id).filter(TableDestination.pds_table_id == table_id).first() is not None
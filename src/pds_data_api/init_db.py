@@ -1,21 +1,30 @@
-from sqlalchemy.sql import text
 from sqlalchemy.orm import Session
-from sqlalchemy import create_engine
-from .database import engine, Base, SessionLocal
+from .database import engine, Base
 from .models import ConnectionOptions, Connection, Config
 import logging
 from datetime import datetime
 import psycopg2
 import os
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Advisory lock key shared by every worker/container running startup initialization
+INIT_LOCK_KEY = 0x50445344
+
+# Set by the process that already initialized the database (e.g. start_prod.py before forking workers)
+INITIALIZED_ENV = "PDS_DB_INITIALIZED"
+
 def init_db():
-    """Initialize the database and create necessary tables."""
+    """Initialize the database and create necessary tables.
+
+    Runs at most once per process and is serialized across workers and
+    containers with a PostgreSQL advisory lock on the ``postgres`` database.
+    """
+    if os.getenv(INITIALIZED_ENV) == "1":
+        logger.info("Database already initialized for this deployment; skipping")
+        return
+
     try:
-        # Create database if it doesn't exist
         conn = psycopg2.connect(
             host=os.getenv("DB_HOST", "db"),
             port=os.getenv("DB_PORT", "5432"),
@@ -25,35 +34,34 @@ def init_db():
         )
         conn.autocommit = True
         cursor = conn.cursor()
+        try:
+            cursor.execute("SELECT pg_advisory_lock(%s)", (INIT_LOCK_KEY,))
+            
+            # Create database if it doesn't exist
+            cursor.execute("SELECT 1 FROM pg_database WHERE datname = 'pds_data_api'")
+            if not cursor.fetchone():
+                cursor.execute('CREATE DATABASE pds_data_api')
+                logger.info("Created new database: pds_data_api")
+            
+            # Create tables
+            Base.metadata.create_all(engine)
+            
+            # Add any missing default connection types (new types reach existing installs too)
+            with Session(engine) as session:
+                existing_types = {ct.name for ct in session.query(ConnectionOptions).all()}
+                default_types = ['PDS', 'PostgreSQL', 'Oracle', 'Qdrant', 'PostgreSQL+pgvector']
+                missing_types = [name for name in default_types if name not in existing_types]
+                if missing_types:
+                    for type_name in missing_types:
+                        session.add(ConnectionOptions(name=type_name))
+                    session.commit()
+                    logger.info("Added connection types: %s", ", ".join(missing_types))
+        finally:
+            cursor.execute("SELECT pg_advisory_unlock(%s)", (INIT_LOCK_KEY,))
+            cursor.close()
+            conn.close()
         
-        # Check if database exists
-        cursor.execute("SELECT 1 FROM pg_database WHERE datname = 'pds_data_api'")
-        if not cursor.fetchone():
-            cursor.execute('CREATE DATABASE pds_data_api')
-            logger.info("Created new database: pds_data_api")
-        
-        cursor.close()
-        conn.close()
-        
-        # Connect to the application database
-        engine = create_engine(
-            f"postgresql://{os.getenv('DB_USER', 'pdsapi')}:{os.getenv('DB_PASSWORD', 'pdsapi')}@{os.getenv('DB_HOST', 'db')}:{os.getenv('DB_PORT', '5432')}/pds_data_api"
-        )
-        
-        # Create tables
-        Base.metadata.create_all(engine)
-        
-        # Initialize connection types if needed
-        with Session(engine) as session:
-            existing_types = {ct.name for ct in session.query(ConnectionOptions).all()}
-            if not existing_types:
-                # Add default connection types
-                default_types = ['PDS', 'PostgreSQL', 'Oracle', 'Qdrant']
-                for type_name in default_types:
-                    session.add(ConnectionOptions(name=type_name))
-                session.commit()
-                logger.info("Initialized default connection types")
-        
+        os.environ[INITIALIZED_ENV] = "1"
     except Exception as e:
         logger.error(f"Error initializing database: {str(e)}")
-        raise 
\ No newline at end of file
+        raise
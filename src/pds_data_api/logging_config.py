@@ -0,0 +1,151 @@
+"""Logging setup for PDS Data API.
+
+Records are handed to a ``QueueHandler`` on the calling thread and formatted,
+redacted and written by a background ``QueueListener``, so request handlers and
+sync loops never block on log I/O.
+"""
+import atexit
+import copy
+import json
+import logging
+import logging.handlers
+import queue
+import re
+import threading
+from typing import Dict, Optional
+
+from . import config
+
+SECRET_KEYS = ("password", "api_key", "apikey", "secret", "token", "authorization", "openai_api_key", "qdrant_api_key")
+
+_SECRET_PATTERNS = [
+    # "password": "x", 'api_key': 'x', password=x
+    (re.compile(r"""(?i)(["']?(?:%s)["']?\s*[:=]\s*)(["'])(?:(?!\2).)*\2""" % "|".join(SECRET_KEYS)), r"\1\2***\2"),
+    (re.compile(r"""(?i)\b((?:%s)=)[^\s,&;]+""" % "|".join(SECRET_KEYS)), r"\1***"),
+    (re.compile(r"(?i)\b(Basic|Bearer)\s+[A-Za-z0-9+/=._\-]+"), r"\1 ***"),
+    (re.compile(r"\bsk-[A-Za-z0-9_\-]{8,}"), "sk-***"),
+]
+
+def redact(text: str) -> str:
+    """Mask credentials that look like passwords, API keys or auth headers."""
+    for pattern, replacement in _SECRET_PATTERNS:
+        text = pattern.sub(replacement, text)
+    return text
+
+class RedactingFilter(logging.Filter):
+    def filter(self, record: logging.LogRecord) -> bool:
+        """Render the message once and strip secrets from it and any traceback."""
+        record.msg = redact(record.getMessage())
+        record.args = None
+        if record.exc_info and not record.exc_text:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        if record.exc_text:
+            record.exc_text = redact(record.exc_text)
+        return True
+
+_RESERVED_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime"}
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        """Format a record as one JSON object, including ``extra=`` fields."""
+        entry = {
+            "time": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RESERVED_ATTRS and not key.startswith("_"):
+                entry[key] = value
+        if record.exc_text:
+            entry["exc"] = record.exc_text
+        return json.dumps(entry, default=str)
+
+class _DeferredQueueHandler(logging.handlers.QueueHandler):
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        """Enqueue the record unformatted; formatting happens on the listener thread."""
+        return copy.copy(record)
+
+_listener: Optional[logging.handlers.QueueListener] = None
+_lock = threading.Lock()
+
+def parse_levels(spec: str) -> Dict[str, str]:
+    """Parse ``"module=LEVEL,other=LEVEL"`` into a mapping."""
+    levels = {}
+    for item in filter(None, (part.strip() for part in (spec or "").split(","))):
+        name, _, level = item.partition("=")
+        levels[name.strip()] = level.strip().upper()
+    return levels
+
+def set_levels(levels: Dict[str, str]):
+    """Set logger levels at runtime; use ``"root"`` for the root logger."""
+    for name, level in levels.items():
+        logging.getLogger(None if name == "root" else name).setLevel(level.upper())
+
+def get_levels() -> Dict[str, str]:
+    """Return the explicitly configured level of the root and every known logger."""
+    levels = {"root": logging.getLevelName(logging.getLogger().level)}
+    for name, logger in sorted(logging.Logger.manager.loggerDict.items()):
+        if isinstance(logger, logging.Logger) and logger.level != logging.NOTSET:
+            levels[name] = logging.getLevelName(logger.level)
+    return levels
+
+def setup_logging(level: str = None, log_file: str = None, log_format: str = None, module_levels: str = None):
+    """Route all logging through a background queue listener (idempotent)."""
+    global _listener
+    with _lock:
+        if _listener is not None:
+            return
+
+        formatter = (
+            JsonFormatter() if (log_format or config.LOG_FORMAT) == "json"
+            else logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+        )
+        handlers = [logging.StreamHandler()]
+        log_file = log_file if log_file is not None else config.LOG_FILE
+        if log_file:
+            handlers.append(logging.FileHandler(log_file))
+        for handler in handlers:
+            handler.setFormatter(formatter)
+            handler.addFilter(RedactingFilter())
+
+        log_queue = queue.SimpleQueue()
+        root = logging.getLogger()
+        for handler in list(root.handlers):
+            root.removeHandler(handler)
+        root.addHandler(_DeferredQueueHandler(log_queue))
+        root.setLevel((level or config.LOG_LEVEL).upper())
+        set_levels(parse_levels(module_levels if module_levels is not None else config.LOG_LEVELS))
+
+        _listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+        _listener.start()
+        atexit.register(shutdown_logging)
+
+def shutdown_logging():
+    """Flush queued records and stop the listener thread."""
+    global _listener
+    with _lock:
+        if _listener is not None:
+            _listener.stop()
+            for handler in _listener.handlers:
+                handler.close()
+            _listener = None
+
+class SampledLogger:
+    def __init__(self, logger: logging.Logger, every: int = None):
+        """Log the first call and then every ``every``-th call; per-batch hot paths use this."""
+        self.logger = logger
+        self.every = max(1, every or config.LOG_SAMPLE_EVERY)
+        self.calls = 0
+
+    def log(self, level: int, msg: str, *args, **kwargs):
+        self.calls += 1
+        if (self.calls == 1 or self.calls % self.every == 0) and self.logger.isEnabledFor(level):
+            self.logger.log(level, msg, *args, **kwargs)
+
+    def info(self, msg: str, *args, **kwargs):
+        self.log(logging.INFO, msg, *args, **kwargs)
+
+    def debug(self, msg: str, *args, **kwargs):
+        self.log(logging.DEBUG, msg, *args, **kwargs)
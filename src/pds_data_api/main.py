@@ -1,54 +1,75 @@
 from fastapi import FastAPI, Request, Form, Depends, HTTPException, UploadFile, File
 from fastapi.templating import Jinja2Templates
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import RedirectResponse, StreamingResponse, HTMLResponse
-from sqlalchemy.orm import Session, joinedload
-from typing import List
+from fastapi.responses import FileResponse, RedirectResponse, StreamingResponse, HTMLResponse, Response
+from sqlalchemy import and_, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, aliased, joinedload, selectinload
+from typing import Dict, List, Optional
 import uuid
 import json
 import secrets
 import time
-import io
 import logging
-from openpyxl import Workbook, load_workbook
-from openpyxl.worksheet.datavalidation import DataValidation
 import base64
 import requests
-from qdrant_client import QdrantClient
-from qdrant_client.http import models
 import os
-import uvicorn
 import pathlib
+from contextlib import asynccontextmanager
 from datetime import datetime
-from openpyxl.styles import PatternFill
+from starlette.concurrency import run_in_threadpool
 
-from .models import Base, Connection, Config, TableColumn, ConnectionOptions, SyncHistory
-from .database import engine, get_db
+from .models import Base, Connection, Config, TableColumn, TableDestination, ConnectionOptions, SyncHistory
+from .database import engine, async_engine, get_db, get_async_db, init_db_connection
 from .init_db import init_db
 from .pds_sync_service import PDSSyncService
+from .fanout import FanOutSync, has_extra_destinations
+from .reindex import reindex_table
+from .collection_versions import resolve_collection
+from .destination_engines import engine_pool_stats, get_destination_engine_registry
+from .embedding_client import get_embedding_provider
 from .qdrant_routes import router as qdrant_router
-
-# Configure logging
-logging.basicConfig(
-    level=logging.DEBUG,  # Changed from WARNING to DEBUG
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('pds_data_api.log'),
-        logging.StreamHandler()
-    ]
+from .pgvector_routes import router as pgvector_router
+from .query_stats import start_query_count
+from .config import MAX_PAGE_SIZE, QUERY_COUNT_WARN_THRESHOLD, STAGE_TREND_RUNS
+from .logging_config import get_levels, set_levels, setup_logging
+from .tracing import instrument_app, setup_tracing, shutdown_tracing
+from .metrics import render_metrics
+from .staging import read_manifest
+from .sync_stats import STAGE_COLUMNS
+from .data_export import FORMATS, export_table
+from .column_io import (
+    XLSX_MEDIA_TYPE, build_columns_xlsx, build_import_template_xlsx, import_columns_from_workbook,
+    iter_columns_csv, iter_file
 )
+
+# Configure logging (non-blocking queue handler; see logging_config)
+setup_logging()
 logger = logging.getLogger(__name__)
 
-# Create tables if they don't exist
-# Base.metadata.create_all(bind=engine)  # Commented out as tables are created in init.sql
+# Tracing is a no-op unless OTEL_EXPORTER selects an exporter
+setup_tracing()
 
-# Initialize database with connection types
-init_db()
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Run one-time database initialization on startup and release pools on shutdown."""
+    if not await run_in_threadpool(init_db_connection):
+        raise RuntimeError("Database is not reachable")
+    # Initialize database with connection types (skipped if start_prod.py already did)
+    await run_in_threadpool(init_db)
+    yield
+    get_destination_engine_registry().dispose_all()
+    get_embedding_provider().close()
+    await async_engine.dispose()
+    engine.dispose()
+    shutdown_tracing()
 
-app = FastAPI()
+app = FastAPI(lifespan=lifespan)
+instrument_app(app)
 
 # Include Qdrant routes
 app.include_router(qdrant_router)
+app.include_router(pgvector_router)
 
 # Store server start time
 server_start_time = time.time()
@@ -57,7 +78,7 @@ server_start_time = time.time()
 current_dir = pathlib.Path(__file__).parent.resolve()
 
 # Mount static files and templates
-app.mount("/static", StaticFiles(directory=str(current_dir / "static")), name="static")
+app.mount("/static", StaticFiles(directory=str(current_dir / "static"), check_dir=False), name="static")
 templates = Jinja2Templates(directory=str(current_dir / "templates"))
 
 # Add json_decode filter to Jinja2 environment
@@ -71,13 +92,25 @@ def json_decode(value):
 
 templates.env.filters["json_decode"] = json_decode
 
+@app.middleware("http")
+async def count_db_queries(request: Request, call_next):
+    """Expose the number of metadata DB queries each request ran."""
+    counter = start_query_count()
+    response = await call_next(request)
+    response.headers["X-DB-Query-Count"] = str(counter.count)
+    if QUERY_COUNT_WARN_THRESHOLD and counter.count > QUERY_COUNT_WARN_THRESHOLD:
+        logger.warning(f"{request.method} {request.url.path} ran {counter.count} queries")
+    return response
+
 @app.get("/")
-async def root(request: Request, db: Session = Depends(get_db)):
+async def root(request: Request, db: AsyncSession = Depends(get_async_db)):
     """Show the dashboard/home page."""
     # Get some basic stats for the dashboard
-    total_connections = db.query(Connection).count()
-    total_configs = db.query(Config).count()
-    recent_syncs = db.query(SyncHistory).order_by(SyncHistory.created_at.desc()).limit(5).all()
+    total_connections = await db.scalar(select(func.count()).select_from(Connection))
+    total_configs = await db.scalar(select(func.count()).select_from(Config))
+    recent_syncs = (await db.scalars(
+        select(SyncHistory).order_by(SyncHistory.created_at.desc()).limit(5)
+    )).all()
     
     return templates.TemplateResponse(
         "dashboard.html",
@@ -90,9 +123,11 @@ async def root(request: Request, db: Session = Depends(get_db)):
     )
 
 @app.get("/connections")
-async def list_connections(request: Request, db: Session = Depends(get_db)):
+async def list_connections(request: Request, db: AsyncSession = Depends(get_async_db)):
     """List all connections."""
-    connections = db.query(Connection).options(joinedload(Connection.connection_type)).all()
+    connections = (await db.scalars(
+        select(Connection).options(joinedload(Connection.connection_type))
+    )).all()
     return templates.TemplateResponse(
         "connections/list.html",
         {"request": request, "connections": connections}
@@ -132,26 +167,30 @@ async def create_connection(
     return RedirectResponse(url="/connections", status_code=303)
 
 @app.get("/connections/{connection_id}")
-async def get_connection(connection_id: uuid.UUID, request: Request, db: Session = Depends(get_db)):
+async def get_connection(connection_id: uuid.UUID, request: Request, db: AsyncSession = Depends(get_async_db)):
     """Get a specific connection."""
-    connection = db.query(Connection).filter(Connection.id == connection_id).first()
+    connection = await db.scalar(
+        select(Connection).options(joinedload(Connection.connection_type)).where(Connection.id == connection_id)
+    )
     if not connection:
         raise HTTPException(status_code=404, detail="Connection not found")
     
-    connection_types = db.query(ConnectionOptions).all()
+    connection_types = (await db.scalars(select(ConnectionOptions))).all()
     return templates.TemplateResponse(
         "connections/form.html",
         {"request": request, "connection": connection, "connection_types": connection_types}
     )
 
 @app.get("/connections/{connection_id}/edit")
-async def edit_connection(connection_id: uuid.UUID, request: Request, db: Session = Depends(get_db)):
+async def edit_connection(connection_id: uuid.UUID, request: Request, db: AsyncSession = Depends(get_async_db)):
     """Show form to edit a connection."""
-    connection = db.query(Connection).filter(Connection.id == connection_id).first()
+    connection = await db.scalar(
+        select(Connection).options(joinedload(Connection.connection_type)).where(Connection.id == connection_id)
+    )
     if not connection:
         raise HTTPException(status_code=404, detail="Connection not found")
     
-    connection_types = db.query(ConnectionOptions).all()
+    connection_types = (await db.scalars(select(ConnectionOptions))).all()
     return templates.TemplateResponse(
         "connections/form.html",
         {"request": request, "connection": connection, "connection_types": connection_types}
@@ -195,18 +234,15 @@ async def delete_connection(connection_id: uuid.UUID, db: Session = Depends(get_
     return RedirectResponse(url="/connections", status_code=303)
 
 @app.get("/pds-tables")
-async def list_pds_tables(request: Request, db: Session = Depends(get_db)):
+async def list_pds_tables(request: Request, db: AsyncSession = Depends(get_async_db)):
     """List all PDS tables."""
     try:
         # Query the full Config objects
-        query = db.query(Config).options(
-            joinedload(Config.source_connection),
-            joinedload(Config.destination_connection)
+        query = select(Config).options(
+            joinedload(Config.source_connection).joinedload(Connection.connection_type),
+            joinedload(Config.destination_connection).joinedload(Connection.connection_type)
         )
-        print("SQL Query:", str(query.statement.compile(compile_kwargs={"literal_binds": True})))
-        configs = query.all()
-        print("Configs data:", [vars(config) for config in configs])
-        print("First Config object attributes:", dir(configs[0]) if configs else "No configs found")
+        configs = (await db.scalars(query)).all()
         
         # Transform configs to match template expectations
         tables = []
@@ -231,7 +267,7 @@ async def list_pds_tables(request: Request, db: Session = Depends(get_db)):
 @app.get("/pds-tables/new")
 async def new_pds_table(request: Request, db: Session = Depends(get_db)):
     """Show form to create a new PDS table configuration."""
-    connections = db.query(Connection).all()
+    connections = db.query(Connection).options(joinedload(Connection.connection_type)).all()
     return templates.TemplateResponse(
         "pds_tables/form.html",
         {"request": request, "config": None, "connections": connections}
@@ -246,6 +282,7 @@ async def create_pds_table(
     title: str = Form(None),
     page_size: int = Form(1000),
     qdrant_batch_size: int = Form(100),
+    extra_destination_ids: List[uuid.UUID] = Form([]),
     db: Session = Depends(get_db)
 ):
     """Create a new PDS table configuration."""
@@ -264,7 +301,11 @@ async def create_pds_table(
         title=title,
         page_size=page_size,
         qdrant_batch_size=qdrant_batch_size,
-        active=True
+        active=True,
+        extra_destinations=[
+            TableDestination(connection_id=connection_id)
+            for connection_id in dict.fromkeys(extra_destination_ids) if connection_id != destination_connection_id
+        ]
     )
     db.add(config)
     db.commit()
@@ -277,20 +318,22 @@ async def get_pds_table(config_id: uuid.UUID, request: Request, db: Session = De
     if not config:
         raise HTTPException(status_code=404, detail="Configuration not found")
     
-    columns = db.query(TableColumn).filter(TableColumn.config_id == config_id).all()
+    columns = db.query(TableColumn).filter(TableColumn.pds_table_id == config_id).all()
     return templates.TemplateResponse(
         "pds_tables/columns.html",
-        {"request": request, "config": config, "columns": columns}
+        {"request": request, "table": config, "columns": columns}
     )
 
 @app.get("/pds-tables/{config_id}/edit")
-async def edit_pds_table(config_id: uuid.UUID, request: Request, db: Session = Depends(get_db)):
+async def edit_pds_table(config_id: uuid.UUID, request: Request, db: AsyncSession = Depends(get_async_db)):
     """Show form to edit a PDS table configuration."""
-    config = db.query(Config).filter(Config.id == config_id).first()
+    config = await db.get(Config, config_id, options=[selectinload(Config.extra_destinations)])
     if not config:
         raise HTTPException(status_code=404, detail="Configuration not found")
     
-    connections = db.query(Connection).all()
+    connections = (await db.scalars(
+        select(Connection).options(joinedload(Connection.connection_type))
+    )).all()
     return templates.TemplateResponse(
         "pds_tables/form.html",
         {"request": request, "config": config, "connections": connections}
@@ -306,6 +349,7 @@ async def update_pds_table(
     title: str = Form(None),
     page_size: int = Form(1000),
     qdrant_batch_size: int = Form(100),
+    extra_destination_ids: List[uuid.UUID] = Form([]),
     db: Session = Depends(get_db)
 ):
     """Update a PDS table configuration."""
@@ -327,6 +371,12 @@ async def update_pds_table(
     config.title = title
     config.page_size = page_size
     config.qdrant_batch_size = qdrant_batch_size
+    # Keep the rows of destinations that stay selected (unique per table and connection)
+    existing = {destination.connection_id: destination for destination in config.extra_destinations}
+    config.extra_destinations = [
+        existing.get(connection_id) or TableDestination(connection_id=connection_id)
+        for connection_id in dict.fromkeys(extra_destination_ids) if connection_id != destination_connection_id
+    ]
     db.commit()
     return RedirectResponse(url="/pds-tables", status_code=303)
 
@@ -342,13 +392,18 @@ async def delete_pds_table(config_id: uuid.UUID, db: Session = Depends(get_db)):
     return RedirectResponse(url="/pds-tables", status_code=303)
 
 @app.get("/pds-tables/{config_id}/columns")
-async def list_table_columns(config_id: uuid.UUID, request: Request, db: Session = Depends(get_db)):
+async def list_table_columns(config_id: uuid.UUID, request: Request, db: AsyncSession = Depends(get_async_db)):
     """List columns for a specific PDS table configuration."""
-    table = db.query(Config).filter(Config.id == config_id).first()
+    table = await db.scalar(
+        select(Config).options(
+            selectinload(Config.columns),
+            joinedload(Config.destination_connection).joinedload(Connection.connection_type)
+        ).where(Config.id == config_id)
+    )
     if not table:
         raise HTTPException(status_code=404, detail="Configuration not found")
     
-    columns = db.query(TableColumn).filter(TableColumn.pds_table_id == config_id).all()
+    columns = table.columns
     return templates.TemplateResponse(
         "pds_tables/columns.html",
         {"request": request, "table": table, "columns": columns}
@@ -361,93 +416,11 @@ async def download_import_template(config_id: uuid.UUID, db: Session = Depends(g
     if not table:
         raise HTTPException(status_code=404, detail="Configuration not found")
     
-    # Create Excel workbook
-    wb = Workbook()
-    ws = wb.active
-    ws.title = "Columns Template"
-    
-    # Add detailed instructions
-    instructions = [
-        ["Instructions for Importing Columns"],
-        [""],
-        ["Column Name:"],
-        ["- Required field"],
-        ["- Must be unique within the table"],
-        ["- Should match the actual column name in your database"],
-        ["- No spaces or special characters allowed"],
-        [""],
-        ["Data Type:"],
-        ["- Required field"],
-        ["- Select from the dropdown list"],
-        ["- Available types: string, integer, float, boolean, date, datetime"],
-        [""],
-        ["Active:"],
-        ["- TRUE: Column will be included in data syncs"],
-        ["- FALSE: Column will be ignored during syncs"],
-        [""],
-        ["Primary Key:"],
-        ["- TRUE: Column is part of the table's primary key"],
-        ["- FALSE: Column is not part of the primary key"],
-        ["- At least one column must be marked as primary key"],
-        [""],
-        ["Example Data:"],
-        [""]
-    ]
-    
-    # Add instructions to worksheet
-    for row, instruction in enumerate(instructions, 1):
-        ws.merge_cells(f'A{row}:D{row}')
-        cell = ws[f'A{row}']
-        cell.value = instruction[0]
-        if row == 1:  # Title row
-            cell.font = cell.font.copy(bold=True, size=14)
-            cell.fill = PatternFill(start_color="CCCCCC", end_color="CCCCCC", fill_type="solid")
-    
-    # Add headers after instructions
-    header_row = len(instructions) + 2
-    headers = ["Column Name", "Data Type", "Active", "Primary Key"]
-    for col, header in enumerate(headers, 1):
-        cell = ws.cell(row=header_row, column=col)
-        cell.value = header
-        cell.font = cell.font.copy(bold=True)
-        cell.fill = PatternFill(start_color="CCCCCC", end_color="CCCCCC", fill_type="solid")
-    
-    # Add example data
-    example_data = [
-        ["id", "integer", True, True],
-        ["name", "string", True, False],
-        ["created_at", "datetime", True, False],
-        ["is_active", "boolean", True, False]
-    ]
-    
-    for row, data in enumerate(example_data, header_row + 1):
-        for col, value in enumerate(data, 1):
-            ws.cell(row=row, column=col, value=value)
-    
-    # Add data validation for Data Type column
-    data_types = ["string", "integer", "float", "boolean", "date", "datetime"]
-    dv = DataValidation(type="list", formula1=f'"{",".join(data_types)}"', allow_blank=True)
-    dv.add(f'B{header_row + 1}:B1000')  # Apply to column B, starting after headers
-    ws.add_data_validation(dv)
-    
-    # Add data validation for Active and Primary Key columns
-    for col in ['C', 'D']:
-        dv = DataValidation(type="list", formula1='"TRUE,FALSE"', allow_blank=True)
-        dv.add(f'{col}{header_row + 1}:{col}1000')
-        ws.add_data_validation(dv)
-    
-    # Adjust column widths
-    for col in ['A', 'B', 'C', 'D']:
-        ws.column_dimensions[col].width = 20
-    
-    # Create response
-    output = io.BytesIO()
-    wb.save(output)
-    output.seek(0)
-    
+    # Built in a worker thread and streamed from disk, so the event loop is never blocked
+    path = await run_in_threadpool(build_import_template_xlsx)
     return StreamingResponse(
-        output,
-        media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+        iter_file(path),
+        media_type=XLSX_MEDIA_TYPE,
         headers={
             "Content-Disposition": f'attachment; filename="{table.table_name}_columns_template.xlsx"'
         }
@@ -471,52 +444,28 @@ async def import_columns(
     file: UploadFile = File(...),
     db: Session = Depends(get_db)
 ):
-    """Import columns from Excel for a specific PDS table configuration."""
+    """Import columns from Excel for a specific PDS table configuration.
+
+    Existing columns are updated by name, new ones created, in one bulk upsert.
+    """
     table = db.query(Config).filter(Config.id == config_id).first()
     if not table:
         raise HTTPException(status_code=404, detail="Configuration not found")
     
-    # Read Excel file
+    # Parse (streaming, read-only) and write off the event loop
     contents = await file.read()
-    wb = load_workbook(io.BytesIO(contents))
-    ws = wb.active
-    
-    # Find the header row by looking for "Column Name" in column A
-    header_row = None
-    for row_idx, row in enumerate(ws.iter_rows(min_row=1, values_only=True), 1):
-        if row[0] == "Column Name":
-            header_row = row_idx
-            break
-    
-    if not header_row:
-        raise HTTPException(status_code=400, detail="Invalid template format: Could not find header row")
-    
-    # Process rows starting after the header row
-    for row in ws.iter_rows(min_row=header_row + 1):
-        column_name = row[0].value
-        data_type = row[1].value
-        active = row[2].value
-        is_primary_key = row[3].value
-        
-        # Skip empty rows
-        if not column_name or not data_type:
-            continue
-            
-        # Convert string 'TRUE'/'FALSE' to boolean if necessary
-        active = str(active).upper() == 'TRUE' if isinstance(active, str) else bool(active)
-        is_primary_key = str(is_primary_key).upper() == 'TRUE' if isinstance(is_primary_key, str) else bool(is_primary_key)
-        
-        column = TableColumn(
-            pds_table_id=config_id,
-            column_name=column_name,
-            data_type=data_type,
-            active=active,
-            is_primary_key=is_primary_key
-        )
-        db.add(column)
+    try:
+        counts = await run_in_threadpool(import_columns_from_workbook, db, config_id, contents)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     
-    db.commit()
-    return RedirectResponse(url=f"/pds-tables/{config_id}/columns", status_code=303)
+    response = RedirectResponse(url=f"/pds-tables/{config_id}/columns", status_code=303)
+    response.set_cookie(
+        "flash_success",
+        f"Imported columns: {counts['created']} created, {counts['updated']} updated, {counts['unchanged']} unchanged",
+        max_age=5
+    )
+    return response
 
 @app.get("/pds-tables/{config_id}/columns/new")
 async def new_table_column(config_id: uuid.UUID, request: Request, db: Session = Depends(get_db)):
@@ -628,20 +577,26 @@ async def delete_table_column(
         )
 
 @app.get("/sync-history")
-async def list_sync_history(request: Request, db: Session = Depends(get_db)):
-    # Get all tables with their latest sync history
-    tables = db.query(Config).all()
-    table_history = []
-    
-    for table in tables:
-        latest_sync = db.query(SyncHistory).filter(
-            SyncHistory.pds_table_id == table.id
-        ).order_by(SyncHistory.start_time.desc()).first()
-        
-        table_history.append({
-            "table": table,
-            "latest_sync": latest_sync
-        })
+async def list_sync_history(request: Request, db: AsyncSession = Depends(get_async_db)):
+    # Get all tables with their latest sync history in one query
+    ranked = select(
+        SyncHistory,
+        func.row_number().over(
+            partition_by=SyncHistory.pds_table_id,
+            order_by=SyncHistory.start_time.desc()
+        ).label("rank")
+    ).subquery()
+    latest = aliased(SyncHistory, ranked)
+    rows = await db.execute(
+        select(Config, latest)
+        .outerjoin(ranked, and_(ranked.c.pds_table_id == Config.id, ranked.c.rank == 1))
+        .order_by(Config.table_name)
+    )
+    
+    table_history = [
+        {"table": table, "latest_sync": latest_sync}
+        for table, latest_sync in rows
+    ]
     
     return templates.TemplateResponse(
         "sync_history/list.html",
@@ -652,24 +607,48 @@ async def list_sync_history(request: Request, db: Session = Depends(get_db)):
     )
 
 @app.get("/sync-history/{table_id}")
-async def get_sync_history(table_id: uuid.UUID, request: Request, db: Session = Depends(get_db)):
+async def get_sync_history(table_id: uuid.UUID, request: Request, db: AsyncSession = Depends(get_async_db)):
     """Get details of a specific table's sync history."""
     # Get the table details
-    table = db.query(Config).filter(Config.id == table_id).first()
+    table = await db.get(Config, table_id)
     if not table:
         raise HTTPException(status_code=404, detail="Table not found")
     
     # Get all sync history entries for this table
-    sync_history = db.query(SyncHistory).filter(
-        SyncHistory.pds_table_id == table_id
-    ).order_by(SyncHistory.start_time.desc()).all()
+    sync_history = (await db.scalars(
+        select(SyncHistory).where(
+            SyncHistory.pds_table_id == table_id
+        ).order_by(SyncHistory.start_time.desc())
+    )).all()
+    
+    # Oldest-first series of the most recent runs for the stage trend charts
+    recent = [sync for sync in reversed(sync_history[:STAGE_TREND_RUNS]) if sync.end_time]
+    stage_trend = {
+        "labels": [sync.start_time.strftime('%b %d %H:%M') for sync in recent],
+        "stages": {
+            column: [getattr(sync, column) or 0 for sync in recent]
+            for column in STAGE_COLUMNS.values()
+        },
+        "rows_per_sec": [
+            round((sync.rows_written or 0) / max((sync.end_time - sync.start_time).total_seconds(), 0.001), 1)
+            for sync in recent
+        ],
+    }
+    
+    # Name the destination of each run (tables with fan-out have several)
+    destination_ids = {sync.destination_connection_id for sync in sync_history if sync.destination_connection_id}
+    destination_names = dict((await db.execute(
+        select(Connection.id, Connection.connection_name).where(Connection.id.in_(destination_ids))
+    )).all()) if destination_ids else {}
     
     return templates.TemplateResponse(
         "sync_history/table.html",
         {
             "request": request,
             "table": table,
-            "sync_history": sync_history
+            "sync_history": sync_history,
+            "stage_trend": stage_trend,
+            "destination_names": destination_names
         }
     )
 
@@ -684,6 +663,91 @@ async def delete_sync_history(sync_id: uuid.UUID, db: Session = Depends(get_db))
     db.commit()
     return RedirectResponse(url="/sync-history", status_code=303)
 
+@app.get("/sync-history/{sync_id}/profile")
+async def download_sync_profile(sync_id: uuid.UUID, db: AsyncSession = Depends(get_async_db)):
+    """Download the profiler report archive of a profiled sync run."""
+    sync_entry = await db.get(SyncHistory, sync_id)
+    if not sync_entry or not sync_entry.profile_path or not os.path.isfile(sync_entry.profile_path):
+        raise HTTPException(status_code=404, detail="No profile recorded for this sync")
+    
+    return FileResponse(
+        sync_entry.profile_path,
+        media_type="application/zip",
+        filename=f"sync-profile-{sync_id}.zip"
+    )
+
+def sync_result_error(result: Optional[dict]) -> Optional[str]:
+    """The error message of a failed sync result, naming each failed fan-out destination; None on success."""
+    if not result or str(result.get("status", "")).lower() != "error":
+        return None
+    failed = [
+        f"{destination['destination']}: {destination.get('message') or 'failed'}"
+        for destination in result.get("destinations", [])
+        if str(destination.get("status", "")).lower() != "success"
+    ]
+    message = result.get("message") or "Sync failed"
+    return f"{message} ({'; '.join(failed)})" if failed else message
+
+@app.post("/sync-history/{sync_id}/replay")
+async def replay_sync(sync_id: uuid.UUID, db: Session = Depends(get_db)):
+    """Re-run the destination step of a sync from its staged PDS pages, without calling PDS."""
+    sync_entry = db.get(SyncHistory, sync_id)
+    if not sync_entry or not sync_entry.staging_path:
+        raise HTTPException(status_code=404, detail="No staged pages recorded for this sync")
+    if read_manifest(sync_entry.staging_path) is None:
+        raise HTTPException(status_code=404, detail="Staged pages are incomplete or have expired")
+    
+    config_id = sync_entry.pds_table_id
+    staging_path = sync_entry.staging_path
+    destination_connection_id = sync_entry.destination_connection_id
+    db.close()
+    
+    def replay():
+        # Replays go to the destination the original run wrote to
+        sync_service = PDSSyncService(config_id, destination_connection_id=destination_connection_id)
+        return sync_service.run_sync(from_stage=staging_path)
+    
+    try:
+        # Off the event loop: a replay can take as long as the original sync
+        result = await run_in_threadpool(replay)
+    except Exception as e:
+        logger.error(f"Replay of sync {sync_id} failed: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+    
+    error = sync_result_error(result)
+    if error:
+        logger.error(f"Replay of sync {sync_id} failed: {error}")
+        raise HTTPException(status_code=500, detail=error)
+    return RedirectResponse(url=f"/sync-history/{config_id}", status_code=303)
+
+@app.get("/pool-stats")
+async def get_pool_stats():
+    """Report connection pool usage for the metadata DB and SQL destinations in this worker."""
+    return {
+        "metadata": engine_pool_stats(engine),
+        "destinations": get_destination_engine_registry().pool_stats()
+    }
+
+@app.get("/metrics")
+async def metrics():
+    """Prometheus scrape endpoint, aggregated across worker processes."""
+    body, content_type = render_metrics()
+    return Response(content=body, media_type=content_type)
+
+@app.get("/logging/levels")
+async def get_logging_levels():
+    """Show the configured log levels for this worker."""
+    return get_levels()
+
+@app.put("/logging/levels")
+async def update_logging_levels(levels: Dict[str, str]):
+    """Change log levels at runtime, e.g. {"pds_data_api.pds_sync_service": "DEBUG"}."""
+    try:
+        set_levels(levels)
+    except (ValueError, TypeError) as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return get_levels()
+
 @app.get("/pds-tables/{config_id}/payload")
 async def view_payload(config_id: uuid.UUID, request: Request, db: Session = Depends(get_db)):
     """View the payload for a specific PDS table configuration."""
@@ -722,24 +786,52 @@ async def view_payload(config_id: uuid.UUID, request: Request, db: Session = Dep
     )
 
 @app.post("/pds-tables/{config_id}/sync")
-async def sync_table(config_id: uuid.UUID, db: Session = Depends(get_db)):
-    """Trigger a sync for a specific PDS table configuration."""
+async def sync_table(config_id: uuid.UUID, profile: bool = False, stage: Optional[bool] = None,
+                     rebuild: bool = False, db: Session = Depends(get_db)):
+    """Trigger a sync for a specific PDS table configuration.
+
+    ``?profile=true`` runs it under the profiler; the report is downloadable
+    from the table's sync history page. ``?stage=true`` keeps the extracted
+    PDS pages so the run can be replayed later (default: STAGING_ENABLED).
+    ``?rebuild=true`` loads Qdrant destinations into a new collection
+    version and swaps the alias once it is indexed, and fully refreshes SQL
+    and pgvector destinations through a shadow table.
+    Tables with extra destinations fan out to all of them (profiled runs
+    only sync the primary destination).
+    """
     table = db.query(Config).filter(Config.id == config_id).first()
     if not table:
         raise HTTPException(status_code=404, detail="Configuration not found")
     
-    try:
+    fan_out = not profile and has_extra_destinations(db, config_id)
+    
+    # Release the request's metadata connection; the sync opens its own brief sessions
+    db.close()
+    
+    def run():
+        if fan_out:
+            # One PDS extraction feeding every destination of the table
+            return FanOutSync(config_id).run_sync(stage=stage, rebuild=rebuild)
         # Initialize sync service with table_id
-        sync_service = PDSSyncService(db, config_id)
-        
-        # Run the sync
-        result = sync_service.run_sync()
-        
-        return RedirectResponse(url=f"/pds-tables/{config_id}/columns", status_code=303)
-        
+        sync_service = PDSSyncService(config_id)
+        return sync_service.run_sync(profile=profile, stage=stage, rebuild=rebuild)
+    
+    try:
+        # The sync runs in the threadpool so this worker keeps serving other requests meanwhile
+        result = await run_in_threadpool(run)
     except Exception as e:
         logger.error(f"Sync failed for table {table.table_name}: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
+    
+    # Qdrant and pgvector syncs, and fan-outs with a failed destination, report errors in the result
+    error = sync_result_error(result)
+    if error:
+        logger.error(f"Sync failed for table {table.table_name}: {error}")
+        raise HTTPException(status_code=500, detail=error)
+    
+    if profile:
+        return RedirectResponse(url=f"/sync-history/{config_id}", status_code=303)
+    return RedirectResponse(url=f"/pds-tables/{config_id}/columns", status_code=303)
 
 @app.post("/pds-tables/{table_id}/test")
 async def test_pds_connection(
@@ -749,7 +841,7 @@ async def test_pds_connection(
 ):
     try:
         # Initialize sync service
-        sync_service = PDSSyncService(db, table_id)
+        sync_service = PDSSyncService(table_id)
         
         # Test the connection
         response_data = sync_service.test_connection()
@@ -784,7 +876,7 @@ async def refresh_pds_metadata(
 ):
     try:
         # Initialize sync service
-        sync_service = PDSSyncService(db, table_id)
+        sync_service = PDSSyncService(table_id)
         
         # Get the base URL and construct the metadata refresh URL
         base_url = sync_service.source_config['url'].rstrip('/')  # Remove trailing slash if any
@@ -871,59 +963,130 @@ async def refresh_pds_metadata(
         )
 
 @app.get("/pds-tables/{config_id}/qdrant-view")
-async def view_qdrant_data(config_id: uuid.UUID, request: Request, db: Session = Depends(get_db)):
-    """View Qdrant data for a specific PDS table configuration."""
-    table = db.query(Config).filter(Config.id == config_id).first()
+async def view_qdrant_data(config_id: uuid.UUID, request: Request, limit: int = 10, offset: int = 0,
+                           db: AsyncSession = Depends(get_async_db)):
+    """View Qdrant data for a specific PDS table configuration.
+
+    The table's collection name is resolved through its alias, so after a
+    rebuild the page shows the version currently being served.
+    """
+    table = await db.get(Config, config_id)
     if not table:
         raise HTTPException(status_code=404, detail="Configuration not found")
-    
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+    offset = max(0, offset)
+
+    def load():
+        service = PDSSyncService(config_id)
+        if service.qdrant_client is None:
+            raise HTTPException(status_code=400, detail="Table does not sync to Qdrant")
+        try:
+            alias = table.table_name.lower()
+            name = resolve_collection(service.qdrant_client, alias)
+            info = service.qdrant_client.get_collection(name)
+            # Scroll cursors are point ids, so page by reading up to the offset
+            points, _ = service.qdrant_client.scroll(
+                collection_name=name, limit=offset + limit, with_payload=True, with_vectors=True
+            )
+        finally:
+            service.qdrant_client.close()
+        vectors = info.config.params.vectors
+        collection_info = {
+            "name": name if name == alias else f"{alias} → {name}",
+            "vector_size": getattr(vectors, "size", None),
+            "points_count": info.points_count or 0,
+        }
+        return collection_info, points[offset:]
+
+    collection_info, points = await run_in_threadpool(load)
     return templates.TemplateResponse(
         "pds_tables/qdrant_view.html",
         {
             "request": request,
-            "table": table
+            "table": table,
+            "collection_info": collection_info,
+            "points": points,
+            "limit": limit,
+            "offset": offset
         }
     )
 
-@app.get("/pds-tables/{config_id}/columns/export")
-async def export_columns(config_id: uuid.UUID, db: Session = Depends(get_db)):
-    """Export columns to Excel for a specific PDS table configuration."""
+@app.post("/pds-tables/{config_id}/reindex")
+async def reindex_collection(
+    config_id: uuid.UUID,
+    target_collection: str = Form(...),
+    model: str = Form(None),
+    text_template: str = Form(None),
+    db: Session = Depends(get_db)
+):
+    """Re-embed the table's Qdrant collection into a new collection from stored payloads (no PDS calls)."""
     table = db.query(Config).filter(Config.id == config_id).first()
     if not table:
         raise HTTPException(status_code=404, detail="Configuration not found")
+    db.close()
     
-    columns = db.query(TableColumn).filter(TableColumn.pds_table_id == config_id).all()
-    
-    # Create Excel workbook
-    wb = Workbook()
-    ws = wb.active
-    ws.title = "Columns"
-    
-    # Add headers
-    headers = ["Column Name", "Data Type", "Active", "Primary Key"]
-    for col, header in enumerate(headers, 1):
-        ws.cell(row=1, column=col, value=header)
+    try:
+        result = await run_in_threadpool(
+            reindex_table, config_id, target_collection.strip(),
+            model=model.strip() if model and model.strip() else None,
+            text_template=text_template if text_template and text_template.strip() else None
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     
-    # Add data
-    for row, column in enumerate(columns, 2):
-        ws.cell(row=row, column=1, value=column.column_name)
-        ws.cell(row=row, column=2, value=column.data_type)
-        ws.cell(row=row, column=3, value=column.active)
-        ws.cell(row=row, column=4, value=column.is_primary_key)
+    response = RedirectResponse(url=f"/pds-tables/{config_id}/qdrant-view", status_code=303)
+    response.set_cookie(
+        "flash_success",
+        f"Re-indexed {result['points']} points into '{result['target_collection']}' in {result['elapsed_s']}s",
+        max_age=5
+    )
+    return response
+
+@app.get("/pds-tables/{config_id}/columns/export")
+async def export_columns(config_id: uuid.UUID, format: str = "xlsx", db: Session = Depends(get_db)):
+    """Export columns to Excel (or CSV with ?format=csv) for a specific PDS table configuration."""
+    table = db.query(Config).filter(Config.id == config_id).first()
+    if not table:
+        raise HTTPException(status_code=404, detail="Configuration not found")
     
-    # Create response
-    output = io.BytesIO()
-    wb.save(output)
-    output.seek(0)
+    if format == "csv":
+        # Sync generator: Starlette iterates it in the threadpool, one fetch batch at a time
+        return StreamingResponse(
+            iter_columns_csv(db, config_id),
+            media_type="text/csv",
+            headers={
+                "Content-Disposition": f'attachment; filename="{table.table_name}_columns.csv"'
+            }
+        )
+    if format != "xlsx":
+        raise HTTPException(status_code=400, detail="format must be 'xlsx' or 'csv'")
     
+    path = await run_in_threadpool(build_columns_xlsx, db, config_id)
     return StreamingResponse(
-        output,
-        media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+        iter_file(path),
+        media_type=XLSX_MEDIA_TYPE,
         headers={
             "Content-Disposition": f'attachment; filename="{table.table_name}_columns.xlsx"'
         }
     )
 
+@app.get("/pds-tables/{config_id}/export")
+async def export_table_data(config_id: uuid.UUID, format: str = "ndjson", with_vectors: bool = False):
+    """Stream the synced data of a PDS table from its destination as NDJSON, CSV or Parquet."""
+    try:
+        name, chunks = await run_in_threadpool(export_table, config_id, format, with_vectors)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    media_type, extension = FORMATS[format]
+    return StreamingResponse(
+        chunks,
+        media_type=media_type,
+        headers={
+            "Content-Disposition": f'attachment; filename="{name}.{extension}"'
+        }
+    )
+
 @app.post("/pds-tables/{table_id}/columns/update")
 async def update_columns(
     request: Request,
@@ -975,6 +1138,7 @@ async def update_columns(
 
 def run_app(host: str = "0.0.0.0", port: int = 8000, reload: bool = False):
     """Run the FastAPI application using uvicorn."""
+    import uvicorn
     uvicorn.run("pds_data_api.main:app", host=host, port=port, reload=reload)
 
 if __name__ == "__main__":
@@ -0,0 +1,96 @@
+"""Prometheus metrics for syncs and connection pools.
+
+When ``PROMETHEUS_MULTIPROC_DIR`` is set (``start_prod.py`` does this before
+starting the uvicorn workers) every worker writes its samples to that directory
+and ``/metrics`` aggregates them, so any worker can answer a scrape.
+"""
+import os
+import time
+from contextlib import contextmanager
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST, CollectorRegistry, Counter, Gauge, Histogram, generate_latest
+)
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+BYTES_BUCKETS = (1e3, 1e4, 1e5, 5e5, 1e6, 5e6, 1e7, 5e7, 1e8)
+
+PDS_PAGE_LATENCY = Histogram(
+    "pds_page_latency_seconds", "Latency of PDS runquery page requests",
+    ["table", "connection"], buckets=LATENCY_BUCKETS
+)
+PDS_PAGE_BYTES = Histogram(
+    "pds_page_bytes", "Response size of PDS runquery pages",
+    ["table", "connection"], buckets=BYTES_BUCKETS
+)
+PDS_ROWS = Counter(
+    "pds_rows_fetched_total", "Rows fetched from PDS", ["table", "connection"]
+)
+SYNC_ROWS = Counter(
+    "sync_rows_written_total", "Rows written to a destination; rate() gives rows/sec",
+    ["table", "connection", "destination"]
+)
+SYNC_REJECTED_VALUES = Counter(
+    "sync_rejected_values_total", "Values quarantined because they did not convert to their column type",
+    ["table", "connection", "data_type"]
+)
+EMBEDDING_LATENCY = Histogram(
+    "embedding_request_latency_seconds", "Latency of embedding requests",
+    ["table", "connection"], buckets=LATENCY_BUCKETS
+)
+EMBEDDING_TOKENS = Counter(
+    "embedding_tokens_total", "Tokens consumed by embedding requests", ["table", "connection"]
+)
+QDRANT_UPSERT_LATENCY = Histogram(
+    "qdrant_upsert_latency_seconds", "Latency of Qdrant upserts",
+    ["table", "connection"], buckets=LATENCY_BUCKETS
+)
+SQL_WRITE_LATENCY = Histogram(
+    "sql_write_latency_seconds", "Latency of SQL destination writes",
+    ["table", "connection"], buckets=LATENCY_BUCKETS
+)
+SYNC_QUEUE_DEPTH = Gauge(
+    "sync_queue_depth", "Rows waiting between sync stages",
+    ["table", "connection", "stage"], multiprocess_mode="livesum"
+)
+SYNCS_IN_PROGRESS = Gauge(
+    "syncs_in_progress", "Syncs currently running",
+    ["table", "connection"], multiprocess_mode="livesum"
+)
+DB_POOL_CONNECTIONS = Gauge(
+    "db_pool_connections", "Pooled DB connections by state",
+    ["pool", "state"], multiprocess_mode="livesum"
+)
+
+@contextmanager
+def observe_latency(histogram: Histogram, **labels):
+    """Observe the wall time of the block on a labelled histogram."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        histogram.labels(**labels).observe(time.perf_counter() - started)
+
+def instrument_pool(engine: Engine, pool_name: str):
+    """Publish checked-out/idle/overflow counts of an engine's pool on every checkout and checkin."""
+    def update(*_):
+        pool = engine.pool
+        for state in ("checkedout", "checkedin", "overflow"):
+            method = getattr(pool, state, None)
+            if callable(method):
+                DB_POOL_CONNECTIONS.labels(pool=pool_name, state=state).set(max(method(), 0))
+
+    event.listen(engine, "checkout", update)
+    event.listen(engine, "checkin", update)
+
+def render_metrics():
+    """Return (body, content_type) for a scrape, aggregating worker processes if configured."""
+    if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        from prometheus_client import multiprocess
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry), CONTENT_TYPE_LATEST
+    from prometheus_client import REGISTRY
+    return generate_latest(REGISTRY), CONTENT_TYPE_LATEST
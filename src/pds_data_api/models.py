@@ -1,10 +1,10 @@
-from sqlalchemy import Column, Integer, String, Float, Boolean, ForeignKey, JSON, DateTime, LargeBinary, ARRAY
+from sqlalchemy import Column, Integer, BigInteger, String, Float, Boolean, ForeignKey, JSON, DateTime, LargeBinary, ARRAY
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship, backref
 import uuid
 from .database import Base
 from datetime import datetime
-from sqlalchemy import UniqueConstraint
+from sqlalchemy import Index, UniqueConstraint
 
 class ConnectionOptions(Base):
     __tablename__ = "connection_options"
@@ -47,15 +47,31 @@ class Config(Base):
     source_connection = relationship("Connection", foreign_keys=[source_connection_id], back_populates="source_tables")
     destination_connection = relationship("Connection", foreign_keys=[destination_connection_id], back_populates="destination_tables")
     columns = relationship("TableColumn", back_populates="pds_table")
+    # Further destinations fed from the same PDS extraction (fan-out sync)
+    extra_destinations = relationship("TableDestination", back_populates="pds_table", cascade="all, delete-orphan")
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     deleted_at = Column(DateTime, nullable=True)
 
+class TableDestination(Base):
+    __tablename__ = "pds_table_destinations"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    pds_table_id = Column(UUID(as_uuid=True), ForeignKey('pds_tables.id'), nullable=False)
+    connection_id = Column(UUID(as_uuid=True), ForeignKey('connections.id'), nullable=False)
+    pds_table = relationship("Config", back_populates="extra_destinations")
+    connection = relationship("Connection")
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+    __table_args__ = (
+        UniqueConstraint('pds_table_id', 'connection_id', name='uq_pds_table_destinations_table_connection'),
+    )
+
 class TableColumn(Base):
     __tablename__ = "table_columns"
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    pds_table_id = Column(UUID(as_uuid=True), ForeignKey('pds_tables.id'), nullable=False)
+    pds_table_id = Column(UUID(as_uuid=True), ForeignKey('pds_tables.id'), nullable=False, index=True)
     column_name = Column(String, nullable=False)
     data_type = Column(String, nullable=False)
     active = Column(Boolean, default=True)
@@ -65,6 +81,10 @@ class TableColumn(Base):
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     deleted_at = Column(DateTime, nullable=True)
 
+    __table_args__ = (
+        Index('uq_table_columns_pds_table_id_column_name', 'pds_table_id', 'column_name', unique=True),
+    )
+
 class SyncHistory(Base):
     __tablename__ = "sync_history"
 
@@ -77,9 +97,29 @@ class SyncHistory(Base):
     total_creates = Column(Integer, nullable=True)
     status = Column(String, nullable=False)
     error_message = Column(String, nullable=True)
+    destination_connection_id = Column(UUID(as_uuid=True), ForeignKey('connections.id'), nullable=True)  # set per destination of a fan-out sync
+    # Per-stage breakdown (wall seconds and counters) recorded by PDSSyncService
+    pds_seconds = Column(Float, nullable=True)
+    embedding_seconds = Column(Float, nullable=True)
+    qdrant_seconds = Column(Float, nullable=True)
+    sql_seconds = Column(Float, nullable=True)
+    pages_fetched = Column(Integer, nullable=True)
+    bytes_fetched = Column(BigInteger, nullable=True)
+    rows_fetched = Column(Integer, nullable=True)
+    rows_embedded = Column(Integer, nullable=True)
+    rows_written = Column(Integer, nullable=True)
+    embedding_tokens = Column(Integer, nullable=True)
+    cache_hits = Column(Integer, nullable=True)
+    retries = Column(Integer, nullable=True)
+    profile_path = Column(String, nullable=True)  # report archive of a profiled run
+    staging_path = Column(String, nullable=True)  # staged PDS pages of this run
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
+    __table_args__ = (
+        Index('ix_sync_history_pds_table_id_start_time', 'pds_table_id', start_time.desc()),
+    )
+
 class QdrantCollection(Base):
     __tablename__ = "qdrant_collection_configs"
 
@@ -1,74 +1,134 @@
 from uuid import UUID
 import json
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, joinedload, sessionmaker
+from contextlib import contextmanager
 from datetime import datetime
 from .models import Config, TableColumn, Connection, SyncHistory
 import logging
 import requests
-from typing import Any, Dict, Optional, List
+from typing import Any, Dict, Iterable, Optional, List
 import base64
-from sqlalchemy import create_engine, text
-import psycopg2
+from sqlalchemy import text
 from psycopg2.extras import execute_values
 import uuid
 import time
-from .config_loader import load_secrets
+from .embedding_client import EmbeddingClientProvider, get_embedding_provider
+from .destination_engines import get_destination_engine_registry
+from .database import SessionLocal
+from .collection_versions import (
+    create_for_bulk_load, finish_bulk_load, next_version, resolve_collection, swap_alias, versioned_name
+)
+from .config import (
+    PDS_MAX_RETRIES, PDS_PAGE_DELAY, PDS_RETRY_BACKOFF, PROFILE_DIR, STAGING_ENABLED, SYNC_PROGRESS_INTERVAL
+)
 import os
-from openai import OpenAI
-from qdrant_client import QdrantClient
-from qdrant_client.http import models
 from fastapi import HTTPException
-import inspect
-import httpx
+from .logging_config import SampledLogger
+from .pgvector_store import PgVectorStore
+from .sql_refresh import ShadowTableRefresh
+from .typed_columns import (
+    PageConverter, Reject, copy_rows, count_by_type, destination_columns, postgres_type, quarantine, quote,
+    rejects_table
+)
+from .staging import PageStager, iter_staged_pages, prune_staged_runs, run_directory
+from .sync_stats import SyncStats
+from .tracing import start_sync_trace, tracer
+from .metrics import (
+    EMBEDDING_LATENCY, EMBEDDING_TOKENS, PDS_PAGE_BYTES, PDS_PAGE_LATENCY, PDS_ROWS,
+    QDRANT_UPSERT_LATENCY, SQL_WRITE_LATENCY, SYNC_QUEUE_DEPTH, SYNC_REJECTED_VALUES, SYNC_ROWS, SYNCS_IN_PROGRESS,
+    observe_latency
+)
 
 logger = logging.getLogger(__name__)
 
-def log_args(cls):
-    sig = inspect.signature(cls.__init__)
-    logger.info(f"[DEBUG] QdrantClient.__init__ accepted args:\n{sig}")
+class PDSExtractionError(RuntimeError):
+    """Reading a table from PDS failed before pagination reached its end."""
 
 class PDSSyncService:
-    def __init__(self, db: Session, table_id: UUID):
-        """Initialize the sync service with database session and table ID."""
-        self.db = db
+    def __init__(self, table_id: UUID, session_factory: sessionmaker = SessionLocal,
+                 destination_connection_id: UUID = None):
+        """Initialize the sync service for a table.
+
+        The metadata database is only touched through short-lived sessions from
+        ``session_factory`` so a long-running sync never pins a pooled connection.
+        ``destination_connection_id`` targets one of the table's extra
+        destinations instead of its primary one (see ``fanout.FanOutSync``).
+        """
+        self.session_factory = session_factory
         self.table_id = table_id
-        self._initialize_table()
-        self._initialize_connections()
+        self.destination_connection_id = destination_connection_id
+        self._batch_log = SampledLogger(logger)
+        self.stats = SyncStats()
+        # Set by fan-out syncs so the extraction does not share stats with this service's writer thread
+        self.extraction_stats: Optional[SyncStats] = None
+        self.sync_history: Optional[SyncHistory] = None
+        self.stage_pages = STAGING_ENABLED
+        self.staged_run: Optional[str] = None
+        self.rebuild = False
+        self.rejected_values: Dict[str, int] = {}
+        self._page_converter = None
+        self.extraction_complete = False
+        self._prepared_history: Optional[SyncHistory] = None
+        with self._metadata_session() as session:
+            self._initialize_table(session)
+            self._initialize_connections(session)
         self._initialize_clients()
 
-    def _initialize_table(self):
+    @property
+    def _extraction_stats(self) -> SyncStats:
+        """Where PDS requests and pages are counted."""
+        return self.extraction_stats or self.stats
+
+    @contextmanager
+    def _metadata_session(self):
+        """Open a brief metadata session that commits on success and always closes."""
+        session = self.session_factory(expire_on_commit=False)
+        try:
+            yield session
+            session.commit()
+        except Exception:
+            session.rollback()
+            raise
+        finally:
+            session.close()
+
+    def _initialize_table(self, session: Session):
         """Initialize table configuration."""
-        self.table = self.db.query(Config).filter(Config.id == self.table_id).first()
+        self.table = session.query(Config).filter(Config.id == self.table_id).first()
         if not self.table:
             raise ValueError(f"Table configuration not found for ID: {self.table_id}")
         
         # Get active columns
-        self.columns = self.db.query(TableColumn).filter(
+        self.columns = session.query(TableColumn).filter(
             TableColumn.pds_table_id == self.table_id,
             TableColumn.active == True
         ).all()
         if not self.columns:
             raise ValueError(f"No active columns found for table: {self.table.table_name}")
 
-    def _initialize_connections(self):
+    def _initialize_connections(self, session: Session):
         """Initialize source and destination connections."""
         # Initialize source connection (PDS)
-        self.source_connection = self.db.query(Connection).filter(
-            Connection.id == self.table.source_connection_id
-        ).first()
+        self.source_connection = session.query(Connection).options(
+            joinedload(Connection.connection_type)
+        ).filter(Connection.id == self.table.source_connection_id).first()
         if not self.source_connection:
             raise ValueError("Source connection not found")
         
         # Initialize destination connection
-        self.dest_connection = self.db.query(Connection).filter(
-            Connection.id == self.table.destination_connection_id
-        ).first()
+        self.dest_connection = session.query(Connection).options(
+            joinedload(Connection.connection_type)
+        ).filter(Connection.id == (self.destination_connection_id or self.table.destination_connection_id)).first()
         if not self.dest_connection:
             raise ValueError("Destination connection not found")
 
         # Parse connection configs
-        self.source_config = self._parse_connection_config(self.source_connection.connection_config)
-        self.dest_config = self._parse_connection_config(self.dest_connection.connection_config)
+        self.source_config = self._parse_connection_config(self.source_connection)
+        self.dest_config = self._parse_connection_config(self.dest_connection)
+
+        # Metric labels for the extract (source) and load (destination) stages
+        self._source_labels = {"table": self.table.table_name, "connection": self.source_connection.connection_name}
+        self._dest_labels = {"table": self.table.table_name, "connection": self.dest_connection.connection_name}
 
         # Construct PDS API URL
         base_url = self.source_config['url'].rstrip('/')
@@ -76,42 +136,33 @@ class PDSSyncService:
             base_url = base_url[:-4]
         self.pds_url = f"{base_url}/pds/rest-service/dataservice/runquery?configCode=ds_unifier"
 
-    def _parse_connection_config(self, connection_config: bytes) -> Dict[str, Any]:
-        """Parse connection configuration from bytes."""
+    def _parse_connection_config(self, connection: Connection) -> Dict[str, Any]:
+        """Parse a connection's configuration from bytes."""
         try:
-            logger.info("Starting to parse connection configuration...")
-            config = json.loads(connection_config.decode('utf-8'))
-            logger.info(f"Raw connection config: {json.dumps(config, default=str)}")
+            config = json.loads(connection.connection_config.decode('utf-8'))
             
             # Define allowed parameters for each connection type
             allowed_params = {
                 'PDS': ['url', 'username', 'password'],
                 'PostgreSQL': ['host', 'port', 'database', 'username', 'password'],
                 'Oracle': ['host', 'port', 'service_name', 'username', 'password'],
-                'Qdrant': ['host', 'port', 'api_key', 'batch_size', 'https']
+                'Qdrant': ['host', 'port', 'api_key', 'batch_size', 'https'],
+                'PostgreSQL+pgvector': ['host', 'port', 'database', 'username', 'password',
+                                        'vector_type', 'index', 'dimensions']
             }
             
-            # Get connection type
-            connection = self.db.query(Connection).filter(
-                Connection.connection_config == connection_config
-            ).first()
             connection_type = connection.connection_type.name
-            logger.info(f"Connection type: {connection_type}")
             
             # Filter out any parameters not in the allowed list
             filtered_config = {
                 k: v for k, v in config.items() 
                 if k in allowed_params.get(connection_type, [])
             }
-            logger.info(f"Filtered config for {connection_type}: {json.dumps(filtered_config, default=str)}")
+            logger.debug("Parsed %s connection config with keys %s", connection_type, sorted(filtered_config))
             
             return filtered_config
         except Exception as e:
-            logger.error(f"Error parsing connection config: {str(e)}")
-            logger.error(f"Error type: {type(e)}")
-            logger.error(f"Error args: {e.args}")
-            import traceback
-            logger.error(f"Traceback: {traceback.format_exc()}")
+            logger.exception("Error parsing connection config: %s", e)
             raise
 
     def _initialize_clients(self):
@@ -121,31 +172,31 @@ class PDSSyncService:
 
         if self.dest_connection.connection_type.name.lower() == "qdrant":
             self._initialize_qdrant_client()
-        elif self.dest_connection.connection_type.name.lower() in ["postgresql", "oracle"]:
+        elif self.dest_connection.connection_type.name.lower() in ["postgresql", "oracle", "postgresql+pgvector"]:
             self._initialize_sql_client()
 
     def _initialize_qdrant_client(self):
-        """Initialize Qdrant client."""
+        """Initialize Qdrant client.
+
+        A host of ``:memory:`` uses qdrant-client's local in-process mode, which
+        needs no server (used by the offline benchmark harness).
+        """
+        from qdrant_client import QdrantClient
+        
+        if self.dest_config.get('host') == ':memory:':
+            self.qdrant_client = QdrantClient(location=':memory:')
+            logger.info("Using in-memory Qdrant")
+            return
+        
         try:
-            logger.info("Starting Qdrant client initialization...")
-            
-            # Log the full dest_config
-            logger.info(f"Full dest_config: {json.dumps(self.dest_config, default=str)}")
-            
             # Get only the essential parameters
             host = self.dest_config.get('host', 'localhost')
             # Strip any http:// or https:// prefix if present
             host = host.replace('http://', '').replace('https://', '')
-            logger.info(f"Extracted host (after stripping protocol): {host}")
-            
             port = self.dest_config.get('port', 6333)
-            logger.info(f"Extracted port: {port}")
-            
             api_key = self.dest_config.get('api_key')
-            logger.info(f"Extracted api_key: {'*' * len(api_key) if api_key else None}")
             
             # Initialize with host and port
-            logger.info("Attempting to initialize QdrantClient...")
             self.qdrant_client = QdrantClient(
                 host=host,
                 port=port,
@@ -153,56 +204,21 @@ class PDSSyncService:
                 timeout=300,  # Increased timeout to 5 minutes
                 https=self.dest_config.get('https', False)  # Use https value from config, default to False
             )
-            logger.info("QdrantClient initialized successfully")
-            
-            # Log the type and attributes of the initialized client
-            logger.info(f"QdrantClient type: {type(self.qdrant_client)}")
-            logger.info(f"QdrantClient attributes: {dir(self.qdrant_client)}")
             
             # Test the client with a simple operation
-            logger.info("Testing QdrantClient with get_collections...")
             collections = self.qdrant_client.get_collections()
-            logger.info(f"Successfully retrieved collections: {collections}")
+            logger.info("Connected to Qdrant at %s:%s (%d collections)", host, port, len(collections.collections))
             
         except Exception as e:
-            logger.error(f"Error initializing Qdrant client: {str(e)}")
-            logger.error(f"Error type: {type(e)}")
-            logger.error(f"Error args: {e.args}")
-            import traceback
-            logger.error(f"Traceback: {traceback.format_exc()}")
+            logger.exception("Error initializing Qdrant client: %s", e)
             raise
 
     def _initialize_sql_client(self):
-        """Initialize SQL database client."""
-        self._ensure_database_exists()
-        self.dest_engine = create_engine(
-            f"postgresql://{self.dest_config['username']}:{self.dest_config['password']}@{self.dest_config['host']}:{self.dest_config['port']}/{self.dest_config['database']}"
+        """Initialize SQL database client from the shared destination engine registry."""
+        self.dest_engine = get_destination_engine_registry().get_engine(
+            self.dest_connection.id, self.dest_config
         )
 
-    def _ensure_database_exists(self):
-        """Create the database if it doesn't exist."""
-        try:
-            conn = psycopg2.connect(
-                host=self.dest_config['host'],
-                port=self.dest_config['port'],
-                user=self.dest_config['username'],
-                password=self.dest_config['password'],
-                database='postgres'
-            )
-            conn.autocommit = True
-            cursor = conn.cursor()
-            
-            cursor.execute(f"SELECT 1 FROM pg_database WHERE datname = '{self.dest_config['database']}'")
-            if not cursor.fetchone():
-                cursor.execute(f'CREATE DATABASE "{self.dest_config["database"]}"')
-                logger.info(f"Created database: {self.dest_config['database']}")
-            
-            cursor.close()
-            conn.close()
-        except Exception as e:
-            logger.error(f"Error ensuring database exists: {str(e)}")
-            raise
-
     def get_auth_header(self) -> Dict[str, str]:
         """Generate Basic Auth header for PDS API."""
         username = self.source_config.get("username", "")
@@ -231,113 +247,276 @@ class PDSSyncService:
             return f"UNIFIER_{table_name}"
         return table_name
 
-    def run_sync(self):
-        """Run the sync process based on destination type."""
+    def run_sync(self, profile: bool = False, stage: bool = None, from_stage: str = None,
+                 pages: Iterable[List[Dict[str, Any]]] = None, rebuild: bool = None):
+        """Run the sync process based on destination type.
+
+        With ``profile=True`` the run is wrapped in ``SyncProfiler`` and the
+        report archive is attached to the run's sync history record.
+        ``stage`` overrides STAGING_ENABLED for this run; ``from_stage`` is
+        the directory of a complete staged run to read instead of PDS.
+        ``pages`` supplies the extracted pages directly (fan-out syncs).
+        ``rebuild=True`` loads a fresh copy of the destination and swaps it
+        in once complete instead of updating it in place.
+        """
+        if rebuild is not None:
+            self.rebuild = rebuild
+        if stage is not None:
+            self.stage_pages = stage
+        if from_stage is not None:
+            self.staged_run = from_stage
+        if profile:
+            return self._run_profiled_sync()
+        if pages is not None:
+            pages = self._supplied_pages(pages)
+        SYNCS_IN_PROGRESS.labels(**self._dest_labels).inc()
+        dest_type = self.dest_connection.connection_type.name.lower()
+        with start_sync_trace("sync.run", {
+            "pds.table": self.table.table_name,
+            "sync.source": self.source_connection.connection_name,
+            "sync.destination": self.dest_connection.connection_name,
+            "sync.destination_type": dest_type,
+            "sync.replay": self.staged_run is not None,
+            "sync.rebuild": self.rebuild,
+        }) as span:
+            try:
+                if dest_type == "qdrant":
+                    result = self.sync_to_qdrant(self.table.table_name, pages=pages)
+                elif dest_type in ["postgresql", "oracle"]:
+                    result = self.run_sql_sync(pages=pages)
+                elif dest_type == "postgresql+pgvector":
+                    result = self.sync_to_pgvector(self.table.table_name, pages=pages)
+                else:
+                    raise ValueError(f"Unsupported destination type: {dest_type}")
+                if self.sync_history is not None:
+                    span.set_attribute("sync.guid", str(self.sync_history.sync_guid))
+                span.set_attributes({"sync.pages": self.stats.pages, "sync.rows_written": self.stats.rows_written})
+                return result
+            except Exception as e:
+                logger.error("Error in sync process: %s", e)
+                raise
+            finally:
+                SYNCS_IN_PROGRESS.labels(**self._dest_labels).dec()
+
+    def _run_profiled_sync(self):
+        """Run the sync under the CPU and memory profilers and store the report."""
+        from .profiling import SyncProfiler
+
+        profiler = SyncProfiler()
         try:
-            dest_type = self.dest_connection.connection_type.name.lower()
-            
-            if dest_type == "qdrant":
-                return self.sync_to_qdrant(self.table.table_name)
-            elif dest_type in ["postgresql", "oracle"]:
-                return self.run_sql_sync()
-            else:
-                raise ValueError(f"Unsupported destination type: {dest_type}")
-        except Exception as e:
-            logger.error(f"Error in sync process: {str(e)}")
-            raise
+            with profiler:
+                return self.run_sync()
+        finally:
+            if self.sync_history is not None:
+                try:
+                    path = profiler.save(PROFILE_DIR, str(self.sync_history.sync_guid))
+                    self._write_sync_history(self.sync_history, profile_path=path)
+                except Exception as e:
+                    logger.exception("Could not save sync profile: %s", e)
 
-    def sync_to_qdrant(self, table_name: str, collection_name: str = None) -> Dict[str, Any]:
-        """Sync data to Qdrant with embeddings."""
+    def sync_to_qdrant(self, table_name: str, collection_name: str = None,
+                       pages: Iterable[List[Dict[str, Any]]] = None) -> Dict[str, Any]:
+        """Sync data to Qdrant with embeddings.
+
+        In rebuild mode the data is loaded into a new ``<name>_v<N>``
+        collection with indexing deferred; once it is indexed the ``<name>``
+        alias is switched to it and the previous version is deleted. A
+        failed rebuild drops the new version and leaves the alias alone.
+        """
+        target = None
         try:
-            logger.info(f"Starting sync_to_qdrant for table: {table_name}")
-            logger.info(f"Current qdrant_client state: {self.qdrant_client}")
-            logger.info(f"Qdrant client type: {type(self.qdrant_client)}")
-            logger.info(f"Qdrant client attributes: {dir(self.qdrant_client)}")
+            logger.info("Starting sync_to_qdrant for table: %s", table_name)
             
             # Create sync history record
             sync_history = self._create_sync_history()
             
-            # Load OpenAI API key
-            secrets = load_secrets(os.getenv("SECRETS_PATH", "secrets.json"))
-            openai_api_key = secrets.get("openai_api_key")
-            if not openai_api_key:
-                raise ValueError("OpenAI API key not found in secrets.json")
-            
-            # Initialize OpenAI client
-            openai_client = OpenAI(
-                api_key=openai_api_key,
-                http_client=httpx.Client(transport=httpx.HTTPTransport(retries=3))
-            )
+            # Reuse the process-wide embedding client and its warm connections
+            embedding_provider = get_embedding_provider()
+            embedding_provider.get_client()
             
             # Set collection name
             collection_name = collection_name or table_name.lower()
-            logger.info(f"Using collection name: {collection_name}")
-            
-            # Ensure collection exists
-            self._ensure_qdrant_collection(collection_name)
+            if self.rebuild:
+                target = versioned_name(collection_name, next_version(self.qdrant_client, collection_name))
+                logger.info("Rebuilding %s into collection: %s", collection_name, target)
+                create_for_bulk_load(self.qdrant_client, target)
+            else:
+                target = resolve_collection(self.qdrant_client, collection_name)
+                logger.info("Using collection name: %s", target)
+                # Ensure collection exists
+                self._ensure_qdrant_collection(target)
             
             # Get and process data
             total_items = self._process_qdrant_data(
                 table_name=table_name,
-                collection_name=collection_name,
-                openai_client=openai_client,
-                sync_history=sync_history
+                collection_name=target,
+                embedding_provider=embedding_provider,
+                sync_history=sync_history,
+                pages=pages
             )
             
+            if self.rebuild:
+                # A rebuild that missed pages is dropped below; the alias keeps the previous version
+                self._require_complete_extraction()
+                with self.stats.stage("qdrant"), \
+                        tracer.start_as_current_span("qdrant.rebuild", attributes={"qdrant.collection": target}):
+                    finish_bulk_load(self.qdrant_client, target)
+                    previous = swap_alias(self.qdrant_client, collection_name, target)
+                if previous:
+                    self.qdrant_client.delete_collection(previous)
+                    logger.info("Deleted previous version %s", previous)
+            
             # Update sync history
             self._update_sync_history(sync_history, total_items)
             
             return {
                 "status": "success",
-                "message": f"Successfully synced {total_items} items to Qdrant collection '{collection_name}'"
+                "message": f"Successfully synced {total_items} items to Qdrant collection '{target}'"
             }
             
         except Exception as e:
             error_msg = str(e)
-            logger.error(f"Error in sync_to_qdrant: {error_msg}")
-            logger.error(f"Error type: {type(e)}")
-            logger.error(f"Error args: {e.args}")
-            import traceback
-            logger.error(f"Traceback: {traceback.format_exc()}")
+            logger.exception("Error in sync_to_qdrant: %s", error_msg)
+            if self.rebuild and target is not None:
+                self._drop_rebuild_collection(collection_name, target)
             if 'sync_history' in locals():
                 self._update_sync_history(sync_history, 0, error_msg)
             return {"status": "error", "message": f"Error in sync_to_qdrant: {error_msg}"}
 
+    def sync_to_pgvector(self, table_name: str, pages: Iterable[List[Dict[str, Any]]] = None) -> Dict[str, Any]:
+        """Sync data to a pgvector table with embeddings.
+
+        The first sync of a table and rebuilds load a fresh table and build its
+        vector index once at the end; other syncs upsert into the live table
+        (see ``pgvector_store``).
+        """
+        store = None
+        try:
+            logger.info("Starting sync_to_pgvector for table: %s", table_name)
+            sync_history = self._create_sync_history()
+            
+            embedding_provider = get_embedding_provider()
+            embedding_provider.get_client()
+            
+            store = PgVectorStore.from_config(self.dest_engine, table_name.lower(), self.dest_config)
+            store.start(full=self.rebuild)
+            
+            total_items = 0
+            batch_size = self.table.qdrant_batch_size or 100
+            if pages is None:
+                pages = self._iter_pages(table_name, sync_history)
+            for items in pages:
+                for i in range(0, len(items), batch_size):
+                    batch = items[i:i + batch_size]
+                    point_ids, embeddings, payloads = self._embed_batch(batch, embedding_provider)
+                    with observe_latency(SQL_WRITE_LATENCY, **self._dest_labels), self.stats.stage("sql"), \
+                            tracer.start_as_current_span("pgvector.write", attributes={"db.sql.table": store.target, "sync.rows": len(batch)}):
+                        store.write(point_ids, embeddings, payloads)
+                    SYNC_ROWS.labels(destination="pgvector", **self._dest_labels).inc(len(batch))
+                    self.stats.rows_written += len(batch)
+                    total_items += len(batch)
+                self._update_sync_progress(sync_history, total_items)
+            
+            # Never swap a partially loaded table in; abort() below drops it instead
+            self._require_complete_extraction()
+            with self.stats.stage("sql"), \
+                    tracer.start_as_current_span("pgvector.build_index", attributes={"db.sql.table": store.name}):
+                store.finish()
+            
+            self._update_sync_history(sync_history, total_items)
+            return {
+                "status": "success",
+                "message": f"Successfully synced {total_items} items to pgvector table '{store.name}'"
+            }
+        
+        except Exception as e:
+            error_msg = str(e)
+            logger.exception("Error in sync_to_pgvector: %s", error_msg)
+            if store is not None:
+                store.abort()
+            if 'sync_history' in locals():
+                self._update_sync_history(sync_history, 0, error_msg)
+            return {"status": "error", "message": f"Error in sync_to_pgvector: {error_msg}"}
+
+    def prepare_sync_history(self) -> SyncHistory:
+        """Create the sync history record ahead of the run; the next run adopts it."""
+        self._prepared_history = None
+        self._prepared_history = self._create_sync_history()
+        return self._prepared_history
+
+    def fail_prepared_history(self, error_msg: str) -> bool:
+        """Mark a prepared history that no run adopted as FAILED; False if there was none."""
+        sync_history, self._prepared_history = self._prepared_history, None
+        if sync_history is None:
+            return False
+        self._update_sync_history(sync_history, 0, error_msg)
+        return True
+
     def _create_sync_history(self) -> SyncHistory:
         """Create a new sync history record."""
+        if self._prepared_history is not None:
+            sync_history, self._prepared_history = self._prepared_history, None
+            return sync_history
         sync_history = SyncHistory(
             pds_table_id=self.table_id,
+            destination_connection_id=self.dest_connection.id,
             start_time=datetime.now(),
             total_columns=len(self.columns),
             status='IN_PROGRESS'
         )
-        self.db.add(sync_history)
-        self.db.commit()
+        with self._metadata_session() as session:
+            session.add(sync_history)
+        self.stats = SyncStats()
+        self.sync_history = sync_history
+        self._last_progress_update = time.monotonic()
         return sync_history
 
+    def _write_sync_history(self, sync_history: SyncHistory, **values):
+        """Apply column updates to a sync history record in its own transaction."""
+        for key, value in values.items():
+            setattr(sync_history, key, value)
+        with self._metadata_session() as session:
+            session.query(SyncHistory).filter(
+                SyncHistory.sync_guid == sync_history.sync_guid
+            ).update(values, synchronize_session=False)
+
+    def _update_sync_progress(self, sync_history: SyncHistory, total_items: int):
+        """Record in-progress item counts, at most once per SYNC_PROGRESS_INTERVAL."""
+        now = time.monotonic()
+        if now - getattr(self, '_last_progress_update', 0) < SYNC_PROGRESS_INTERVAL:
+            return
+        self._last_progress_update = now
+        try:
+            self._write_sync_history(sync_history, total_creates=total_items, **self.stats.as_columns())
+        except Exception as e:
+            logger.warning("Could not record sync progress: %s", e)
+
     def _update_sync_history(self, sync_history: SyncHistory, total_items: int, error_msg: str = None):
         """Update sync history record."""
-        sync_history.status = 'FAILED' if error_msg else 'COMPLETED'
-        sync_history.total_creates = total_items
-        sync_history.error_message = error_msg
-        sync_history.end_time = datetime.now()
-        self.db.commit()
+        self._write_sync_history(
+            sync_history,
+            status='FAILED' if error_msg else 'COMPLETED',
+            total_creates=total_items,
+            error_message=error_msg,
+            end_time=datetime.now(),
+            **self.stats.as_columns()
+        )
 
     def _ensure_qdrant_collection(self, collection_name: str):
         """Ensure Qdrant collection exists."""
+        from qdrant_client.http import models
+        
         try:
-            logger.info(f"Checking if collection '{collection_name}' exists...")
-            
             # First check if collection exists in the list of collections
             collections = self.qdrant_client.get_collections()
             collection_exists = any(collection.name == collection_name for collection in collections.collections)
             
             if collection_exists:
-                logger.info(f"Collection '{collection_name}' exists")
+                logger.debug("Collection '%s' exists", collection_name)
                 return
             
             # If collection doesn't exist, create it using recreate_collection
-            logger.info(f"Creating collection '{collection_name}'...")
+            logger.info("Creating collection '%s'", collection_name)
             self.qdrant_client.recreate_collection(
                 collection_name=collection_name,
                 vectors_config=models.VectorParams(
@@ -345,79 +524,94 @@ class PDSSyncService:
                     distance=models.Distance.COSINE
                 )
             )
-            logger.info(f"Collection '{collection_name}' created successfully")
             
         except Exception as e:
-            logger.error(f"Error in _ensure_qdrant_collection: {str(e)}")
-            logger.error(f"Error type: {type(e)}")
-            logger.error(f"Error args: {e.args}")
-            import traceback
-            logger.error(f"Traceback: {traceback.format_exc()}")
+            logger.exception("Error in _ensure_qdrant_collection: %s", e)
             raise
 
+    def _drop_rebuild_collection(self, alias: str, collection_name: str):
+        """Remove the collection of a failed rebuild unless the alias already points to it."""
+        try:
+            if resolve_collection(self.qdrant_client, alias) != collection_name:
+                self.qdrant_client.delete_collection(collection_name)
+                logger.info("Dropped incomplete rebuild collection %s", collection_name)
+        except Exception as e:
+            logger.warning("Could not drop rebuild collection %s: %s", collection_name, e)
+
     def _process_qdrant_data(self, table_name: str, collection_name: str, 
-                           openai_client: OpenAI, sync_history: SyncHistory) -> int:
+                           embedding_provider: EmbeddingClientProvider, sync_history: SyncHistory,
+                           pages: Iterable[List[Dict[str, Any]]] = None) -> int:
         """Process data for Qdrant sync."""
         total_items = 0
-        # Use default batch size of 100
-        batch_size = 100
-        logger.info(f"Using batch size: {batch_size}")
-        
-        # Get data from PDS
-        table_name = self._ensure_unifier_prefix(table_name)
-        payload = self.build_payload()
-        next_key = None
+        batch_size = self.table.qdrant_batch_size or 100
+        logger.info("Using batch size: %d", batch_size)
         
-        while True:
-            if next_key is not None:
-                payload["nextKey"] = next_key
-            
-            # Get data from PDS
-            response = self._make_pds_request(payload)
-            if not response:
-                break
-                
-            # Process data in batches
-            items = response.get("data", {}).get(table_name, [])
+        if pages is None:
+            pages = self._iter_pages(table_name, sync_history)
+        for items in pages:
+            queue_depth = SYNC_QUEUE_DEPTH.labels(stage="embed", **self._dest_labels)
+            queue_depth.set(len(items))
             for i in range(0, len(items), batch_size):
                 batch = items[i:i + batch_size]
-                total_items += self._process_qdrant_batch(
-                    batch=batch,
-                    collection_name=collection_name,
-                    openai_client=openai_client
-                )
-            
-            # Check pagination
-            next_key = self._get_next_key(response)
-            if not next_key:
-                break
-            
-            time.sleep(1)  # Rate limiting
+                with tracer.start_as_current_span("qdrant.batch", attributes={"sync.batch_size": len(batch)}):
+                    total_items += self._process_qdrant_batch(
+                        batch=batch,
+                        collection_name=collection_name,
+                        embedding_provider=embedding_provider
+                    )
+                queue_depth.dec(len(batch))
+            self._update_sync_progress(sync_history, total_items)
         
         return total_items
 
-    def _make_pds_request(self, payload: Dict[str, Any]) -> Optional[Dict[str, Any]]:
-        """Make a request to the PDS API."""
-        try:
-            # Create a new session for each request
-            with requests.Session() as session:
-                session.trust_env = False  # Don't use environment proxy settings
-                
-                # If proxies are configured, add them to the session
-                # if 'proxies' in self.source_config:
-                #     session.proxies = self.source_config['proxies']
-                
-                response = session.post(
-                    self.pds_url,
-                    headers=self.get_auth_header(),
-                    json=payload,
-                    timeout=300  # Increased timeout to 5 minutes
-                )
-                response.raise_for_status()
-                return response.json()
-        except Exception as e:
-            logger.error(f"Error making PDS request: {str(e)}")
-            return None
+    def _make_pds_request(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """Make a request to the PDS API.
+
+        Connection errors, timeouts, throttling (429) and 5xx responses are
+        retried up to PDS_MAX_RETRIES times with exponential backoff. A request
+        that still fails raises ``PDSExtractionError``, so a broken extraction
+        is never mistaken for the end of the table.
+        """
+        stats = self._extraction_stats
+        attempt = 0
+        while True:
+            try:
+                # Create a new session for each request
+                with requests.Session() as session:
+                    session.trust_env = False  # Don't use environment proxy settings
+                    
+                    # If proxies are configured, add them to the session
+                    # if 'proxies' in self.source_config:
+                    #     session.proxies = self.source_config['proxies']
+                    
+                    with observe_latency(PDS_PAGE_LATENCY, **self._source_labels), stats.stage("pds"), \
+                            tracer.start_as_current_span("pds.request", attributes={"http.method": "POST", "pds.attempt": attempt + 1}) as span:
+                        response = session.post(
+                            self.pds_url,
+                            headers=self.get_auth_header(),
+                            json=payload,
+                            timeout=300  # Increased timeout to 5 minutes
+                        )
+                        span.set_attributes({"http.status_code": response.status_code, "pds.bytes": len(response.content)})
+                    response.raise_for_status()
+                    PDS_PAGE_BYTES.labels(**self._source_labels).observe(len(response.content))
+                    stats.pages += 1
+                    stats.bytes_fetched += len(response.content)
+                    return response.json()
+            except (requests.ConnectionError, requests.Timeout, requests.HTTPError) as e:
+                status = getattr(getattr(e, "response", None), "status_code", None)
+                retryable = status is None or status == 429 or status >= 500
+                if retryable and attempt < PDS_MAX_RETRIES:
+                    attempt += 1
+                    stats.retries += 1
+                    logger.warning("PDS request failed (%s), retry %d/%d", e, attempt, PDS_MAX_RETRIES)
+                    time.sleep(PDS_RETRY_BACKOFF * 2 ** (attempt - 1))
+                    continue
+                logger.error("Error making PDS request: %s", e)
+                raise PDSExtractionError(f"PDS request failed: {e}") from e
+            except Exception as e:
+                logger.error("Error making PDS request: %s", e)
+                raise PDSExtractionError(f"PDS request failed: {e}") from e
 
     def _get_next_key(self, response: Dict[str, Any]) -> Optional[int]:
         """Get next key from pagination data."""
@@ -430,11 +624,9 @@ class PDSSyncService:
                 return next_key
         return None
 
-    def _process_qdrant_batch(self, batch: List[Dict[str, Any]], 
-                            collection_name: str, openai_client: OpenAI) -> int:
-        """Process a batch of items for Qdrant."""
-        logger.info(f"Processing Qdrant batch of size {len(batch)} for collection {collection_name}")
-        
+    def _embed_batch(self, batch: List[Dict[str, Any]],
+                     embedding_provider: EmbeddingClientProvider) -> tuple[List[str], List[List[float]], List[Dict[str, Any]]]:
+        """Embed a batch of rows and return their (point ids, embeddings, payloads)."""
         # Get primary key columns
         primary_key_columns = [col.column_name for col in self.columns if col.is_primary_key]
         if not primary_key_columns:
@@ -483,33 +675,19 @@ class PDSSyncService:
         
         # Get embeddings
         try:
-            logger.info("Requesting embeddings from OpenAI")
-            response = openai_client.embeddings.create(
-                model="text-embedding-3-small",
-                input=texts_to_embed
-            )
-            embeddings = [item.embedding for item in response.data]
-            logger.info(f"Received {len(embeddings)} embeddings from OpenAI")
+            with observe_latency(EMBEDDING_LATENCY, **self._dest_labels), self.stats.stage("embedding"), \
+                    tracer.start_as_current_span("embedding.create", attributes={"embedding.model": embedding_provider.model, "embedding.inputs": len(texts_to_embed)}) as span:
+                embeddings, tokens = embedding_provider.embed_with_usage(texts_to_embed)
+                span.set_attribute("embedding.tokens", tokens)
+            EMBEDDING_TOKENS.labels(**self._dest_labels).inc(tokens)
+            self.stats.embedding_tokens += tokens
+            self.stats.rows_embedded += len(embeddings)
         except Exception as e:
-            logger.error(f"Error getting embeddings: {str(e)}")
+            logger.error("Error getting embeddings: %s", e)
             raise
         
-        # Delete existing points if they exist
-        try:
-            if point_ids:
-                logger.info(f"Deleting {len(point_ids)} existing points")
-                self.qdrant_client.delete(
-                    collection_name=collection_name,
-                    points_selector=models.PointIdsList(
-                        points=point_ids
-                    )
-                )
-        except Exception as e:
-            logger.warning(f"Error deleting existing points: {str(e)}")
-        
-        # Prepare points for Qdrant
-        points = []
-        for idx, (item, embedding, point_id, source_id) in enumerate(zip(batch, embeddings, point_ids, source_ids)):
+        payloads = []
+        for idx, (item, source_id) in enumerate(zip(batch, source_ids)):
             # Extract primary key values for this item
             source_pk = {}
             if primary_key_columns:
@@ -518,70 +696,167 @@ class PDSSyncService:
                     if value is not None:
                         source_pk[col] = value
             
-            points.append(models.PointStruct(
-                id=point_id,
-                vector=embedding,
-                payload={
-                    "table_name": self.table.table_name,
-                    "original_data": item,
-                    "text": texts_to_embed[idx],
-                    "source_id": source_id,  # Original identifier from primary keys
-                    "source_pk": source_pk,  # Original primary key values
-                    "sync_timestamp": datetime.now().isoformat()  # Track when this record was synced
-                }
-            ))
+            payloads.append({
+                "table_name": self.table.table_name,
+                "original_data": item,
+                "text": texts_to_embed[idx],
+                "source_id": source_id,  # Original identifier from primary keys
+                "source_pk": source_pk,  # Original primary key values
+                "sync_timestamp": datetime.now().isoformat()  # Track when this record was synced
+            })
+        return point_ids, embeddings, payloads
+
+    def _process_qdrant_batch(self, batch: List[Dict[str, Any]], 
+                            collection_name: str, embedding_provider: EmbeddingClientProvider) -> int:
+        """Process a batch of items for Qdrant."""
+        from qdrant_client.http import models
+        
+        self._batch_log.info("Processing Qdrant batch #%d of size %d for collection %s",
+                             self._batch_log.calls + 1, len(batch), collection_name)
+        
+        point_ids, embeddings, payloads = self._embed_batch(batch, embedding_provider)
+        
+        # Delete existing points if they exist (a rebuild starts from an empty collection)
+        try:
+            if point_ids and not self.rebuild:
+                with self.stats.stage("qdrant"), \
+                        tracer.start_as_current_span("qdrant.delete", attributes={"qdrant.collection": collection_name, "qdrant.points": len(point_ids)}):
+                    self.qdrant_client.delete(
+                        collection_name=collection_name,
+                        points_selector=models.PointIdsList(
+                            points=point_ids
+                        )
+                    )
+        except Exception as e:
+            logger.warning("Error deleting existing points: %s", e)
+        
+        # Prepare points for Qdrant
+        points = [
+            models.PointStruct(id=point_id, vector=embedding, payload=payload)
+            for point_id, embedding, payload in zip(point_ids, embeddings, payloads)
+        ]
         
         # Upsert to Qdrant
         try:
-            logger.info(f"Attempting to upsert {len(points)} points to Qdrant")
-            logger.info(f"Qdrant client state before upsert: {self.qdrant_client}")
-            logger.info(f"Qdrant client type: {type(self.qdrant_client)}")
-            logger.info(f"Qdrant client attributes: {dir(self.qdrant_client)}")
-            
-            self.qdrant_client.upsert(
-                collection_name=collection_name,
-                points=points
-            )
-            logger.info("Successfully upserted points to Qdrant")
+            with observe_latency(QDRANT_UPSERT_LATENCY, **self._dest_labels), self.stats.stage("qdrant"), \
+                    tracer.start_as_current_span("qdrant.upsert", attributes={"qdrant.collection": collection_name, "qdrant.points": len(points)}):
+                self.qdrant_client.upsert(
+                    collection_name=collection_name,
+                    points=points
+                )
+            SYNC_ROWS.labels(destination="qdrant", **self._dest_labels).inc(len(points))
+            self.stats.rows_written += len(points)
+            logger.debug("Upserted %d points to Qdrant", len(points))
             return len(batch)
         except Exception as e:
-            logger.error(f"Error upserting to Qdrant: {str(e)}")
-            logger.error(f"Error type: {type(e)}")
-            logger.error(f"Error args: {e.args}")
-            import traceback
-            logger.error(f"Traceback: {traceback.format_exc()}")
+            logger.exception("Error upserting to Qdrant: %s", e)
             raise
 
-    def run_sql_sync(self):
-        """Run SQL sync process."""
+    def run_sql_sync(self, pages: Iterable[List[Dict[str, Any]]] = None):
+        """Run SQL sync process (a shadow-table full refresh in rebuild mode)."""
         try:
             sync_history = self._create_sync_history()
+            self._page_converter = None
+            self.rejected_values = {}
+            if self.rebuild:
+                return self._run_sql_full_refresh(sync_history, pages)
             self.create_destination_table()
             
-            # Get data from PDS
-            all_data = self._get_table_data(self.table.table_name)
-            
-            # Process data
-            total_updates, total_creates = self.sync_data(all_data)
+            # Write each page from PDS as it arrives
+            if pages is None:
+                pages = self._iter_pages(self.table.table_name, sync_history)
+            total_rows = total_updates = total_creates = 0
+            queue_depth = SYNC_QUEUE_DEPTH.labels(stage="sql_write", **self._dest_labels)
+            for items in pages:
+                queue_depth.set(len(items))
+                with observe_latency(SQL_WRITE_LATENCY, **self._dest_labels), self.stats.stage("sql"), \
+                        tracer.start_as_current_span("sql.sync_data", attributes={"db.sql.table": self.table.table_name, "sync.rows": len(items)}) as span:
+                    updates, creates = self.sync_data(items)
+                    span.set_attributes({"sync.updates": updates, "sync.creates": creates})
+                queue_depth.set(0)
+                SYNC_ROWS.labels(destination="sql", **self._dest_labels).inc(updates + creates)
+                self.stats.rows_written += updates + creates
+                total_rows += len(items)
+                total_updates += updates
+                total_creates += creates
+                self._update_sync_progress(sync_history, total_creates)
             
             # Update sync history
             self._update_sync_history(sync_history, total_creates)
             
             return {
                 "status": "SUCCESS",
-                "message": f"Successfully synced {len(all_data)} rows",
-                "total_rows": len(all_data),
+                "message": f"Successfully synced {total_rows} rows",
+                "total_rows": total_rows,
                 "total_updates": total_updates,
                 "total_creates": total_creates,
+                "rejected_values": dict(self.rejected_values),
                 "sync_guid": str(sync_history.sync_guid)
             }
             
         except Exception as e:
-            logger.error(f"Error in SQL sync process: {str(e)}")
+            logger.error("Error in SQL sync process: %s", e)
             if 'sync_history' in locals():
                 self._update_sync_history(sync_history, 0, str(e))
             raise
 
+    def _run_sql_full_refresh(self, sync_history: SyncHistory, pages: Iterable[List[Dict[str, Any]]] = None):
+        """Replace the destination table with a freshly bulk-loaded copy (see ``sql_refresh``)."""
+        if pages is None:
+            pages = self._iter_pages(self.table.table_name, sync_history)
+        refresh = ShadowTableRefresh(
+            self.dest_engine,
+            self.table.table_name,
+            self._column_definitions(),
+            [(col.column_name, col.data_type) for col in self.columns],
+            [col.column_name for col in self.columns if col.is_primary_key],
+            sync_guid=sync_history.sync_guid
+        )
+        try:
+            with observe_latency(SQL_WRITE_LATENCY, **self._dest_labels), self.stats.stage("sql"), \
+                    tracer.start_as_current_span("sql.full_refresh", attributes={"db.sql.table": self.table.table_name}) as span:
+                total_rows = refresh.load(pages)
+                self._require_complete_extraction()
+                refresh.swap()
+                span.set_attribute("sync.rows", total_rows)
+        except Exception:
+            refresh.drop()
+            raise
+        SYNC_ROWS.labels(destination="sql", **self._dest_labels).inc(total_rows)
+        self.stats.rows_written += total_rows
+        if refresh.rejected:
+            self.rejected_values = refresh.rejected
+            for data_type, count in refresh.rejected.items():
+                SYNC_REJECTED_VALUES.labels(data_type=data_type, **self._dest_labels).inc(count)
+            logger.warning("Quarantined values in %s: %s", rejects_table(self.table.table_name), refresh.rejected)
+        
+        self._update_sync_history(sync_history, total_rows)
+        
+        return {
+            "status": "SUCCESS",
+            "message": f"Refreshed {self.table.table_name} with {total_rows} rows",
+            "total_rows": total_rows,
+            "total_updates": 0,
+            "total_creates": total_rows,
+            "rejected_values": dict(self.rejected_values),
+            "sync_guid": str(sync_history.sync_guid)
+        }
+
+    def _supplied_pages(self, pages: Iterable[List[Dict[str, Any]]]):
+        """Pass through pages handed to ``run_sync``; their source raises if it fails."""
+        self.extraction_complete = False
+        yield from pages
+        self.extraction_complete = True
+
+    def _require_complete_extraction(self):
+        """Refuse to publish a rebuilt destination unless every page was read."""
+        if not self.extraction_complete:
+            raise PDSExtractionError("PDS extraction did not complete; keeping the current destination data")
+
+    def _column_definitions(self) -> List[str]:
+        """Column clauses of the destination table's CREATE TABLE."""
+        return [f'"{col.column_name}" {self._get_postgres_type(col.data_type)}' for col in self.columns]
+
     def create_destination_table(self):
         """Create the destination table if it doesn't exist."""
         with self.dest_engine.connect() as conn:
@@ -589,10 +864,7 @@ class PDSSyncService:
             primary_key_columns = [col.column_name for col in self.columns if col.is_primary_key]
             
             # Create column definitions
-            column_definitions = []
-            for col in self.columns:
-                pg_type = self._get_postgres_type(col.data_type)
-                column_definitions.append(f'"{col.column_name}" {pg_type}')
+            column_definitions = self._column_definitions()
             
             # Create table
             create_table_sql = f"""
@@ -606,121 +878,124 @@ class PDSSyncService:
 
     def _get_postgres_type(self, data_type: str) -> str:
         """Convert PDS data types to PostgreSQL data types."""
-        type_map = {
-            'string': 'VARCHAR(255)',
-            'number': 'NUMERIC',
-            'date': 'DATE',
-            'datetime': 'TIMESTAMP',
-            'boolean': 'BOOLEAN'
-        }
-        return type_map.get(data_type.lower(), 'VARCHAR(255)')
+        return postgres_type(data_type)
 
-    def _get_table_data(self, table_name: str) -> List[Dict[str, Any]]:
-        """Get all data from PDS table."""
+    def _iter_pages(self, table_name: str, sync_history: SyncHistory):
+        """Yield the rows of each page, from PDS or from ``self.staged_run``.
+
+        Pages fetched from PDS are also written to a staged run when
+        ``self.stage_pages`` is set; the run is marked complete (and older
+        runs pruned) only once the whole extraction succeeded.
+        ``self.extraction_complete`` is set once the last page was yielded.
+        """
+        stats = self._extraction_stats
+        self.extraction_complete = False
+        if self.staged_run:
+            logger.info("Reading staged pages from %s instead of PDS", self.staged_run)
+            for items in iter_staged_pages(self.staged_run):
+                with tracer.start_as_current_span("sync.page", attributes={"sync.page": stats.pages + 1, "sync.staged": True}) as page_span:
+                    page_span.set_attribute("sync.rows", len(items))
+                    stats.pages += 1
+                    stats.rows_fetched += len(items)
+                    yield items
+            self.extraction_complete = True
+            return
+        
+        stager = None
+        if self.stage_pages:
+            stager = PageStager(run_directory(self.table_id, sync_history.sync_guid))
+            self._write_sync_history(sync_history, staging_path=stager.directory)
+        
         table_name = self._ensure_unifier_prefix(table_name)
         payload = self.build_payload()
-        all_data = []
         next_key = None
         
         while True:
             if next_key is not None:
                 payload["nextKey"] = next_key
             
-            response = self._make_pds_request(payload)
-            if not response:
-                break
-            
-            items = response.get("data", {}).get(table_name, [])
-            all_data.extend(items)
-            
-            next_key = self._get_next_key(response)
-            if not next_key:
-                break
+            with tracer.start_as_current_span("sync.page", attributes={"sync.page": stats.pages + 1}) as page_span:
+                response = self._make_pds_request(payload)
+                
+                items = response.get("data", {}).get(table_name, [])
+                page_span.set_attribute("sync.rows", len(items))
+                PDS_ROWS.labels(**self._source_labels).inc(len(items))
+                stats.rows_fetched += len(items)
+                if stager is not None:
+                    stager.write(items)
+                yield items
+                
+                next_key = self._get_next_key(response)
+                if not next_key:
+                    # The only clean end: failed requests raise, and a consumer that stops early never gets here
+                    self.extraction_complete = True
+                    break
             
-            time.sleep(1)
+            time.sleep(PDS_PAGE_DELAY)  # Rate limiting
         
-        return all_data
+        # A truncated run must not become replayable or push complete runs out of retention
+        if stager is not None and self.extraction_complete:
+            stager.finish(table_id=self.table_id, table_name=self.table.table_name, sync_guid=sync_history.sync_guid)
+            prune_staged_runs(self.table_id)
 
     def sync_data(self, data: List[Dict[str, Any]]) -> tuple[int, int]:
-        """Sync data to destination table."""
-        updates = 0
-        creates = 0
+        """Upsert one page into the destination table and return (updates, creates).
+
+        The page is converted to typed values (see ``typed_columns``), binary
+        COPYed into a temporary table and merged with ``INSERT ... ON
+        CONFLICT``; blank values never overwrite existing ones and the last
+        occurrence of a key in the page wins.
+        """
+        if not any(col.is_primary_key for col in self.columns):
+            logger.warning("Table %s has no primary key columns; nothing is synced", self.table.table_name)
+            return 0, 0
         
+        table = quote(self.table.table_name)
         with self.dest_engine.connect() as conn:
-            for row in data:
-                try:
-                    # Convert values to strings
-                    processed_row = {k: str(v) if v is not None else None for k, v in row.items()}
-                    
-                    # Get primary key values
-                    primary_key_columns = [col.column_name for col in self.columns if col.is_primary_key]
-                    if not primary_key_columns:
-                        continue
-                    
-                    # Build WHERE clause
-                    conditions = []
-                    values = {}
-                    for col in primary_key_columns:
-                        value = processed_row.get(col)
-                        if value is not None and value.strip():
-                            param_name = f"pk_{col.lower()}"
-                            conditions.append(f'"{col}" = :{param_name}')
-                            values[param_name] = value
-                    
-                    if not conditions:
-                        continue
-                    
-                    where_clause = ' AND '.join(conditions)
-                    
-                    # Check if row exists
-                    check_sql = f'SELECT COUNT(*) FROM "{self.table.table_name}" WHERE {where_clause}'
-                    result = conn.execute(text(check_sql), values).scalar()
-                    
-                    if result > 0:
-                        # Update existing row
-                        update_columns = []
-                        update_values = {}
-                        for col in self.columns:
-                            if col.column_name in processed_row and col.column_name not in primary_key_columns:
-                                value = processed_row[col.column_name]
-                                if value is not None and value.strip():
-                                    param_name = f"update_{col.column_name.lower()}"
-                                    update_columns.append(f'"{col.column_name}" = :{param_name}')
-                                    update_values[param_name] = value
-                        
-                        if update_columns:
-                            update_sql = f"""
-                            UPDATE "{self.table.table_name}"
-                            SET {', '.join(update_columns)}
-                            WHERE {where_clause}
-                            """
-                            update_values.update(values)
-                            conn.execute(text(update_sql), update_values)
-                            updates += 1
-                    else:
-                        # Insert new row
-                        columns = []
-                        insert_values = {}
-                        for col in self.columns:
-                            if col.column_name in processed_row:
-                                value = processed_row[col.column_name]
-                                if value is not None and value.strip():
-                                    param_name = f"insert_{col.column_name.lower()}"
-                                    columns.append(f'"{col.column_name}"')
-                                    insert_values[param_name] = value
-                        
-                        if columns:
-                            placeholders = [f":{k}" for k in insert_values.keys()]
-                            insert_sql = f"""
-                            INSERT INTO "{self.table.table_name}" ({', '.join(columns)})
-                            VALUES ({', '.join(placeholders)})
-                            """
-                            conn.execute(text(insert_sql), insert_values)
-                            creates += 1
-                
-                except Exception as e:
-                    logger.error(f"Error processing row: {str(e)}")
-                    continue
-            
+            if self._page_converter is None:
+                self._page_converter = PageConverter(
+                    [(col.column_name, col.data_type) for col in self.columns],
+                    [col.column_name for col in self.columns if col.is_primary_key],
+                    destination_columns(conn, self.table.table_name)
+                )
+            converter = self._page_converter
+            if not converter.primary_key_columns:
+                raise ValueError(f"Destination table {self.table.table_name} has none of the primary key columns")
+            
+            rows, rejects = converter.convert(data)
+            self._quarantine(conn, rejects)
+            if not rows:
+                conn.commit()
+                return 0, 0
+            
+            conn.execute(text(f'CREATE TEMP TABLE "_pds_incoming" (LIKE {table} INCLUDING DEFAULTS) ON COMMIT DROP'))
+            copy_rows(conn, "_pds_incoming", converter.column_names, rows)
+            
+            columns = ", ".join(quote(name) for name in converter.column_names)
+            keys = ", ".join(quote(name) for name in converter.primary_key_columns)
+            updates = [
+                f"{quote(name)} = COALESCE(EXCLUDED.{quote(name)}, {table}.{quote(name)})"
+                for name in converter.column_names if name not in converter.primary_key_columns
+            ]
+            # xmax = 0 only for freshly inserted rows
+            inserted = conn.execute(text(f"""
+            INSERT INTO {table} ({columns})
+            SELECT DISTINCT ON ({keys}) {columns} FROM "_pds_incoming" ORDER BY {keys}, ctid DESC
+            ON CONFLICT ({keys}) DO {'UPDATE SET ' + ', '.join(updates) if updates else 'NOTHING'}
+            RETURNING (xmax = 0)
+            """)).scalars().all()
             conn.commit()
-            return updates, creates 
\ No newline at end of file
+        
+        creates = sum(1 for is_new in inserted if is_new)
+        return len(inserted) - creates, creates
+
+    def _quarantine(self, conn, rejects: List[Reject]):
+        """Store values that failed conversion and count them per data type."""
+        if not rejects:
+            return
+        quarantine(conn, self.table.table_name, self.sync_history.sync_guid if self.sync_history else None, rejects)
+        for data_type, count in count_by_type(rejects).items():
+            SYNC_REJECTED_VALUES.labels(data_type=data_type, **self._dest_labels).inc(count)
+        count_by_type(rejects, self.rejected_values)
+        self._batch_log.log(logging.WARNING, "Quarantined %d values of %s in %s", len(rejects),
+                                self.table.table_name, rejects_table(self.table.table_name))
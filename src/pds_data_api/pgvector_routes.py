@@ -0,0 +1,46 @@
+from fastapi import APIRouter, HTTPException, Depends
+import json
+import uuid
+from sqlalchemy.orm import Session, joinedload
+from .database import get_db
+from .destination_engines import get_destination_engine_registry
+from .models import Connection
+from .pgvector_store import PgVectorStore
+from .qdrant_routes import SearchRequest
+
+router = APIRouter(prefix="/pgvector", tags=["pgvector"])
+
+def get_pgvector_config(connection_id: uuid.UUID, db: Session = Depends(get_db)) -> dict:
+    """The config of a ``PostgreSQL+pgvector`` destination connection."""
+    connection = (
+        db.query(Connection)
+        .options(joinedload(Connection.connection_type))
+        .filter(Connection.id == connection_id)
+        .first()
+    )
+    if not connection:
+        raise HTTPException(status_code=404, detail="Connection not found")
+    if connection.connection_type.name.lower() != "postgresql+pgvector":
+        raise HTTPException(status_code=400, detail="Connection is not a pgvector destination")
+    return json.loads(connection.connection_config.decode("utf-8"))
+
+@router.post("/{connection_id}/collections/{collection_name}/points/search")
+def search_points(
+    connection_id: uuid.UUID,
+    collection_name: str,
+    search_request: SearchRequest,
+    config: dict = Depends(get_pgvector_config)
+):
+    """Search a pgvector table; same request and response shape as the Qdrant search."""
+    engine = get_destination_engine_registry().get_engine(connection_id, config)
+    store = PgVectorStore.from_config(engine, collection_name, config)
+    try:
+        return store.search(
+            query_vector=search_request.vector,
+            limit=search_request.limit,
+            score_threshold=search_request.filter.get('score_threshold') if search_request.filter else None
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to search points: {str(e)}")
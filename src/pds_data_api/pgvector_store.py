@@ -0,0 +1,218 @@
+"""pgvector destination: embeddings stored in Postgres instead of Qdrant.
+
+A table synced to a ``PostgreSQL+pgvector`` connection is written to the
+table named like its Qdrant collection (the lowercased table name), with one
+row per point::
+
+    id UUID PRIMARY KEY, embedding vector(1536) | halfvec(1536),
+    text TEXT, payload JSONB, synced_at TIMESTAMP
+
+``payload`` holds the same document as the Qdrant point payload. Rows are
+written with binary ``COPY``. The first load of a table and rebuilds go into
+a shadow table without any index; the primary key and the HNSW (or IVFFlat)
+index are built once the load is complete, then the table is analysed and
+renamed over the live one. Incremental syncs upsert through a temporary
+table and keep the existing index.
+
+Connection options besides host/port/database/username/password:
+``vector_type`` (``vector`` or ``halfvec``), ``index`` (``hnsw`` or
+``ivfflat``) and ``dimensions`` (default 1536).
+"""
+import json
+import logging
+import math
+import struct
+import sys
+import uuid
+from array import array
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import text
+
+from .config import (
+    PGVECTOR_EF_SEARCH, PGVECTOR_HNSW_EF_CONSTRUCTION, PGVECTOR_HNSW_M, PGVECTOR_IVFFLAT_PROBES,
+    SQL_REFRESH_MAINTENANCE_WORK_MEM
+)
+from .sql_refresh import swap_table
+from .typed_columns import binary_copy_stream, binary_encoder, quote
+
+logger = logging.getLogger(__name__)
+
+VECTOR_TYPES = ("vector", "halfvec")
+INDEX_METHODS = ("hnsw", "ivfflat")
+COLUMNS = ("id", "embedding", "text", "payload", "synced_at")
+
+_encode_timestamp = binary_encoder("timestamp")
+
+def vector_literal(vector: List[float]) -> str:
+    """Text form of a vector for query parameters, e.g. ``[0.1,0.2]``."""
+    return "[" + ",".join(repr(float(value)) for value in vector) + "]"
+
+class PgVectorStore:
+    def __init__(self, engine, name: str, dimensions: int = 1536, vector_type: str = "vector",
+                 index: str = "hnsw"):
+        """A pgvector table ``name`` in the destination database behind ``engine``."""
+        if vector_type not in VECTOR_TYPES:
+            raise ValueError(f"Unknown vector_type {vector_type!r} (use {' or '.join(VECTOR_TYPES)})")
+        if index not in INDEX_METHODS:
+            raise ValueError(f"Unknown index {index!r} (use {' or '.join(INDEX_METHODS)})")
+        self.engine = engine
+        self.name = name
+        self.dimensions = int(dimensions)
+        self.vector_type = vector_type
+        self.index = index
+        self.target: Optional[str] = None
+        self._shadow = False
+
+    @classmethod
+    def from_config(cls, engine, name: str, config: Dict[str, Any]) -> "PgVectorStore":
+        """Build a store from a ``PostgreSQL+pgvector`` connection config."""
+        return cls(engine, name, dimensions=config.get("dimensions", 1536),
+                   vector_type=config.get("vector_type", "vector"), index=config.get("index", "hnsw"))
+
+    @property
+    def _operator_class(self) -> str:
+        return f"{self.vector_type}_cosine_ops"
+
+    def _create_table(self, conn, table_name: str, primary_key: bool):
+        conn.execute(text("CREATE EXTENSION IF NOT EXISTS vector"))
+        conn.execute(text(
+            f"CREATE TABLE IF NOT EXISTS {quote(table_name)} ("
+            f"id UUID NOT NULL{' PRIMARY KEY' if primary_key else ''}, "
+            f"embedding {self.vector_type}({self.dimensions}), text TEXT, payload JSONB, synced_at TIMESTAMP)"
+        ))
+
+    def start(self, full: bool = False):
+        """Prepare a sync; ``full`` (or a missing table) loads a shadow table that replaces the live one."""
+        with self.engine.connect() as conn:
+            exists = conn.execute(text("SELECT to_regclass(:table) IS NOT NULL"), {"table": quote(self.name)}).scalar()
+            self._shadow = full or not exists
+            if self._shadow:
+                self.target = f"{self.name[:40]}__load_{uuid.uuid4().hex[:8]}"
+                self._create_table(conn, self.target, primary_key=False)
+                logger.info("Loading pgvector table %s into %s", self.name, self.target)
+            else:
+                self.target = self.name
+            conn.commit()
+
+    def _encode_vector(self, vector: List[float]) -> bytes:
+        if len(vector) != self.dimensions:
+            raise ValueError(f"Embedding has {len(vector)} dimensions, {self.name} expects {self.dimensions}")
+        header = struct.pack("!hh", self.dimensions, 0)
+        if self.vector_type == "halfvec":
+            return header + struct.pack(f"!{self.dimensions}e", *vector)
+        values = array("f", vector)
+        if sys.byteorder == "little":
+            values.byteswap()
+        return header + values.tobytes()
+
+    def _encode_rows(self, point_ids: List[str], embeddings: List[List[float]],
+                     payloads: List[Dict[str, Any]]) -> List[List[bytes]]:
+        rows = []
+        for point_id, embedding, payload in zip(point_ids, embeddings, payloads):
+            synced_at = payload.get("sync_timestamp")
+            rows.append([
+                uuid.UUID(str(point_id)).bytes,
+                self._encode_vector(embedding),
+                str(payload.get("text") or "").encode("utf-8"),
+                b"\x01" + json.dumps(payload, default=str).encode("utf-8"),  # jsonb binary format version 1
+                _encode_timestamp(_parse_timestamp(synced_at)) if synced_at else None,
+            ])
+        return rows
+
+    def write(self, point_ids: List[str], embeddings: List[List[float]], payloads: List[Dict[str, Any]]):
+        """Write one embedded batch (the output of ``PDSSyncService._embed_batch``)."""
+        rows = self._encode_rows(point_ids, embeddings, payloads)
+        columns = ", ".join(COLUMNS)
+        with self.engine.connect() as conn:
+            if self._shadow:
+                self._copy(conn, self.target, rows)
+            else:
+                conn.execute(text(f'CREATE TEMP TABLE "_pgvector_incoming" (LIKE {quote(self.target)}) ON COMMIT DROP'))
+                self._copy(conn, "_pgvector_incoming", rows)
+                conn.execute(text(
+                    f"INSERT INTO {quote(self.target)} ({columns}) "
+                    f'SELECT DISTINCT ON (id) {columns} FROM "_pgvector_incoming" ORDER BY id, ctid DESC '
+                    "ON CONFLICT (id) DO UPDATE SET embedding = EXCLUDED.embedding, text = EXCLUDED.text, "
+                    "payload = EXCLUDED.payload, synced_at = EXCLUDED.synced_at"
+                ))
+            conn.commit()
+
+    @staticmethod
+    def _copy(conn, table_name: str, rows: List[List[bytes]]):
+        cursor = conn.connection.cursor()
+        try:
+            cursor.copy_expert(f"COPY {quote(table_name)} ({', '.join(COLUMNS)}) FROM STDIN WITH (FORMAT binary)",
+                               binary_copy_stream(rows))
+        finally:
+            cursor.close()
+
+    def finish(self):
+        """After a shadow load: build the key and vector index, analyse, and swap the table in."""
+        if not self._shadow:
+            return
+        shadow = quote(self.target)
+        index_name = f"{self.target}_embedding_idx"
+        with self.engine.connect() as conn:
+            conn.execute(text("SET LOCAL statement_timeout = 0"))
+            conn.execute(text(f"SET LOCAL maintenance_work_mem = '{SQL_REFRESH_MAINTENANCE_WORK_MEM}'"))
+            # Latest write of a point wins, as with Qdrant upserts
+            conn.execute(text(f"DELETE FROM {shadow} a USING {shadow} b WHERE a.ctid < b.ctid AND a.id = b.id"))
+            conn.execute(text(f"ALTER TABLE {shadow} ADD PRIMARY KEY (id)"))
+            rows = conn.execute(text(f"SELECT COUNT(*) FROM {shadow}")).scalar()
+            conn.execute(text(
+                f"CREATE INDEX {quote(index_name)} ON {shadow} "
+                f"USING {self.index} (embedding {self._operator_class}) WITH ({self._index_options(rows)})"
+            ))
+            conn.execute(text(f"ANALYZE {shadow}"))
+            conn.commit()
+        logger.info("Built %s index on %s (%d rows)", self.index, self.target, rows)
+        swap_table(
+            self.engine, self.name, self.target, f"{self.name[:40]}__retired_{self.target[-8:]}",
+            constraint_names={f"{self.target}_pkey": f"{self.name[:58]}_pkey"},
+            index_names={index_name: f"{self.name[:50]}_embedding_idx"}
+        )
+        self._shadow = False
+        self.target = self.name
+
+    def _index_options(self, rows: int) -> str:
+        if self.index == "hnsw":
+            return f"m = {PGVECTOR_HNSW_M}, ef_construction = {PGVECTOR_HNSW_EF_CONSTRUCTION}"
+        # pgvector's guidance: rows / 1000 lists up to 1M rows, sqrt(rows) beyond
+        lists = rows // 1000 if rows <= 1000000 else int(math.sqrt(rows))
+        return f"lists = {max(1, lists)}"
+
+    def abort(self):
+        """Drop the shadow table of a failed load."""
+        if not self._shadow:
+            return
+        try:
+            with self.engine.connect() as conn:
+                conn.execute(text(f"DROP TABLE IF EXISTS {quote(self.target)}"))
+                conn.commit()
+        except Exception as e:
+            logger.warning("Could not drop pgvector load table %s: %s", self.target, e)
+
+    def search(self, query_vector: List[float], limit: int = 10,
+               score_threshold: Optional[float] = None) -> List[Dict[str, Any]]:
+        """Nearest points by cosine similarity, in the shape ``QdrantService.search_points`` returns."""
+        distance = f"embedding <=> CAST(:query AS {self.vector_type})"
+        with self.engine.connect() as conn:
+            if self.index == "hnsw":
+                conn.execute(text(f"SET LOCAL hnsw.ef_search = {max(PGVECTOR_EF_SEARCH, int(limit))}"))
+            else:
+                conn.execute(text(f"SET LOCAL ivfflat.probes = {PGVECTOR_IVFFLAT_PROBES}"))
+            rows = conn.execute(
+                text(f"SELECT id, 1 - ({distance}) AS score, payload FROM {quote(self.name)} "
+                     f"ORDER BY {distance} LIMIT :limit"),
+                {"query": vector_literal(query_vector), "limit": int(limit)}
+            ).all()
+        return [
+            {"id": str(point_id), "score": float(score), "payload": payload}
+            for point_id, score, payload in rows
+            if score_threshold is None or score >= score_threshold
+        ]
+
+def _parse_timestamp(value: Any) -> datetime:
+    return value if isinstance(value, datetime) else datetime.fromisoformat(str(value))
@@ -0,0 +1,135 @@
+"""On-demand profiling of sync runs.
+
+``SyncProfiler`` wraps a block in pyinstrument (a sampling profiler that renders
+an HTML flame graph) when it is installed, falling back to cProfile, and takes
+tracemalloc snapshots before and after. ``save`` bundles the reports into a
+single zip so they can be downloaded from the sync history page.
+
+tracemalloc is process-wide, so concurrent profiled syncs share one tracing
+session: the first profiler to enter starts it and the last to exit stops it.
+The peak of a run that overlapped another profiled run covers both.
+"""
+import cProfile
+import importlib.util
+import io
+import logging
+import os
+import pstats
+import tempfile
+import threading
+import tracemalloc
+import zipfile
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+# Profilers currently inside their block, and whether they started tracemalloc
+_tracemalloc_lock = threading.Lock()
+_tracemalloc_users = 0
+_tracemalloc_entries = 0
+_tracemalloc_owned = False
+
+class SyncProfiler:
+    def __init__(self, top: int = 30, frames: int = 10):
+        """Prepare a profiler; ``top`` limits the rows in each text report."""
+        self.top = top
+        self.frames = frames
+        self.use_pyinstrument = importlib.util.find_spec("pyinstrument") is not None
+        self._profiler = None
+        self._entries_at_start = 0
+        self.overlapped = False
+        self._snapshot_before: Optional[tracemalloc.Snapshot] = None
+        self._snapshot_after: Optional[tracemalloc.Snapshot] = None
+        self.peak_bytes = 0
+
+    def __enter__(self):
+        global _tracemalloc_users, _tracemalloc_entries, _tracemalloc_owned
+        with _tracemalloc_lock:
+            if _tracemalloc_users == 0:
+                if not tracemalloc.is_tracing():
+                    tracemalloc.start(self.frames)
+                    _tracemalloc_owned = True
+                # Only safe while no other run's peak is being measured
+                tracemalloc.reset_peak()
+            else:
+                self.overlapped = True
+            _tracemalloc_users += 1
+            _tracemalloc_entries += 1
+            self._entries_at_start = _tracemalloc_entries
+            self._snapshot_before = tracemalloc.take_snapshot()
+
+        if self.use_pyinstrument:
+            from pyinstrument import Profiler
+            # Sync runs block their own thread, so only sample that thread
+            self._profiler = Profiler(async_mode="disabled")
+            self._profiler.start()
+        else:
+            self._profiler = cProfile.Profile()
+            self._profiler.enable()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if self.use_pyinstrument:
+            self._profiler.stop()
+        else:
+            self._profiler.disable()
+        global _tracemalloc_users, _tracemalloc_owned
+        with _tracemalloc_lock:
+            self._snapshot_after = tracemalloc.take_snapshot()
+            self.peak_bytes = tracemalloc.get_traced_memory()[1]
+            if _tracemalloc_entries != self._entries_at_start or _tracemalloc_users > 1:
+                self.overlapped = True
+            _tracemalloc_users -= 1
+            if _tracemalloc_users == 0 and _tracemalloc_owned:
+                tracemalloc.stop()
+                _tracemalloc_owned = False
+        return False
+
+    def _cpu_reports(self) -> dict:
+        """Return the CPU profile as {archive name: bytes}."""
+        if self.use_pyinstrument:
+            return {
+                "profile.html": self._profiler.output_html().encode(),
+                "profile.txt": self._profiler.output_text(unicode=True, show_all=False).encode(),
+            }
+
+        text = io.StringIO()
+        stats = pstats.Stats(self._profiler, stream=text)
+        stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(self.top)
+        with tempfile.NamedTemporaryFile(suffix=".prof", delete=False) as f:
+            dump_path = f.name
+        try:
+            # Binary stats load in snakeviz or `python -m pstats`
+            stats.dump_stats(dump_path)
+            with open(dump_path, "rb") as f:
+                raw = f.read()
+        finally:
+            os.unlink(dump_path)
+        return {"profile.prof": raw, "profile.txt": text.getvalue().encode()}
+
+    def _memory_report(self) -> str:
+        """Summarize allocation growth between the two snapshots."""
+        lines = [f"Peak traced memory: {self.peak_bytes / 1048576:.1f} MiB"]
+        if self.overlapped:
+            lines.append("(another profiled sync ran at the same time; the peak and growth include it)")
+        lines.append("")
+        lines.append(f"Top {self.top} allocation sites by growth:")
+        for stat in self._snapshot_after.compare_to(self._snapshot_before, "lineno")[:self.top]:
+            lines.append(f"  {stat}")
+        lines.append("")
+        lines.append(f"Top {min(self.top, 10)} tracebacks still allocated at the end:")
+        for stat in self._snapshot_after.statistics("traceback")[:min(self.top, 10)]:
+            lines.append(f"  {stat.count} blocks, {stat.size / 1024:.1f} KiB")
+            lines.extend(f"    {line}" for line in stat.traceback.format())
+        return "\n".join(lines) + "\n"
+
+    def save(self, directory: str, name: str) -> str:
+        """Write the CPU and memory reports to ``<directory>/<name>.zip`` and return its path."""
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, f"{name}.zip")
+        with zipfile.ZipFile(path, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+            for entry, data in self._cpu_reports().items():
+                archive.writestr(entry, data)
+            archive.writestr("memory.txt", self._memory_report())
+        logger.info("Saved sync profile to %s", path)
+        return path
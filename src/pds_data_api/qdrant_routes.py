@@ -1,9 +1,11 @@
 from fastapi import APIRouter, HTTPException, Depends
+from fastapi.responses import StreamingResponse
 from typing import List, Dict, Any, Optional, Union
 from pydantic import BaseModel, Field
 from .qdrant_service import QdrantService
 from sqlalchemy.orm import Session
 from .database import get_db
+from .data_export import FORMATS, check_format, encode_qdrant
 
 router = APIRouter(prefix="/qdrant", tags=["qdrant"])
 
@@ -39,6 +41,10 @@ def get_qdrant_service(db: Session = Depends(get_db)):
     finally:
         service.close()
 
+def get_resolved_collection(collection_name: str, qdrant: QdrantService = Depends(get_qdrant_service)) -> str:
+    """The concrete collection behind ``collection_name``, which may be a rebuild alias."""
+    return qdrant.resolve_collection(collection_name)
+
 @router.post("/collections/{collection_name}")
 def create_collection(
     collection_params: CollectionCreate,
@@ -94,8 +100,8 @@ def upsert_points(
 
 @router.post("/collections/{collection_name}/points/search")
 def search_points(
-    collection_name: str,
     search_request: SearchRequest,
+    collection_name: str = Depends(get_resolved_collection),
     qdrant: QdrantService = Depends(get_qdrant_service)
 ):
     """Search for points in a collection."""
@@ -117,9 +123,9 @@ def delete_points(
 
 @router.get("/collections/{collection_name}/points")
 def get_points(
-    collection_name: str,
     point_ids: List[str],
     with_payload: bool = True,
+    collection_name: str = Depends(get_resolved_collection),
     qdrant: QdrantService = Depends(get_qdrant_service)
 ):
     """Retrieve points by their IDs."""
@@ -131,8 +137,8 @@ def get_points(
 
 @router.post("/collections/{collection_name}/points/scroll")
 def scroll_points(
-    collection_name: str,
     scroll_request: ScrollRequest,
+    collection_name: str = Depends(get_resolved_collection),
     qdrant: QdrantService = Depends(get_qdrant_service)
 ):
     """Scroll through points in a collection."""
@@ -144,9 +150,28 @@ def scroll_points(
 
 @router.post("/collections/{collection_name}/points/count")
 def count_points(
-    collection_name: str,
+    collection_name: str = Depends(get_resolved_collection),
     filter: Optional[Dict[str, Any]] = None,
     qdrant: QdrantService = Depends(get_qdrant_service)
 ):
     """Count points in a collection, optionally filtered."""
-    return qdrant.count_points(collection_name) 
\ No newline at end of file
+    return qdrant.count_points(collection_name) 
+
+@router.get("/collections/{collection_name}/export")
+def export_collection(
+    collection_name: str = Depends(get_resolved_collection),
+    format: str = "ndjson",
+    with_vectors: bool = False,
+    qdrant: QdrantService = Depends(get_qdrant_service)
+):
+    """Stream a whole collection as NDJSON, CSV or Parquet (vectors as float32 bytes)."""
+    try:
+        check_format(format)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    media_type, extension = FORMATS[format]
+    return StreamingResponse(
+        encode_qdrant(qdrant.client, collection_name, format, with_vectors),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{collection_name}.{extension}"'}
+    )
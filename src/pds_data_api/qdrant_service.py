@@ -1,9 +1,6 @@
 from typing import List, Dict, Any, Optional, Union
 import logging
 from fastapi import HTTPException
-from qdrant_client import QdrantClient
-from qdrant_client.http import models
-from qdrant_client.http.models import Distance, VectorParams, PointStruct
 from sqlalchemy.orm import Session
 from .models import QdrantCollection, QdrantPoint
 import uuid
@@ -11,6 +8,8 @@ import uuid
 class QdrantService:
     def __init__(self, db: Session, host: str = "localhost", port: int = 6333):
         """Initialize the Qdrant service with connection details."""
+        from qdrant_client import QdrantClient
+        
         # Construct URL from host and port
         url = f"http://{host}:{port}"
         self.client = QdrantClient(url=url)
@@ -19,6 +18,8 @@ class QdrantService:
 
     def create_collection(self, name: str, vector_size: int, distance: str = "Cosine", on_disk_payload: bool = True) -> QdrantCollection:
         """Create a new collection in Qdrant."""
+        from qdrant_client.http.models import Distance, VectorParams
+        
         try:
             self.client.create_collection(
                 collection_name=name,
@@ -56,6 +57,16 @@ class QdrantService:
             self.logger.error(f"Error deleting collection: {str(e)}")
             raise HTTPException(status_code=500, detail=f"Failed to delete collection: {str(e)}")
 
+    def resolve_collection(self, name: str) -> str:
+        """Return the collection an alias currently points to (other names unchanged)."""
+        from .collection_versions import resolve_collection
+
+        try:
+            return resolve_collection(self.client, name)
+        except Exception as e:
+            self.logger.error(f"Error resolving collection alias: {str(e)}")
+            raise HTTPException(status_code=500, detail=f"Failed to resolve collection: {str(e)}")
+
     def list_collections(self) -> List[QdrantCollection]:
         """List all collections in Qdrant."""
         try:
@@ -74,6 +85,8 @@ class QdrantService:
 
     def upsert_points(self, collection_name: str, points: List[Dict[str, Any]]) -> List[QdrantPoint]:
         """Upsert points into a collection."""
+        from qdrant_client.http.models import PointStruct
+        
         try:
             collection = self.get_collection(collection_name)
             if not collection:
@@ -141,6 +154,8 @@ class QdrantService:
 
     def delete_points(self, collection_name: str, point_ids: List[str]) -> bool:
         """Delete points from a collection by IDs."""
+        from qdrant_client.http import models
+        
         try:
             # Delete points from Qdrant
             self.client.delete(
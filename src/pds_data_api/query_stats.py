@@ -0,0 +1,66 @@
+import logging
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+class QueryCounter:
+    def __init__(self, record_statements: bool = False):
+        """Count SQL statements executed in the current context."""
+        self.count = 0
+        self.record_statements = record_statements
+        self.statements: List[str] = []
+
+    def record(self, statement: str):
+        self.count += 1
+        if self.record_statements:
+            self.statements.append(statement)
+
+_current_counter: ContextVar[Optional[QueryCounter]] = ContextVar("query_counter", default=None)
+_instrumented_engines = set()
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    counter = _current_counter.get()
+    if counter is not None:
+        counter.record(statement)
+
+def install_query_counter(engine: Engine):
+    """Attach the statement counter to an engine (pass ``async_engine.sync_engine`` for async engines)."""
+    if id(engine) in _instrumented_engines:
+        return
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    _instrumented_engines.add(id(engine))
+
+def start_query_count(record_statements: bool = False) -> QueryCounter:
+    """Start counting queries for the current context and return the counter."""
+    counter = QueryCounter(record_statements)
+    _current_counter.set(counter)
+    return counter
+
+def current_query_count() -> Optional[int]:
+    """Return the number of queries counted so far in this context, if counting."""
+    counter = _current_counter.get()
+    return counter.count if counter is not None else None
+
+@contextmanager
+def count_queries(record_statements: bool = True):
+    """Count the queries executed inside the block."""
+    counter = QueryCounter(record_statements)
+    token = _current_counter.set(counter)
+    try:
+        yield counter
+    finally:
+        _current_counter.reset(token)
+
+@contextmanager
+def assert_max_queries(limit: int):
+    """Fail with AssertionError if the block runs more than ``limit`` queries."""
+    with count_queries() as counter:
+        yield counter
+    if counter.count > limit:
+        statements = "\n".join(counter.statements)
+        raise AssertionError(f"Expected at most {limit} queries, got {counter.count}:\n{statements}")
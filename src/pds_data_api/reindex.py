@@ -0,0 +1,203 @@
+"""Re-embed a Qdrant collection from its stored payloads (``pds-reindex``).
+
+Every point written by ``PDSSyncService`` carries ``original_data`` and the
+embedded ``text`` in its payload, so a new embedding model, text template or
+set of collection parameters does not need another PDS extraction.
+``ReindexJob`` scrolls the source collection (payloads only), re-embeds the
+texts in batches of ``REINDEX_BATCH_SIZE`` with ``REINDEX_CONCURRENCY``
+requests in flight, and upserts the points under their existing ids into a
+new collection. The source collection is left untouched. Example:
+
+    pds-reindex --qdrant-host localhost --source my_table --target my_table_v2 \\
+        --model text-embedding-3-large --concurrency 8
+"""
+import argparse
+import json
+import logging
+import sys
+import time
+from concurrent.futures import ALL_COMPLETED, FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from .collection_versions import resolve_collection
+from .config import EXPORT_PAGE_SIZE, REINDEX_BATCH_SIZE, REINDEX_CONCURRENCY
+from .embedding_client import EmbeddingClientProvider, get_embedding_provider
+
+logger = logging.getLogger(__name__)
+
+class _BlankMissing(dict):
+    def __missing__(self, key):
+        return ""
+
+def render_text(payload: Dict[str, Any], text_template: Optional[str] = None) -> str:
+    """Text to embed for a stored point: the template applied to ``original_data``, else the stored text."""
+    if text_template:
+        return text_template.format_map(_BlankMissing(payload.get("original_data") or {}))
+    return payload.get("text") or ""
+
+class ReindexJob:
+    def __init__(self, client, source_collection: str, target_collection: str,
+                 embedding_provider: EmbeddingClientProvider = None, text_template: str = None,
+                 distance: str = "Cosine", on_disk_payload: bool = True,
+                 batch_size: int = None, concurrency: int = None, page_size: int = None):
+        """Prepare a re-index of ``source_collection`` into ``target_collection`` on the same server."""
+        if source_collection == target_collection:
+            raise ValueError("The target collection must differ from the source collection")
+        self.client = client
+        self.source_collection = source_collection
+        self.target_collection = target_collection
+        self.embedding_provider = embedding_provider or get_embedding_provider()
+        self.text_template = text_template
+        self.distance = distance
+        self.on_disk_payload = on_disk_payload
+        self.batch_size = batch_size or REINDEX_BATCH_SIZE
+        self.concurrency = concurrency or REINDEX_CONCURRENCY
+        self.page_size = page_size or EXPORT_PAGE_SIZE
+        self.points = 0
+        self.tokens = 0
+        self._collection_ready = False
+
+    def _ensure_target(self, vector_size: int):
+        from qdrant_client.http import models
+
+        if self._collection_ready:
+            return
+        self.client.create_collection(
+            collection_name=self.target_collection,
+            vectors_config=models.VectorParams(size=vector_size, distance=models.Distance[self.distance.upper()]),
+            on_disk_payload=self.on_disk_payload
+        )
+        self._collection_ready = True
+        logger.info("Created collection '%s' (%d dimensions)", self.target_collection, vector_size)
+
+    def _embed(self, points) -> tuple:
+        texts = [render_text(point.payload or {}, self.text_template) for point in points]
+        embeddings, tokens = self.embedding_provider.embed_with_usage(texts)
+        return points, texts, embeddings, tokens
+
+    def _write(self, points, texts, embeddings):
+        from qdrant_client.http import models
+
+        reindexed_at = datetime.now().isoformat()
+        self._ensure_target(len(embeddings[0]))
+        self.client.upsert(
+            collection_name=self.target_collection,
+            points=[
+                models.PointStruct(
+                    id=point.id,
+                    vector=embedding,
+                    payload={**(point.payload or {}), "text": text,
+                             "embedding_model": self.embedding_provider.model, "reindex_timestamp": reindexed_at}
+                )
+                for point, text, embedding in zip(points, texts, embeddings)
+            ]
+        )
+        self.points += len(points)
+
+    def _batches(self):
+        offset = None
+        while True:
+            points, offset = self.client.scroll(
+                collection_name=self.source_collection,
+                limit=self.page_size,
+                offset=offset,
+                with_payload=True,
+                with_vectors=False
+            )
+            for start in range(0, len(points), self.batch_size):
+                yield points[start:start + self.batch_size]
+            if offset is None:
+                break
+
+    def run(self) -> Dict[str, Any]:
+        """Re-embed every point and return counts and throughput."""
+        # A rebuilt table's collection name is an alias; read the version it points to
+        self.source_collection = resolve_collection(self.client, self.source_collection)
+        existing = {collection.name for collection in self.client.get_collections().collections}
+        if self.source_collection not in existing:
+            raise ValueError(f"Source collection '{self.source_collection}' does not exist")
+        if self.target_collection in existing:
+            raise ValueError(f"Target collection '{self.target_collection}' already exists")
+
+        started = time.perf_counter()
+        # Embedding requests run concurrently; results are written from this thread as they complete
+        with ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="reindex") as executor:
+            pending = set()
+            for batch in self._batches():
+                pending.add(executor.submit(self._embed, batch))
+                if len(pending) >= self.concurrency * 2:
+                    pending = self._drain(pending, FIRST_COMPLETED)
+            self._drain(pending, ALL_COMPLETED)
+
+        elapsed = time.perf_counter() - started
+        result = {
+            "status": "success",
+            "source_collection": self.source_collection,
+            "target_collection": self.target_collection,
+            "model": self.embedding_provider.model,
+            "points": self.points,
+            "embedding_tokens": self.tokens,
+            "elapsed_s": round(elapsed, 3),
+            "points_per_sec": round(self.points / elapsed, 1) if elapsed else 0.0,
+        }
+        logger.info("Re-indexed %s into %s: %s", self.source_collection, self.target_collection, result)
+        return result
+
+    def _drain(self, pending, return_when) -> set:
+        done, pending = wait(pending, return_when=return_when)
+        for future in done:
+            points, texts, embeddings, tokens = future.result()
+            self.tokens += tokens
+            if points:
+                self._write(points, texts, embeddings)
+        return pending
+
+def reindex_table(table_id, target_collection: str, model: str = None, **options) -> Dict[str, Any]:
+    """Re-index the Qdrant collection a PDS table syncs to into ``target_collection``."""
+    from .pds_sync_service import PDSSyncService
+
+    service = PDSSyncService(table_id)
+    if service.qdrant_client is None:
+        raise ValueError("Re-indexing needs a Qdrant destination")
+    provider = EmbeddingClientProvider(model=model) if model else get_embedding_provider()
+    try:
+        return ReindexJob(service.qdrant_client, service.table.table_name.lower(), target_collection,
+                          embedding_provider=provider, **options).run()
+    finally:
+        if model:
+            provider.close()
+        service.qdrant_client.close()
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(prog="pds-reindex", description=__doc__.splitlines()[0])
+    parser.add_argument("--qdrant-host", default="localhost")
+    parser.add_argument("--qdrant-port", type=int, default=6333)
+    parser.add_argument("--source", required=True, help="Collection to read payloads from")
+    parser.add_argument("--target", required=True, help="New collection to write to")
+    parser.add_argument("--model", help="Embedding model (default OPENAI_EMBEDDING_MODEL)")
+    parser.add_argument("--text-template", help="Format string over original_data, e.g. '{NAME} | {STATUS}'")
+    parser.add_argument("--distance", default="Cosine", choices=["Cosine", "Dot", "Euclid"])
+    parser.add_argument("--batch-size", type=int, help=f"Texts per embedding request (default {REINDEX_BATCH_SIZE})")
+    parser.add_argument("--concurrency", type=int, help=f"Embedding requests in flight (default {REINDEX_CONCURRENCY})")
+    return parser.parse_args(argv)
+
+def main(argv: Optional[List[str]] = None) -> int:
+    from qdrant_client import QdrantClient
+
+    args = parse_args(argv)
+    client = QdrantClient(host=args.qdrant_host, port=args.qdrant_port, timeout=300)
+    provider = EmbeddingClientProvider(model=args.model)
+    try:
+        result = ReindexJob(
+            client, args.source, args.target, embedding_provider=provider, text_template=args.text_template,
+            distance=args.distance, batch_size=args.batch_size, concurrency=args.concurrency
+        ).run()
+    finally:
+        provider.close()
+        client.close()
+    print(json.dumps(result, indent=2))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,147 @@
+"""Full refresh of a SQL destination table through a shadow table.
+
+Instead of upserting row by row, ``ShadowTableRefresh`` creates an empty
+copy of the destination table without its primary key, bulk-loads every page
+with binary ``COPY`` (typed values, see ``typed_columns``), and only then removes rows without a key, keeps the last
+occurrence of duplicate keys, builds the primary key and the live table's
+other indexes and runs ``ANALYZE``. ``swap`` renames the shadow table over
+the live one in a single transaction, so readers see either the old or the
+new contents, never a partial load. A failed load rolls back with its shadow
+table; ``drop`` cleans up after a failed swap.
+"""
+import logging
+import re
+import uuid
+from typing import Any, Dict, Iterable, List, Sequence, Tuple
+
+from sqlalchemy import text
+
+from .config import SQL_REFRESH_MAINTENANCE_WORK_MEM, SQL_SWAP_LOCK_TIMEOUT_MS
+from .typed_columns import PageConverter, copy_rows, count_by_type, destination_columns, quarantine, quote as _quote
+
+logger = logging.getLogger(__name__)
+
+# Postgres truncates identifiers to 63 bytes; leave room for the suffixes
+_NAME_PREFIX_LENGTH = 40
+
+class ShadowTableRefresh:
+    def __init__(self, engine, table_name: str, column_definitions: Sequence[str],
+                 columns: Sequence[Tuple[str, str]], primary_key_columns: Sequence[str], sync_guid=None):
+        """Prepare a refresh of ``table_name``.
+
+        ``column_definitions`` are the ``"name" TYPE`` clauses of the table and
+        ``columns`` its (name, data_type) pairs; values that fail conversion
+        are quarantined under ``sync_guid``.
+        """
+        self.engine = engine
+        self.table_name = table_name
+        self.column_definitions = list(column_definitions)
+        self.columns = list(columns)
+        self.primary_key_columns = list(primary_key_columns)
+        self.sync_guid = sync_guid
+        suffix = uuid.uuid4().hex[:8]
+        self.shadow_name = f"{table_name[:_NAME_PREFIX_LENGTH]}__refresh_{suffix}"
+        self.retired_name = f"{table_name[:_NAME_PREFIX_LENGTH]}__retired_{suffix}"
+        self._index_names: Dict[str, str] = {}
+        self.rows = 0
+        self.rejected: Dict[str, int] = {}  # quarantined values per data type
+
+    def load(self, pages: Iterable[List[Dict[str, Any]]]) -> int:
+        """Create and fill the shadow table, then build its keys and indexes; returns the rows kept."""
+        shadow = _quote(self.shadow_name)
+        # One transaction: a table created in the loading transaction lets Postgres skip WAL for
+        # COPY (wal_level=minimal), and a failure rolls the shadow table back with it
+        with self.engine.connect() as conn:
+            # Index builds on a large table can outlast the pool's statement_timeout
+            conn.execute(text("SET LOCAL statement_timeout = 0"))
+            conn.execute(text(f"SET LOCAL maintenance_work_mem = '{SQL_REFRESH_MAINTENANCE_WORK_MEM}'"))
+            conn.execute(text(f"CREATE TABLE {shadow} ({', '.join(self.column_definitions)})"))
+            logger.info("Loading shadow table %s for %s", self.shadow_name, self.table_name)
+
+            converter = PageConverter(self.columns, self.primary_key_columns,
+                                      destination_columns(conn, self.shadow_name))
+            for items in pages:
+                rows, rejects = converter.convert(items)
+                copy_rows(conn, self.shadow_name, converter.column_names, rows)
+                quarantine(conn, self.table_name, self.sync_guid, rejects)
+                count_by_type(rejects, self.rejected)
+
+            if self.primary_key_columns:
+                self._build_primary_key(conn)
+            self._copy_indexes(conn)
+            conn.execute(text(f"ANALYZE {shadow}"))
+            self.rows = conn.execute(text(f"SELECT COUNT(*) FROM {shadow}")).scalar()
+            conn.commit()
+        logger.info("Shadow table %s ready with %d rows", self.shadow_name, self.rows)
+        return self.rows
+
+    def _build_primary_key(self, conn):
+        shadow = _quote(self.shadow_name)
+        keys = [_quote(c) for c in self.primary_key_columns]
+        conn.execute(text(f"DELETE FROM {shadow} WHERE {' OR '.join(f'{k} IS NULL' for k in keys)}"))
+        # Rows were appended in extraction order, so the highest ctid is the latest version of a key
+        conn.execute(text(
+            f"DELETE FROM {shadow} a USING {shadow} b "
+            f"WHERE a.ctid < b.ctid AND {' AND '.join(f'a.{k} = b.{k}' for k in keys)}"
+        ))
+        conn.execute(text(f"ALTER TABLE {shadow} ADD PRIMARY KEY ({', '.join(keys)})"))
+
+    def _copy_indexes(self, conn):
+        """Recreate the live table's secondary indexes on the shadow table under temporary names."""
+        definitions = conn.execute(text(
+            "SELECT c.relname, pg_get_indexdef(i.indexrelid) FROM pg_index i "
+            "JOIN pg_class c ON c.oid = i.indexrelid "
+            "WHERE i.indrelid = to_regclass(:table) AND NOT i.indisprimary"
+        ), {"table": _quote(self.table_name)}).all()
+        for number, (name, definition) in enumerate(definitions, start=1):
+            temporary = f"{self.shadow_name}_i{number}"
+            statement, count = re.subn(
+                r"^CREATE (UNIQUE )?INDEX \S+ ON (ONLY )?\S+ ",
+                lambda match: f"CREATE {match.group(1) or ''}INDEX {_quote(temporary)} ON {_quote(self.shadow_name)} ",
+                definition
+            )
+            if not count:
+                logger.warning("Not copying index %s with unexpected definition: %s", name, definition)
+                continue
+            conn.execute(text(statement))
+            self._index_names[temporary] = name
+
+    def swap(self):
+        """Replace the live table with the shadow table in one transaction and drop the old table."""
+        constraints = {}
+        if self.primary_key_columns:
+            constraints[self.shadow_name + "_pkey"] = self.table_name[:58] + "_pkey"
+        swap_table(self.engine, self.table_name, self.shadow_name, self.retired_name, constraints, self._index_names)
+        logger.info("Swapped refreshed table %s into place (%d rows)", self.table_name, self.rows)
+
+    def drop(self):
+        """Remove the shadow table of a failed refresh."""
+        try:
+            with self.engine.connect() as conn:
+                conn.execute(text(f"DROP TABLE IF EXISTS {_quote(self.shadow_name)}"))
+                conn.commit()
+        except Exception as e:
+            logger.warning("Could not drop shadow table %s: %s", self.shadow_name, e)
+
+def swap_table(engine, table_name: str, shadow_name: str, retired_name: str,
+               constraint_names: Dict[str, str] = None, index_names: Dict[str, str] = None):
+    """Rename ``shadow_name`` over ``table_name`` in one transaction and drop the previous table.
+
+    ``constraint_names`` and ``index_names`` map the shadow table's temporary
+    names to the names the old table used, which are free once it is dropped.
+    """
+    shadow, live, retired = _quote(shadow_name), _quote(table_name), _quote(retired_name)
+    with engine.connect() as conn:
+        # Give up rather than queue every reader behind our exclusive lock
+        conn.execute(text(f"SET LOCAL lock_timeout = {int(SQL_SWAP_LOCK_TIMEOUT_MS)}"))
+        exists = conn.execute(text("SELECT to_regclass(:table) IS NOT NULL"), {"table": live}).scalar()
+        if exists:
+            conn.execute(text(f"ALTER TABLE {live} RENAME TO {retired}"))
+        conn.execute(text(f"ALTER TABLE {shadow} RENAME TO {live}"))
+        if exists:
+            conn.execute(text(f"DROP TABLE {retired}"))
+        for temporary, name in (constraint_names or {}).items():
+            conn.execute(text(f"ALTER TABLE {live} RENAME CONSTRAINT {_quote(temporary)} TO {_quote(name)}"))
+        for temporary, name in (index_names or {}).items():
+            conn.execute(text(f"ALTER INDEX {_quote(temporary)} RENAME TO {_quote(name)}"))
+        conn.commit()
@@ -0,0 +1,125 @@
+"""Staging area for extracted PDS pages.
+
+A staged sync writes every PDS page it fetches to
+``STAGING_DIR/<table id>/<sync guid>/page-NNNNN.<ext>`` before handing it to
+the destination, and a ``manifest.json`` once the extraction is complete.
+A later run can then replay a complete staged run instead of calling PDS
+again, e.g. to retry a failed destination step or re-index into a new
+collection.
+
+Pages are columnar Parquet files when pyarrow is installed, falling back to
+gzipped NDJSON; readers accept either. After each staged run,
+``prune_staged_runs`` keeps the newest ``STAGING_KEEP_RUNS`` complete runs
+of the table and removes anything older than ``STAGING_MAX_AGE_DAYS``.
+"""
+import gzip
+import importlib.util
+import json
+import logging
+import os
+import shutil
+import time
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional
+
+from .config import STAGING_DIR, STAGING_KEEP_RUNS, STAGING_MAX_AGE_DAYS
+
+logger = logging.getLogger(__name__)
+
+MANIFEST = "manifest.json"
+
+def run_directory(table_id, sync_guid, base_dir: str = None) -> str:
+    return os.path.join(base_dir or STAGING_DIR, str(table_id), str(sync_guid))
+
+class PageStager:
+    def __init__(self, directory: str):
+        """Write the pages of one sync run into ``directory``."""
+        self.directory = directory
+        self.use_parquet = importlib.util.find_spec("pyarrow") is not None
+        self.pages = 0
+        self.rows = 0
+        os.makedirs(directory, exist_ok=True)
+
+    def write(self, items: List[Dict[str, Any]]):
+        """Stage one PDS page."""
+        self.pages += 1
+        self.rows += len(items)
+        name = os.path.join(self.directory, f"page-{self.pages:05d}")
+        if self.use_parquet:
+            self._write_parquet(name + ".parquet", items)
+        else:
+            with gzip.open(name + ".ndjson.gz", "wt", encoding="utf-8") as f:
+                for item in items:
+                    f.write(json.dumps(item, default=str) + "\n")
+
+    @staticmethod
+    def _write_parquet(path: str, items: List[Dict[str, Any]]):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        # Every key of the page, not just the first row's; rows without a key get null
+        columns = {}
+        for key in dict.fromkeys(key for item in items for key in item):
+            values = [item.get(key) for item in items]
+            try:
+                columns[key] = pa.array(values)
+            except (pa.ArrowInvalid, pa.ArrowTypeError):
+                # Mixed value types within a column; keep it as text rather than fail the sync
+                columns[key] = pa.array([str(value) if value is not None else None for value in values])
+        pq.write_table(pa.Table.from_pydict(columns), path)
+
+    def finish(self, **details):
+        """Mark the run complete; only complete runs can be replayed."""
+        manifest = {"pages": self.pages, "rows": self.rows, "completed_at": datetime.now().isoformat(), **details}
+        with open(os.path.join(self.directory, MANIFEST), "w") as f:
+            json.dump(manifest, f, default=str)
+
+def read_manifest(directory: str) -> Optional[Dict[str, Any]]:
+    """Return the manifest of a complete staged run, or None."""
+    try:
+        with open(os.path.join(directory, MANIFEST)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def iter_staged_pages(directory: str) -> Iterator[List[Dict[str, Any]]]:
+    """Yield the pages of a complete staged run in extraction order."""
+    if read_manifest(directory) is None:
+        raise ValueError(f"No complete staged run in {directory}")
+    for name in sorted(os.listdir(directory)):
+        path = os.path.join(directory, name)
+        if name.endswith(".parquet"):
+            import pyarrow.parquet as pq
+            yield pq.read_table(path).to_pylist()
+        elif name.endswith(".ndjson.gz"):
+            with gzip.open(path, "rt", encoding="utf-8") as f:
+                yield [json.loads(line) for line in f]
+
+def prune_staged_runs(table_id, keep: int = None, max_age_days: float = None, base_dir: str = None) -> List[str]:
+    """Apply the retention policy to a table's staged runs and return the removed directories.
+
+    Incomplete runs are only removed once they are past the age limit, since
+    they may belong to a sync that is still running.
+    """
+    keep = STAGING_KEEP_RUNS if keep is None else keep
+    max_age_days = STAGING_MAX_AGE_DAYS if max_age_days is None else max_age_days
+    table_dir = os.path.join(base_dir or STAGING_DIR, str(table_id))
+    if not os.path.isdir(table_dir):
+        return []
+
+    cutoff = time.time() - max_age_days * 86400
+    runs = sorted(
+        (os.path.join(table_dir, name) for name in os.listdir(table_dir)),
+        key=os.path.getmtime,
+        reverse=True
+    )
+    complete = [run for run in runs if read_manifest(run) is not None]
+    removed = []
+    for run in runs:
+        expired = os.path.getmtime(run) < cutoff
+        if expired or (run in complete and complete.index(run) >= keep):
+            shutil.rmtree(run, ignore_errors=True)
+            removed.append(run)
+    if removed:
+        logger.info("Removed %d staged runs of table %s", len(removed), table_id)
+    return removed
@@ -0,0 +1,59 @@
+import time
+from contextlib import contextmanager
+from typing import Any, Dict
+
+# Stages timed during a sync, mapped to the SyncHistory column holding their wall time
+STAGE_COLUMNS = {
+    "pds": "pds_seconds",
+    "embedding": "embedding_seconds",
+    "qdrant": "qdrant_seconds",
+    "sql": "sql_seconds",
+}
+
+class SyncStats:
+    def __init__(self):
+        """Accumulate per-stage wall time and counters for one sync run."""
+        self.seconds = {stage: 0.0 for stage in STAGE_COLUMNS}
+        self.calls = {stage: 0 for stage in STAGE_COLUMNS}
+        self.pages = 0
+        self.bytes_fetched = 0
+        self.rows_fetched = 0
+        self.rows_embedded = 0
+        self.rows_written = 0
+        self.embedding_tokens = 0
+        self.cache_hits = 0
+        self.retries = 0
+
+    @contextmanager
+    def stage(self, name: str):
+        """Add the wall time of the block to ``name``'s total and count the call."""
+        self.calls[name] += 1
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.seconds[name] += time.perf_counter() - started
+
+    def merge(self, other: "SyncStats"):
+        """Add another run's totals to these (e.g. an extraction counted on another thread)."""
+        for stage in STAGE_COLUMNS:
+            self.seconds[stage] += other.seconds[stage]
+            self.calls[stage] += other.calls[stage]
+        for counter in ("pages", "bytes_fetched", "rows_fetched", "rows_embedded", "rows_written",
+                        "embedding_tokens", "cache_hits", "retries"):
+            setattr(self, counter, getattr(self, counter) + getattr(other, counter))
+
+    def as_columns(self) -> Dict[str, Any]:
+        """Return the totals keyed by SyncHistory column name."""
+        values = {column: round(self.seconds[stage], 3) for stage, column in STAGE_COLUMNS.items()}
+        values.update(
+            pages_fetched=self.pages,
+            bytes_fetched=self.bytes_fetched,
+            rows_fetched=self.rows_fetched,
+            rows_embedded=self.rows_embedded,
+            rows_written=self.rows_written,
+            embedding_tokens=self.embedding_tokens,
+            cache_hits=self.cache_hits,
+            retries=self.retries,
+        )
+        return values
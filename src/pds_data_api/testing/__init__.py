@@ -0,0 +1,25 @@
+"""Offline stand-ins for the services a sync talks to.
+
+Used by the benchmarks to run ``PDSSyncService`` end to end on one machine
+with no network access:
+
+- ``FakePDSServer``: Unifier PDS ``runquery`` with ``nextKey`` pagination,
+  synthetic rows, latency and throttling.
+- ``FakeEmbeddingServer``: deterministic OpenAI-compatible ``/v1/embeddings``.
+- ``OfflineSyncEnvironment``: starts both, seeds an in-memory metadata DB and
+  uses qdrant-client's in-memory mode for Qdrant destinations.
+"""
+from .fake_embeddings import FakeEmbeddingServer, fake_embedding
+from .fake_pds import FakePDSServer, synthetic_columns, synthetic_value
+from .environment import OfflineSyncEnvironment, create_metadata_session_factory, seed_sync_table
+
+__all__ = [
+    "FakeEmbeddingServer",
+    "FakePDSServer",
+    "OfflineSyncEnvironment",
+    "create_metadata_session_factory",
+    "fake_embedding",
+    "seed_sync_table",
+    "synthetic_columns",
+    "synthetic_value",
+]
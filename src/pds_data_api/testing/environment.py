@@ -0,0 +1,150 @@
+import json
+import os
+import tempfile
+import uuid
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from ..embedding_client import configure_embedding_provider
+from ..models import Config, Connection, ConnectionOptions, SyncHistory, TableColumn, TableDestination
+from .fake_embeddings import FakeEmbeddingServer
+from .fake_pds import FakePDSServer, synthetic_columns
+
+# Metadata tables PDSSyncService reads and writes; created in the harness database
+METADATA_TABLES = [ConnectionOptions.__table__, Connection.__table__, Config.__table__,
+                   TableColumn.__table__, SyncHistory.__table__, TableDestination.__table__]
+
+CONNECTION_TYPES = ['PDS', 'PostgreSQL', 'Oracle', 'Qdrant', 'PostgreSQL+pgvector']
+
+def create_metadata_session_factory(database_url: str = "sqlite://") -> sessionmaker:
+    """Create a session factory for a throwaway metadata DB (in-memory SQLite by default)."""
+    if database_url.startswith("sqlite"):
+        engine = create_engine(database_url, connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    else:
+        engine = create_engine(database_url, pool_pre_ping=True)
+    for table in METADATA_TABLES:
+        table.create(engine, checkfirst=True)
+    return sessionmaker(bind=engine)
+
+def seed_sync_table(session_factory: sessionmaker, pds_url: str, destination_type: str,
+                    destination_config: Dict[str, Any], table_name: str = "BENCH_RECORDS",
+                    columns: Optional[List[Tuple[str, str]]] = None, page_size: int = 1000,
+                    batch_size: int = 100) -> uuid.UUID:
+    """Insert connections, a table config and its columns; return the table id.
+
+    The first column is the primary key. ``destination_type`` is one of the
+    connection type names (``"Qdrant"``, ``"PostgreSQL"``).
+    """
+    columns = columns or synthetic_columns(6)
+    with session_factory() as session:
+        types = {option.name: option for option in session.query(ConnectionOptions).all()}
+        for name in CONNECTION_TYPES:
+            if name not in types:
+                types[name] = ConnectionOptions(name=name)
+                session.add(types[name])
+
+        source = Connection(
+            connection_name="Fake PDS",
+            connection_config=json.dumps({"url": pds_url, "username": "bench", "password": "bench"}).encode(),
+            connection_type=types["PDS"],
+            direction=True
+        )
+        destination = Connection(
+            connection_name=f"Bench {destination_type}",
+            connection_config=json.dumps(destination_config).encode(),
+            connection_type=types[destination_type],
+            direction=False
+        )
+        table = Config(
+            config_name=table_name,
+            table_name=table_name,
+            source_connection=source,
+            destination_connection=destination,
+            page_size=page_size,
+            qdrant_batch_size=batch_size
+        )
+        session.add_all([source, destination, table])
+        session.flush()
+        for position, (name, data_type) in enumerate(columns):
+            session.add(TableColumn(
+                pds_table_id=table.id,
+                column_name=name,
+                data_type=data_type,
+                active=True,
+                is_primary_key=position == 0
+            ))
+        session.commit()
+        return table.id
+
+class OfflineSyncEnvironment:
+    """Everything ``PDSSyncService`` needs, running on localhost with no network.
+
+    Starts a ``FakePDSServer`` and a ``FakeEmbeddingServer``, writes a throwaway
+    secrets file with a dummy OpenAI key, points the shared embedding provider
+    at the fake server and creates an in-memory metadata DB. Use
+    ``add_table`` to register tables, then run
+    ``PDSSyncService(table_id, session_factory=env.session_factory)``.
+    Qdrant destinations default to qdrant-client's in-memory mode.
+    """
+
+    def __init__(self, rows: int = 10000, pds_options: Dict[str, Any] = None,
+                 embedding_options: Dict[str, Any] = None, database_url: str = "sqlite://"):
+        self.pds = FakePDSServer(rows=rows, **(pds_options or {}))
+        self.embeddings = FakeEmbeddingServer(**(embedding_options or {}))
+        self.database_url = database_url
+        self.session_factory: Optional[sessionmaker] = None
+        self._secrets_dir: Optional[tempfile.TemporaryDirectory] = None
+        self._previous_secrets_path: Optional[str] = None
+
+    def start(self):
+        self.pds.start()
+        self.embeddings.start()
+
+        self._secrets_dir = tempfile.TemporaryDirectory(prefix="pds-offline-")
+        secrets_path = os.path.join(self._secrets_dir.name, "secrets.json")
+        with open(secrets_path, "w") as f:
+            json.dump({"openai_api_key": "sk-offline-harness"}, f)
+        self._previous_secrets_path = os.environ.get("SECRETS_PATH")
+        os.environ["SECRETS_PATH"] = secrets_path
+
+        # Plain HTTP/1.1 to the local fake; the real client settings are untouched otherwise
+        configure_embedding_provider(base_url=self.embeddings.base_url, http2=False)
+        self.session_factory = create_metadata_session_factory(self.database_url)
+        return self
+
+    def add_table(self, destination_type: str = "Qdrant", destination_config: Dict[str, Any] = None,
+                  **kwargs) -> uuid.UUID:
+        """Register a table synced from the fake PDS; see ``seed_sync_table`` for options."""
+        if destination_config is None:
+            if destination_type != "Qdrant":
+                raise ValueError(f"destination_config is required for {destination_type} destinations")
+            destination_config = {"host": ":memory:"}
+        columns = kwargs.get("columns")
+        if columns:
+            self.pds.column_types.update(dict(columns))
+        return seed_sync_table(self.session_factory, self.pds.url, destination_type, destination_config, **kwargs)
+
+    def stop(self):
+        self.pds.stop()
+        self.embeddings.stop()
+        configure_embedding_provider()
+        if self._previous_secrets_path is None:
+            os.environ.pop("SECRETS_PATH", None)
+        else:
+            os.environ["SECRETS_PATH"] = self._previous_secrets_path
+        if self._secrets_dir is not None:
+            self._secrets_dir.cleanup()
+            self._secrets_dir = None
+        if self.session_factory is not None:
+            self.session_factory.kw["bind"].dispose()
+            self.session_factory = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+        return False
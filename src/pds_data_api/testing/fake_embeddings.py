@@ -0,0 +1,78 @@
+import base64
+import hashlib
+import math
+import random
+import struct
+import threading
+import time
+from typing import Any, Dict, List
+
+from .server import BackgroundJSONServer
+
+EMBEDDINGS_PATH = "/v1/embeddings"
+
+def fake_embedding(text: str, dimensions: int = 1536) -> List[float]:
+    """Deterministic unit vector for ``text``: the same text always maps to the same vector."""
+    seed = int.from_bytes(hashlib.blake2b(text.encode("utf-8"), digest_size=8).digest(), "little")
+    rng = random.Random(seed)
+    vector = [rng.uniform(-1.0, 1.0) for _ in range(dimensions)]
+    norm = math.sqrt(sum(v * v for v in vector)) or 1.0
+    return [v / norm for v in vector]
+
+def count_tokens(text: str) -> int:
+    """Rough token count (about four characters per token, like English text with tiktoken)."""
+    return max(1, len(text) // 4)
+
+class FakeEmbeddingServer(BackgroundJSONServer):
+    """Stand-in for the OpenAI ``/v1/embeddings`` endpoint.
+
+    Returns ``fake_embedding`` vectors in the OpenAI response shape, including
+    ``usage`` and the base64 ``encoding_format`` the Python client requests when
+    numpy is installed. ``latency`` is added per request and
+    ``latency_per_input`` per text. Point the client at ``base_url``.
+    """
+
+    def __init__(self, dimensions: int = 1536, latency: float = 0.0, latency_per_input: float = 0.0, **kwargs):
+        super().__init__(**kwargs)
+        self.dimensions = dimensions
+        self.latency = latency
+        self.latency_per_input = latency_per_input
+        self.inputs = 0
+        self.tokens = 0
+        self._counter_lock = threading.Lock()
+
+    @property
+    def base_url(self) -> str:
+        return f"{self.url}/v1"
+
+    def handle(self, method: str, path: str, payload: Dict[str, Any], headers):
+        self.count_request()
+        if path.split("?", 1)[0] != EMBEDDINGS_PATH or method != "POST":
+            return 404, {"error": {"message": f"Unknown route {method} {path}"}}, {}
+
+        texts = payload.get("input") or []
+        if isinstance(texts, str):
+            texts = [texts]
+        if self.latency or self.latency_per_input:
+            time.sleep(self.latency + self.latency_per_input * len(texts))
+
+        as_base64 = payload.get("encoding_format") == "base64"
+        dimensions = int(payload.get("dimensions") or self.dimensions)
+        data = []
+        tokens = 0
+        for index, text in enumerate(texts):
+            vector = fake_embedding(text, dimensions)
+            if as_base64:
+                vector = base64.b64encode(struct.pack(f"<{dimensions}f", *vector)).decode("ascii")
+            data.append({"object": "embedding", "index": index, "embedding": vector})
+            tokens += count_tokens(text)
+
+        with self._counter_lock:
+            self.inputs += len(texts)
+            self.tokens += tokens
+        return 200, {
+            "object": "list",
+            "data": data,
+            "model": payload.get("model", "text-embedding-3-small"),
+            "usage": {"prompt_tokens": tokens, "total_tokens": tokens},
+        }, {}
@@ -0,0 +1,137 @@
+import threading
+import time
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+from .server import BackgroundJSONServer
+
+RUNQUERY_PATH = "/pds/rest-service/dataservice/runquery"
+METADATA_REFRESH_PATH = "/pds/rest-service/dataservice/metadata/refresh"
+
+# (column name, PDS data type) pairs used for synthetic tables; the first is the primary key
+DEFAULT_COLUMNS = [
+    ("RECORD_ID", "number"),
+    ("RECORD_NO", "string"),
+    ("TITLE", "string"),
+    ("STATUS", "string"),
+    ("AMOUNT", "number"),
+    ("DUE_DATE", "date"),
+    ("UPDATED_AT", "datetime"),
+    ("IS_ACTIVE", "boolean"),
+    ("DESCRIPTION", "string"),
+]
+
+STATUSES = ["Draft", "Pending", "Approved", "Rejected", "Closed"]
+_EPOCH = datetime(2024, 1, 1)
+
+def synthetic_columns(count: int) -> List[Tuple[str, str]]:
+    """Return ``count`` (name, data_type) columns, padding DEFAULT_COLUMNS with extra string attributes."""
+    columns = list(DEFAULT_COLUMNS[:count])
+    for i in range(len(columns), count):
+        columns.append((f"ATTRIBUTE_{i - len(DEFAULT_COLUMNS) + 1:02d}", "string"))
+    return columns
+
+def synthetic_value(index: int, column: str, data_type: str) -> Any:
+    """Deterministic value for row ``index`` of ``column``, so runs are reproducible."""
+    if column == "RECORD_ID":
+        return index + 1
+    if column == "RECORD_NO":
+        return f"REC-{index + 1:08d}"
+    if column == "STATUS":
+        return STATUSES[index % len(STATUSES)]
+    if column == "DESCRIPTION":
+        return f"Synthetic record {index + 1} for benchmarking the sync pipeline " * (1 + index % 3)
+    if data_type == "number":
+        return round((index * 7919 % 1000003) / 100.0, 2)
+    if data_type == "date":
+        return (date(2024, 1, 1) + timedelta(days=index % 730)).isoformat()
+    if data_type == "datetime":
+        return (_EPOCH + timedelta(minutes=index * 13)).isoformat()
+    if data_type == "boolean":
+        return index % 2 == 0
+    return f"{column.title()} {index % 977}"
+
+class FakePDSServer(BackgroundJSONServer):
+    """Stand-in for the Unifier PDS ``runquery`` service.
+
+    Serves ``rows`` synthetic rows for whatever table and columns the request
+    asks for, paginated by ``pageSize`` with the same ``data``/``pagination``
+    shape as PDS. Rows are generated on the fly, so millions of rows cost no
+    memory. ``latency`` (per page) and ``latency_per_row`` simulate a slow
+    backend; ``throttle_every=N`` answers every Nth request with 429, and
+    ``max_concurrent`` rejects requests beyond that many in flight.
+    """
+
+    def __init__(self, rows: int = 10000, column_types: Optional[Dict[str, str]] = None,
+                 latency: float = 0.0, latency_per_row: float = 0.0,
+                 throttle_every: int = 0, max_concurrent: int = 0, **kwargs):
+        super().__init__(**kwargs)
+        self.rows = rows
+        self.column_types = column_types or dict(DEFAULT_COLUMNS)
+        self.latency = latency
+        self.latency_per_row = latency_per_row
+        self.throttle_every = throttle_every
+        self.max_concurrent = max_concurrent
+        self.pages_served = 0
+        self.rows_served = 0
+        self.throttled = 0
+        self._in_flight = 0
+        self._flight_lock = threading.Lock()
+
+    def handle(self, method: str, path: str, payload: Dict[str, Any], headers):
+        count = self.count_request()
+        route = path.split("?", 1)[0]
+        if route == METADATA_REFRESH_PATH:
+            return 200, {"status": "success", "message": "Metadata refreshed"}, {}
+        if route != RUNQUERY_PATH or method != "POST":
+            return 404, {"error": f"Unknown route {method} {route}"}, {}
+
+        if self.throttle_every and count % self.throttle_every == 0:
+            return self._throttle()
+        with self._flight_lock:
+            if self.max_concurrent and self._in_flight >= self.max_concurrent:
+                self.throttled += 1
+                return 429, {"error": "Too many concurrent requests"}, {"Retry-After": "1"}
+            self._in_flight += 1
+        try:
+            return 200, self._page(payload), {}
+        finally:
+            with self._flight_lock:
+                self._in_flight -= 1
+
+    def _throttle(self):
+        with self._flight_lock:
+            self.throttled += 1
+        return 429, {"error": "Rate limit exceeded"}, {"Retry-After": "1"}
+
+    def _page(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        table = payload["tables"][0]
+        table_name = table["tableName"]
+        columns = table.get("columns") or list(self.column_types)
+        page_size = max(1, int(payload.get("pageSize") or 1000))
+        start = int(payload.get("nextKey") or 0)
+        end = min(start + page_size, self.rows)
+
+        if self.latency or self.latency_per_row:
+            time.sleep(self.latency + self.latency_per_row * (end - start))
+
+        types = [(column, self.column_types.get(column, "string")) for column in columns]
+        data = [
+            {column: synthetic_value(index, column, data_type) for column, data_type in types}
+            for index in range(start, end)
+        ]
+        with self._flight_lock:
+            self.pages_served += 1
+            self.rows_served += len(data)
+
+        more = end < self.rows
+        return {
+            "data": {table_name: data},
+            "pagination": [{
+                "tableName": table_name,
+                "nextTableName": table_name if more else "-1",
+                "nextKey": end if more else 0,
+                "pageSize": page_size,
+                "recordCount": len(data),
+            }],
+        }
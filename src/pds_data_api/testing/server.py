@@ -0,0 +1,96 @@
+import json
+import logging
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+class _JSONHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def _dispatch(self, method: str):
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length) if length else b""
+        try:
+            payload = json.loads(body) if body else {}
+        except json.JSONDecodeError:
+            self._send(400, {"error": "invalid JSON"})
+            return
+        status, response, headers = self.server.owner.handle(method, self.path, payload, self.headers)
+        self._send(status, response, headers)
+
+    def _send(self, status: int, response: Any, headers: Optional[Dict[str, str]] = None):
+        data = response if isinstance(response, bytes) else json.dumps(response, separators=(",", ":")).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+        self.server.owner.bytes_sent += len(data)
+
+    def do_GET(self):
+        self._dispatch("GET")
+
+    def do_POST(self):
+        self._dispatch("POST")
+
+    def log_message(self, format, *args):
+        logger.debug("%s - %s", self.address_string(), format % args)
+
+class BackgroundJSONServer:
+    """A JSON-over-HTTP server on 127.0.0.1 that runs in a daemon thread.
+
+    Subclasses implement ``handle(method, path, payload, headers)`` and return
+    ``(status, body, extra_headers)``. Use as a context manager or call
+    ``start()``/``stop()``.
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0):
+        self.host = host
+        self.port = port
+        self.requests = 0
+        self.bytes_sent = 0
+        self._lock = threading.Lock()
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    def handle(self, method: str, path: str, payload: Dict[str, Any], headers) -> Tuple[int, Any, Dict[str, str]]:
+        raise NotImplementedError
+
+    def count_request(self) -> int:
+        """Increment and return the request counter (thread-safe)."""
+        with self._lock:
+            self.requests += 1
+            return self.requests
+
+    def start(self):
+        self._server = ThreadingHTTPServer((self.host, self.port), _JSONHandler)
+        self._server.daemon_threads = True
+        self._server.owner = self
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(target=self._server.serve_forever, name=type(self).__name__, daemon=True)
+        self._thread.start()
+        logger.info("%s listening on %s", type(self).__name__, self.url)
+        return self
+
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._thread.join()
+            self._server = None
+            self._thread = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+        return False
@@ -0,0 +1,108 @@
+"""OpenTelemetry tracing for PDS Data API.
+
+Spans are always created through ``tracer``; they are no-ops until
+``setup_tracing`` installs an SDK provider, which only happens when
+``OTEL_EXPORTER`` is ``otlp``, ``file`` or ``console``. The SDK and exporters
+are imported lazily so the default (disabled) setup costs nothing at startup.
+"""
+import json
+import logging
+import threading
+from typing import Optional, Sequence
+
+from opentelemetry import trace
+from opentelemetry.context import Context
+from opentelemetry.trace import Link
+
+from . import config
+
+logger = logging.getLogger(__name__)
+
+tracer = trace.get_tracer("pds_data_api")
+
+_provider = None
+_lock = threading.Lock()
+
+class FileSpanExporter:
+    def __init__(self, path: str):
+        """Append finished spans to ``path`` as one JSON object per line, for offline analysis."""
+        self.path = path
+        self._file = open(path, "a", encoding="utf-8")
+        self._lock = threading.Lock()
+
+    def export(self, spans: Sequence) -> "SpanExportResult":
+        from opentelemetry.sdk.trace.export import SpanExportResult
+
+        with self._lock:
+            for span in spans:
+                self._file.write(json.dumps(json.loads(span.to_json()), separators=(",", ":")) + "\n")
+            self._file.flush()
+        return SpanExportResult.SUCCESS
+
+    def force_flush(self, timeout_millis: int = 30000) -> bool:
+        with self._lock:
+            self._file.flush()
+        return True
+
+    def shutdown(self):
+        with self._lock:
+            self._file.close()
+
+def _build_exporter(kind: str):
+    if kind == "otlp":
+        # Endpoint and headers come from the standard OTEL_EXPORTER_OTLP_* variables
+        from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+        return OTLPSpanExporter()
+    if kind == "file":
+        return FileSpanExporter(config.OTEL_TRACE_FILE)
+    if kind == "console":
+        from opentelemetry.sdk.trace.export import ConsoleSpanExporter
+        return ConsoleSpanExporter()
+    raise ValueError(f"Unsupported OTEL_EXPORTER: {kind}")
+
+def setup_tracing(exporter: str = None) -> bool:
+    """Install the tracer provider for the configured exporter (idempotent); return whether tracing is on."""
+    global _provider
+    kind = (exporter or config.OTEL_EXPORTER).lower()
+    if kind in ("", "none"):
+        return False
+
+    with _lock:
+        if _provider is not None:
+            return True
+
+        from opentelemetry.sdk.resources import SERVICE_NAME, Resource
+        from opentelemetry.sdk.trace import TracerProvider
+        from opentelemetry.sdk.trace.export import BatchSpanProcessor
+
+        provider = TracerProvider(resource=Resource.create({SERVICE_NAME: config.OTEL_SERVICE_NAME}))
+        provider.add_span_processor(BatchSpanProcessor(_build_exporter(kind)))
+        trace.set_tracer_provider(provider)
+        _provider = provider
+        logger.info("Tracing enabled with the %s exporter", kind)
+        return True
+
+def instrument_app(app) -> None:
+    """Trace FastAPI request handlers if tracing is enabled."""
+    if _provider is None:
+        return
+    from opentelemetry.instrumentation.fastapi import FastAPIInstrumentor
+    FastAPIInstrumentor.instrument_app(app, excluded_urls="metrics,static")
+
+def shutdown_tracing():
+    """Flush pending spans and shut the exporter down."""
+    global _provider
+    with _lock:
+        if _provider is not None:
+            _provider.shutdown()
+            _provider = None
+
+def start_sync_trace(name: str, attributes: Optional[dict] = None):
+    """Start a span that roots a new trace, linked to the caller's span (e.g. the HTTP request).
+
+    Every sync run gets its own trace so page and batch spans are not buried
+    inside whichever request happened to trigger it.
+    """
+    parent = trace.get_current_span().get_span_context()
+    links = [Link(parent)] if parent.is_valid else None
+    return tracer.start_as_current_span(name, context=Context(), links=links, attributes=attributes)
@@ -0,0 +1,339 @@
+"""Typed value conversion and binary COPY for SQL destinations.
+
+``PageConverter`` is compiled once per sync from the table's columns: every
+column gets a converter chosen by ``TableColumn.data_type`` (PDS value to a
+Python value) chained with an encoder chosen by the destination column's
+actual Postgres type (Python value to its binary COPY representation). A
+page is converted a column at a time, and the encoded rows are streamed
+with ``COPY ... (FORMAT binary)``, so numbers, dates and booleans arrive as
+native values rather than text.
+
+A value that does not convert (unparseable date, non-numeric number, text
+longer than a ``VARCHAR(n)``, ...) is quarantined instead of failing the row:
+it is loaded as NULL and recorded, with its row, in ``<table>__rejects``.
+Only rows whose primary key cannot be converted are held back.
+"""
+import io
+import json
+import logging
+import struct
+from datetime import date, datetime, timezone
+from decimal import Decimal, InvalidOperation
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from psycopg2.extras import execute_values
+from sqlalchemy import text
+
+logger = logging.getLogger(__name__)
+
+POSTGRES_TYPES = {
+    "string": "TEXT",
+    "integer": "BIGINT",
+    "float": "DOUBLE PRECISION",
+    "number": "NUMERIC",
+    "boolean": "BOOLEAN",
+    "date": "DATE",
+    "datetime": "TIMESTAMP",
+}
+
+def postgres_type(data_type: str) -> str:
+    """Column type used when creating a destination table (unknown types are TEXT)."""
+    return POSTGRES_TYPES.get((data_type or "").lower(), "TEXT")
+
+# Converters: PDS value (JSON scalar, usually a string) -> Python value
+
+_TRUE = {"true", "t", "yes", "y", "1"}
+_FALSE = {"false", "f", "no", "n", "0"}
+_DATE_FORMATS = ("%m/%d/%Y", "%m/%d/%Y %H:%M:%S", "%m/%d/%Y %I:%M:%S %p", "%Y-%m-%d %H:%M:%S")
+
+def _to_text(value: Any) -> str:
+    return str(value)
+
+def _to_decimal(value: Any) -> Decimal:
+    if isinstance(value, bool):
+        raise ValueError("boolean is not a number")
+    try:
+        return Decimal(str(value).strip())
+    except InvalidOperation:
+        raise ValueError(f"{value!r} is not a number")
+
+def _to_int(value: Any) -> int:
+    number = _to_decimal(value)
+    if number != number.to_integral_value():
+        raise ValueError(f"{value!r} is not a whole number")
+    return int(number)
+
+def _to_float(value: Any) -> float:
+    if isinstance(value, bool):
+        raise ValueError("boolean is not a number")
+    return float(str(value).strip()) if isinstance(value, str) else float(value)
+
+def _to_bool(value: Any) -> bool:
+    if isinstance(value, bool):
+        return value
+    lowered = str(value).strip().lower()
+    if lowered in _TRUE:
+        return True
+    if lowered in _FALSE:
+        return False
+    raise ValueError(f"{value!r} is not a boolean")
+
+def _to_datetime(value: Any) -> datetime:
+    if isinstance(value, datetime):
+        return value
+    if isinstance(value, date):
+        return datetime(value.year, value.month, value.day)
+    stripped = str(value).strip()
+    try:
+        return datetime.fromisoformat(stripped[:-1] + "+00:00" if stripped.endswith("Z") else stripped)
+    except ValueError:
+        pass
+    for date_format in _DATE_FORMATS:
+        try:
+            return datetime.strptime(stripped, date_format)
+        except ValueError:
+            continue
+    raise ValueError(f"{value!r} is not a recognised date/time")
+
+def _to_date(value: Any) -> date:
+    if isinstance(value, date) and not isinstance(value, datetime):
+        return value
+    return _to_datetime(value).date()
+
+CONVERTERS: Dict[str, Callable[[Any], Any]] = {
+    "string": _to_text,
+    "integer": _to_int,
+    "float": _to_float,
+    "number": _to_decimal,
+    "boolean": _to_bool,
+    "date": _to_date,
+    "datetime": _to_datetime,
+}
+
+# Encoders: Python value -> binary COPY field for a Postgres type
+
+_PG_EPOCH_DATE = date(2000, 1, 1)
+_PG_EPOCH = datetime(2000, 1, 1)
+
+def _text_encoder(max_length: Optional[int]):
+    def encode(value: Any) -> bytes:
+        if isinstance(value, (date, datetime)):
+            value = value.isoformat()
+        value = str(value)
+        if max_length is not None and len(value) > max_length:
+            raise ValueError(f"value is {len(value)} characters, column allows {max_length}")
+        return value.encode("utf-8")
+    return encode
+
+def _integer_encoder(fmt: str):
+    packer = struct.Struct(fmt)
+
+    def encode(value: Any) -> bytes:
+        if isinstance(value, bool) or not isinstance(value, (int, Decimal, float)) or value != int(value):
+            raise ValueError(f"{value!r} is not a whole number")
+        return packer.pack(int(value))
+    return encode
+
+def _float_encoder(fmt: str):
+    packer = struct.Struct(fmt)
+
+    def encode(value: Any) -> bytes:
+        if isinstance(value, bool) or not isinstance(value, (int, Decimal, float)):
+            raise ValueError(f"{value!r} is not a number")
+        return packer.pack(float(value))
+    return encode
+
+def _encode_numeric(value: Any) -> bytes:
+    """Postgres NUMERIC binary form: base-10000 digit groups with weight, sign and display scale."""
+    if isinstance(value, bool) or not isinstance(value, (int, Decimal, float)):
+        raise ValueError(f"{value!r} is not a number")
+    value = Decimal(str(value)) if isinstance(value, float) else Decimal(value)
+    if value.is_nan():
+        return struct.pack("!hhHH", 0, 0, 0xC000, 0)
+    if value.is_infinite():
+        raise ValueError("NUMERIC cannot store infinity")
+    sign, digits, exponent = value.as_tuple()
+    digits = "".join(map(str, digits))
+    if exponent >= 0:
+        whole, fraction = digits + "0" * exponent, ""
+    else:
+        whole, fraction = digits[:exponent], digits[exponent:].rjust(-exponent, "0")
+    whole = whole.lstrip("0")
+    whole = whole.rjust(-(-len(whole) // 4) * 4, "0")
+    fraction = fraction.ljust(-(-len(fraction) // 4) * 4, "0")
+    groups = [int(part[i:i + 4]) for part in (whole, fraction) for i in range(0, len(part), 4)]
+    weight = len(whole) // 4 - 1
+    while groups and groups[0] == 0:
+        groups.pop(0)
+        weight -= 1
+    while groups and groups[-1] == 0:
+        groups.pop()
+    if not groups:
+        weight = 0
+    return struct.pack(f"!hhHH{len(groups)}H", len(groups), weight, 0x4000 if sign and groups else 0,
+                       max(0, -exponent), *groups)
+
+def _encode_bool(value: Any) -> bytes:
+    if not isinstance(value, bool):
+        raise ValueError(f"{value!r} is not a boolean")
+    return b"\x01" if value else b"\x00"
+
+def _encode_date(value: Any) -> bytes:
+    if isinstance(value, datetime):
+        value = value.date()
+    if not isinstance(value, date):
+        raise ValueError(f"{value!r} is not a date")
+    return struct.pack("!i", (value - _PG_EPOCH_DATE).days)
+
+def _timestamp_encoder(with_time_zone: bool):
+    def encode(value: Any) -> bytes:
+        if not isinstance(value, datetime):
+            if not isinstance(value, date):
+                raise ValueError(f"{value!r} is not a date/time")
+            value = datetime(value.year, value.month, value.day)
+        if value.tzinfo is not None:
+            # timestamptz is stored as UTC; a plain timestamp keeps the wall-clock time
+            value = value.astimezone(timezone.utc).replace(tzinfo=None) if with_time_zone else value.replace(tzinfo=None)
+        delta = value - _PG_EPOCH
+        return struct.pack("!q", (delta.days * 86400 + delta.seconds) * 1000000 + delta.microseconds)
+    return encode
+
+def binary_encoder(type_name: str, max_length: Optional[int] = None) -> Callable[[Any], bytes]:
+    """Encoder for a destination column, by ``pg_type.typname``."""
+    if type_name in ("text", "varchar", "bpchar", "name"):
+        return _text_encoder(max_length)
+    encoders = {
+        "int2": _integer_encoder("!h"),
+        "int4": _integer_encoder("!i"),
+        "int8": _integer_encoder("!q"),
+        "float4": _float_encoder("!f"),
+        "float8": _float_encoder("!d"),
+        "numeric": _encode_numeric,
+        "bool": _encode_bool,
+        "date": _encode_date,
+        "timestamp": _timestamp_encoder(False),
+        "timestamptz": _timestamp_encoder(True),
+    }
+    if type_name not in encoders:
+        raise ValueError(f"Column type {type_name} is not supported for binary COPY")
+    return encoders[type_name]
+
+def destination_columns(conn, table_name: str) -> Dict[str, Tuple[str, Optional[int]]]:
+    """Map each column of a destination table to (type name, VARCHAR/CHAR length or None)."""
+    rows = conn.execute(text(
+        "SELECT a.attname, t.typname, "
+        "CASE WHEN t.typname IN ('varchar', 'bpchar') AND a.atttypmod > 4 THEN a.atttypmod - 4 END "
+        "FROM pg_attribute a JOIN pg_type t ON t.oid = a.atttypid "
+        "WHERE a.attrelid = to_regclass(:table) AND a.attnum > 0 AND NOT a.attisdropped"
+    ), {"table": quote(table_name)}).all()
+    return {name: (type_name, max_length) for name, type_name, max_length in rows}
+
+def quote(name: str) -> str:
+    return '"' + name.replace('"', '""') + '"'
+
+class Reject(NamedTuple):
+    column_name: str
+    data_type: str
+    value: Any
+    error: str
+    row: Dict[str, Any]
+
+class PageConverter:
+    def __init__(self, columns: Sequence[Tuple[str, str]], primary_key_columns: Sequence[str],
+                 column_types: Dict[str, Tuple[str, Optional[int]]]):
+        """Compile converters for ``columns`` ((name, data_type) pairs) against the destination's ``column_types``.
+
+        Columns missing from the destination table are left out with a warning.
+        """
+        missing = [name for name, _ in columns if name not in column_types]
+        if missing:
+            logger.warning("Columns not in the destination table are not loaded: %s", ", ".join(missing))
+        self.columns = [(name, (data_type or "string").lower()) for name, data_type in columns if name in column_types]
+        self.column_names = [name for name, _ in self.columns]
+        self.primary_key_columns = [name for name in primary_key_columns if name in column_types]
+        self._key_positions = {self.column_names.index(name) for name in self.primary_key_columns}
+        self._pipelines = []
+        for name, data_type in self.columns:
+            convert = CONVERTERS.get(data_type, _to_text)
+            encode = binary_encoder(*column_types[name])
+            self._pipelines.append(lambda value, convert=convert, encode=encode: encode(convert(value)))
+
+    def convert(self, items: List[Dict[str, Any]]) -> Tuple[List[List[Optional[bytes]]], List[Reject]]:
+        """Encode a page column by column; returns (encoded rows, quarantined values).
+
+        Blank values (None or whitespace) load as NULL, as the row-by-row sync did.
+        """
+        fields: List[List[Optional[bytes]]] = []
+        rejects: List[Reject] = []
+        held_back = set()
+        for position, ((name, data_type), pipeline) in enumerate(zip(self.columns, self._pipelines)):
+            encoded: List[Optional[bytes]] = []
+            for index, item in enumerate(items):
+                value = item.get(name)
+                if value is None or (isinstance(value, str) and not value.strip()):
+                    encoded.append(None)
+                    if position in self._key_positions:
+                        held_back.add(index)
+                    continue
+                try:
+                    encoded.append(pipeline(value))
+                except Exception as e:
+                    encoded.append(None)
+                    rejects.append(Reject(name, data_type, value, str(e), item))
+                    if position in self._key_positions:
+                        held_back.add(index)
+            fields.append(encoded)
+        rows = [list(row) for index, row in enumerate(zip(*fields)) if index not in held_back] if fields else []
+        return rows, rejects
+
+def binary_copy_stream(rows: List[List[Optional[bytes]]]) -> io.BytesIO:
+    """Assemble encoded rows into a ``COPY ... (FORMAT binary)`` input file."""
+    parts = [b"PGCOPY\n\xff\r\n\x00", struct.pack("!ii", 0, 0)]
+    null = struct.pack("!i", -1)
+    for row in rows:
+        parts.append(struct.pack("!h", len(row)))
+        for field in row:
+            parts.append(null if field is None else struct.pack("!i", len(field)) + field)
+    parts.append(struct.pack("!h", -1))
+    return io.BytesIO(b"".join(parts))
+
+def copy_rows(conn, table_name: str, column_names: Sequence[str], rows: List[List[Optional[bytes]]]):
+    """Binary COPY encoded rows into ``table_name`` on an open SQLAlchemy connection."""
+    columns = ", ".join(quote(name) for name in column_names)
+    cursor = conn.connection.cursor()
+    try:
+        cursor.copy_expert(f"COPY {quote(table_name)} ({columns}) FROM STDIN WITH (FORMAT binary)",
+                           binary_copy_stream(rows))
+    finally:
+        cursor.close()
+
+def rejects_table(table_name: str) -> str:
+    return f"{table_name[:50]}__rejects"
+
+def quarantine(conn, table_name: str, sync_guid, rejects: List[Reject]):
+    """Record quarantined values in the table's ``__rejects`` table (created on first use)."""
+    if not rejects:
+        return
+    table = quote(rejects_table(table_name))
+    conn.execute(text(
+        f"CREATE TABLE IF NOT EXISTS {table} ("
+        "sync_guid UUID, rejected_at TIMESTAMP DEFAULT now(), column_name TEXT, data_type TEXT, "
+        "value TEXT, error TEXT, row_data JSONB)"
+    ))
+    cursor = conn.connection.cursor()
+    try:
+        execute_values(
+            cursor,
+            f"INSERT INTO {table} (sync_guid, column_name, data_type, value, error, row_data) VALUES %s",
+            [(str(sync_guid), r.column_name, r.data_type, str(r.value), r.error, json.dumps(r.row, default=str))
+             for r in rejects]
+        )
+    finally:
+        cursor.close()
+
+def count_by_type(rejects: List[Reject], totals: Dict[str, int] = None) -> Dict[str, int]:
+    """Add the quarantined values per data type to ``totals``."""
+    totals = {} if totals is None else totals
+    for reject in rejects:
+        totals[reject.data_type] = totals.get(reject.data_type, 0) + 1
+    return totals
@@ -3,6 +3,8 @@
 
 import os
 import sys
+import shutil
+import tempfile
 import logging
 import uvicorn
 from pathlib import Path
@@ -17,17 +19,19 @@ load_dotenv()
 
 def setup_logging():
     """Configure production logging."""
-    log_file = os.getenv('LOG_FILE', 'pds_data_api.log')
-    log_level = os.getenv('LOG_LEVEL', 'WARNING')
-    
-    logging.basicConfig(
-        level=getattr(logging, log_level),
-        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-        handlers=[
-            logging.FileHandler(log_file),
-            logging.StreamHandler()
-        ]
+    from pds_data_api.logging_config import setup_logging as setup_app_logging
+    setup_app_logging(
+        level=os.getenv('LOG_LEVEL', 'WARNING'),
+        log_file=os.getenv('LOG_FILE', 'pds_data_api.log')
+    )
+
+def prepare_metrics_dir():
+    """Give the uvicorn workers a fresh shared directory for Prometheus samples."""
+    metrics_dir = os.environ.setdefault(
+        'PROMETHEUS_MULTIPROC_DIR', os.path.join(tempfile.gettempdir(), 'pds_data_api_metrics')
     )
+    shutil.rmtree(metrics_dir, ignore_errors=True)
+    os.makedirs(metrics_dir, exist_ok=True)
 
 def check_environment():
     """Verify all required environment variables and paths."""
@@ -50,6 +54,9 @@ def check_environment():
 def main():
     """Main entry point for the application."""
     try:
+        # Must run before anything imports prometheus_client
+        prepare_metrics_dir()
+        
         # Setup logging
         setup_logging()
         logger = logging.getLogger(__name__)
@@ -63,6 +70,14 @@ def main():
         port = int(os.getenv('PDS_PORT', '8000'))
         workers = int(os.getenv('WORKERS', '4'))
         
+        # Initialize the database once for the whole deployment; workers see
+        # PDS_DB_INITIALIZED and skip it in their lifespan hook
+        from pds_data_api.database import init_db_connection
+        from pds_data_api.init_db import init_db
+        if not init_db_connection():
+            raise RuntimeError("Database is not reachable")
+        init_db()
+        
         # Start the application
         uvicorn.run(
             "pds_data_api.main:app",
@@ -0,0 +1,67 @@
+"""CSV and Parquet exports keep every column, whatever page it first appears on."""
+import csv
+import io
+import uuid
+
+import pytest
+
+from pds_data_api.data_export import encode, encode_qdrant, encode_sql
+
+# AMOUNT is all null on the first page and mixes types later; STATUS only appears on page 2
+PAGES = [
+    [{"id": "1", "AMOUNT": None}, {"id": "2", "AMOUNT": None}],
+    [{"id": "3", "AMOUNT": 5, "STATUS": "open"}, {"id": "4", "AMOUNT": 2.5}],
+    [{"id": "5", "AMOUNT": "n/a"}],
+]
+
+def read_parquet(chunks):
+    pq = pytest.importorskip("pyarrow.parquet")
+    return pq.read_table(io.BytesIO(b"".join(chunks)))
+
+def qdrant_collection(pages):
+    pytest.importorskip("qdrant_client")
+    from qdrant_client import QdrantClient
+    from qdrant_client.http import models
+
+    client = QdrantClient(":memory:")
+    client.create_collection("export", vectors_config=models.VectorParams(size=2, distance=models.Distance.COSINE))
+    client.upsert("export", points=[
+        models.PointStruct(id=str(uuid.UUID(int=int(record["id"]))), vector=[1.0, 0.0],
+                           payload={key: value for key, value in record.items() if key != "id"})
+        for page in pages for record in page
+    ])
+    return client
+
+def test_qdrant_parquet_widens_columns_across_pages():
+    client = qdrant_collection(PAGES)
+    table = read_parquet(encode_qdrant(client, "export", "parquet", with_vectors=True, page_size=2))
+
+    assert table.column_names == ["id", "AMOUNT", "STATUS", "vector"]
+    assert str(table.schema.field("AMOUNT").type) == "string"
+    assert table.column("AMOUNT").to_pylist() == [None, None, "5", "2.5", "n/a"]
+    assert table.column("STATUS").to_pylist().count("open") == 1
+
+def test_qdrant_csv_header_has_keys_from_later_pages():
+    client = qdrant_collection(PAGES)
+    text = b"".join(encode_qdrant(client, "export", "csv", page_size=2)).decode()
+
+    rows = list(csv.DictReader(io.StringIO(text)))
+    assert list(rows[0]) == ["id", "AMOUNT", "STATUS"]
+    assert [row["STATUS"] for row in rows].count("open") == 1
+
+def test_sql_parquet_uses_the_table_column_types(tmp_path):
+    sqlalchemy = pytest.importorskip("sqlalchemy")
+    engine = sqlalchemy.create_engine(f"sqlite:///{tmp_path / 'export.db'}")
+    with engine.begin() as connection:
+        connection.exec_driver_sql('CREATE TABLE "EXPORT" (ID TEXT, AMOUNT INTEGER, SCORE FLOAT)')
+        connection.exec_driver_sql("INSERT INTO \"EXPORT\" VALUES ('1', NULL, NULL), ('2', NULL, NULL), ('3', 7, 0.5)")
+
+    table = read_parquet(encode_sql(engine, "EXPORT", "parquet", page_size=2))
+    assert [str(field.type) for field in table.schema] == ["string", "int64", "double"]
+    assert table.column("AMOUNT").to_pylist() == [None, None, 7]
+
+def test_parquet_without_columns_does_not_fail_on_later_types():
+    table = read_parquet(encode(PAGES, "parquet"))
+    # Only the first page's keys are known; a column null there is text
+    assert table.column_names == ["id", "AMOUNT"]
+    assert table.column("AMOUNT").to_pylist() == [None, None, "5", "2.5", "n/a"]
@@ -0,0 +1,53 @@
+"""A slow destination must not hold up engine lookups for other connections."""
+import threading
+import uuid
+
+import pytest
+
+pytest.importorskip("psycopg2")
+
+from pds_data_api.destination_engines import DestinationEngineRegistry
+
+class SlowRegistry(DestinationEngineRegistry):
+    """Blocks database creation for the ``slow`` host until ``release`` is set."""
+
+    def __init__(self):
+        super().__init__(pool_size=1, max_overflow=0)
+        self.entered = threading.Event()
+        self.release = threading.Event()
+        self.created = 0
+
+    def _ensure_database_exists(self, dest_config):
+        if dest_config["host"] == "slow":
+            self.entered.set()
+            assert self.release.wait(5)
+
+    def _create_engine(self, dest_config):
+        self.created += 1
+        return super()._create_engine(dest_config)
+
+def dest_config(host):
+    return {"host": host, "port": 5432, "database": "dest", "username": "u", "password": "p"}
+
+def test_slow_connection_does_not_block_others():
+    registry = SlowRegistry()
+    slow_id, fast_id = uuid.uuid4(), uuid.uuid4()
+    results = []
+    callers = [threading.Thread(target=lambda: results.append(registry.get_engine(slow_id, dest_config("slow"))))
+               for _ in range(2)]
+    try:
+        for caller in callers:
+            caller.start()
+        assert registry.entered.wait(5)
+
+        # Returns while the slow connection is still being created
+        assert registry.get_engine(fast_id, dest_config("fast")).url.host == "fast"
+    finally:
+        registry.release.set()
+        for caller in callers:
+            caller.join(5)
+
+    # Both callers of the slow connection share the one engine
+    assert len(results) == 2 and results[0] is results[1]
+    assert registry.created == 2
+    registry.dispose_all()
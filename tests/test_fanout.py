@@ -0,0 +1,42 @@
+"""A fan-out destination that fails is reported and recorded as FAILED."""
+import json
+
+def add_qdrant_destination(session_factory, table_id):
+    from pds_data_api.models import Connection, ConnectionOptions, TableDestination
+
+    with session_factory() as session:
+        connection = Connection(
+            connection_name="Extra Qdrant",
+            connection_config=json.dumps({"host": ":memory:"}).encode(),
+            connection_type=session.query(ConnectionOptions).filter_by(name="Qdrant").one(),
+            direction=False
+        )
+        session.add(connection)
+        session.flush()
+        session.add(TableDestination(pds_table_id=table_id, connection_id=connection.id))
+        session.commit()
+
+def test_failed_destination_fails_the_fan_out(offline_env):
+    from pds_data_api.fanout import FanOutSync
+    from pds_data_api.models import SyncHistory
+
+    table_id = offline_env.add_table(table_name="FANOUT_RECORDS", page_size=1000, batch_size=500)
+    add_qdrant_destination(offline_env.session_factory, table_id)
+    fan_out = FanOutSync(table_id, offline_env.session_factory)
+    primary, extra = fan_out.services
+    # Returns an error without ever adopting its prepared history, as a failed client setup would
+    extra.run_sync = lambda pages=None, **kwargs: {"status": "error", "message": "destination down"}
+
+    result = fan_out.run_sync()
+
+    assert result["status"] == "error"
+    assert [(d["destination"], d["status"]) for d in result["destinations"]] == [
+        (primary.dest_connection.connection_name, "success"), ("Extra Qdrant", "error")
+    ]
+    with offline_env.session_factory() as session:
+        histories = {
+            history.sync_guid: (history.status, history.error_message)
+            for history in session.query(SyncHistory).filter(SyncHistory.pds_table_id == table_id)
+        }
+    assert histories[primary.sync_history.sync_guid] == ("COMPLETED", None)
+    assert histories[extra.sync_history.sync_guid] == ("FAILED", "destination down")
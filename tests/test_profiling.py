@@ -0,0 +1,26 @@
+"""Overlapping profiled syncs share the process-wide tracemalloc session."""
+import tracemalloc
+
+from pds_data_api.profiling import SyncProfiler
+
+def test_overlapping_profilers_share_tracemalloc(tmp_path):
+    assert not tracemalloc.is_tracing()
+    first, second = SyncProfiler(), SyncProfiler()
+
+    first.__enter__()
+    second.__enter__()
+    first.__exit__(None, None, None)
+    # The second run is still measuring, so the first must not stop tracing under it
+    assert tracemalloc.is_tracing()
+    second.__exit__(None, None, None)
+    assert not tracemalloc.is_tracing()
+
+    assert first.overlapped and second.overlapped
+    for name, profiler in (("first", first), ("second", second)):
+        assert (tmp_path / f"{name}.zip").samefile(profiler.save(str(tmp_path), name))
+
+def test_single_profiler_is_not_overlapped():
+    with SyncProfiler() as profiler:
+        sum(range(1000))
+    assert not profiler.overlapped
+    assert not tracemalloc.is_tracing()
@@ -0,0 +1,37 @@
+"""List pages run a fixed number of metadata queries, however many tables exist."""
+import uuid
+from datetime import datetime
+
+LIST_PAGES = ["/pds-tables", "/connections", "/sync-history"]
+MAX_QUERIES = 6
+
+def add_tables_with_history(env, count: int):
+    from pds_data_api.models import SyncHistory
+
+    for _ in range(count):
+        table_id = env.add_table(table_name=f"QUERY_TEST_{uuid.uuid4().hex[:8].upper()}")
+        with env.session_factory() as session:
+            session.add_all([
+                SyncHistory(pds_table_id=table_id, start_time=datetime.now(), end_time=datetime.now(),
+                            status=status, total_updates=0, total_creates=10)
+                for status in ("COMPLETED", "FAILED")
+            ])
+            session.commit()
+
+def query_counts(client):
+    counts = {}
+    for path in LIST_PAGES:
+        response = client.get(path)
+        assert response.status_code == 200, path
+        counts[path] = int(response.headers["X-DB-Query-Count"])
+    return counts
+
+def test_list_pages_have_a_query_ceiling(client, offline_env):
+    add_tables_with_history(offline_env, 1)
+    before = query_counts(client)
+    add_tables_with_history(offline_env, 5)
+    after = query_counts(client)
+
+    for path in LIST_PAGES:
+        assert after[path] <= MAX_QUERIES, f"{path} ran {after[path]} queries"
+        assert after[path] == before[path], f"{path} queries grew with the number of tables: {before[path]} -> {after[path]}"
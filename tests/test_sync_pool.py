@@ -0,0 +1,38 @@
+"""Syncs must not starve web requests (pool size 1, several syncs at once)."""
+import threading
+import time
+import uuid
+
+SYNCS = 4
+MAX_RESPONSE_SECONDS = 2.0
+
+def test_pages_respond_while_syncs_run(client, offline_env):
+    table_ids = [
+        offline_env.add_table(table_name=f"POOL_TEST_{uuid.uuid4().hex[:8].upper()}", page_size=100)
+        for _ in range(SYNCS)
+    ]
+    responses = {}
+
+    def sync(table_id):
+        responses[table_id] = client.post(f"/pds-tables/{table_id}/sync", follow_redirects=False)
+
+    requests_before = offline_env.pds.requests
+    threads = [threading.Thread(target=sync, args=(table_id,)) for table_id in table_ids]
+    for thread in threads:
+        thread.start()
+    deadline = time.monotonic() + 30
+    while offline_env.pds.requests < requests_before + SYNCS and time.monotonic() < deadline:
+        time.sleep(0.05)
+
+    # List pages (async sessions) and a page on the sync session pool the syncs share
+    for path in ["/pds-tables", "/connections", "/sync-history", f"/pds-tables/{table_ids[0]}"]:
+        started = time.perf_counter()
+        response = client.get(path)
+        elapsed = time.perf_counter() - started
+        assert response.status_code == 200, path
+        assert elapsed < MAX_RESPONSE_SECONDS, f"{path} took {elapsed:.2f}s while syncs were running"
+    assert any(thread.is_alive() for thread in threads), "Syncs finished before the pages were checked"
+
+    for thread in threads:
+        thread.join(timeout=300)
+    assert [responses[table_id].status_code for table_id in table_ids] == [303] * SYNCS